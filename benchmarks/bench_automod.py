@@ -0,0 +1,58 @@
+"""Measure the per-message cost of the compiled automod matcher.
+
+Run from the repository root:
+    python -m benchmarks.bench_automod
+"""
+import random
+import string
+import time
+
+from utils.automod import CompiledRules
+
+MESSAGES = 20000
+
+def random_word(rng: random.Random, min_length: int = 3, max_length: int = 10) -> str:
+    return ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(min_length, max_length)))
+
+def build_rules(rng: random.Random, words: int, patterns: int, domains: int) -> CompiledRules:
+    return CompiledRules(
+        words=[random_word(rng, 5, 12) for _ in range(words)],
+        patterns=[rf'{random_word(rng, 4, 6)}\s*\d{{3,}}' for _ in range(patterns)] + [r'free\s+nitro'],
+        blocked_domains=[f'{random_word(rng)}.com' for _ in range(domains)],
+        block_invites=True
+    )
+
+def build_messages(rng: random.Random) -> list:
+    messages = []
+    for _ in range(MESSAGES):
+        text = ' '.join(random_word(rng) for _ in range(rng.randint(3, 40)))
+        if rng.random() < 0.1:
+            text += f' https://{random_word(rng)}.net/path'
+        messages.append(text)
+    return messages
+
+def run(words: int, patterns: int, domains: int, messages: list, rng: random.Random):
+    start = time.perf_counter()
+    rules = build_rules(rng, words, patterns, domains)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    hits = sum(1 for message in messages if rules.scan(message))
+    elapsed = time.perf_counter() - start
+
+    per_message = elapsed / len(messages) * 1e6
+    print(
+        f"words={words:>5} patterns={patterns:>3} domains={domains:>5} | "
+        f"build {build_ms:7.1f} ms | {per_message:6.1f} µs/message | hits={hits}"
+    )
+
+def main():
+    rng = random.Random(42)
+    messages = build_messages(rng)
+    average_length = sum(map(len, messages)) / len(messages)
+    print(f"{MESSAGES} messages, average length {average_length:.0f} chars")
+    for words, patterns, domains in ((10, 2, 10), (500, 20, 1000), (5000, 50, 20000)):
+        run(words, patterns, domains, messages, rng)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Poll dozens of FXServers against the local stand-in, concurrently and one by one.
+
+Run from the repository root:
+    python -m benchmarks.bench_fxserver_poll
+
+Some servers are taken offline, one blocks dynamic.json and one answers
+slower than its timeout; the results are checked before anything is timed,
+so the benchmark doubles as the poller's regression check.
+"""
+import asyncio
+import time
+
+from aiohttp import web
+
+from benchmarks.fxserver_server import create_app
+from utils.fxserver import GameServer, poll_servers
+from utils.http import HTTPClient
+
+PORT = 8767
+SERVERS = 50
+LATENCY = 0.05
+TIMEOUT = 1.0
+OFFLINE = (3, 17)
+PARANOIA = 5
+SLOW = 8
+
+async def timed(http_client, servers, max_concurrency: int) -> tuple:
+    start = time.perf_counter()
+    results = await poll_servers(http_client, servers, max_concurrency=max_concurrency)
+    return results, (time.perf_counter() - start) * 1000
+
+def check(results: dict, state: dict, servers: list):
+    for index, server in enumerate(servers):
+        status = results[server.address]
+        expected = state['servers'][index]
+        if index in OFFLINE:
+            assert not status.online and status.error == "HTTP 503", status
+        elif index == SLOW:
+            assert not status.online and status.error == "Tiempo de espera agotado", status
+        else:
+            assert status.online, status
+            assert status.players == expected['players'], (status, expected)
+            assert status.max_players == 128 and status.hostname == expected['name'], status
+            assert status.resources == 15, status
+    print("Results OK")
+
+async def main():
+    app = create_app(SERVERS, latency=LATENCY)
+    state = app['state']
+    for index in OFFLINE:
+        state['servers'][index]['online'] = False
+    state['servers'][PARANOIA]['paranoia'] = True
+    state['servers'][SLOW]['latency'] = TIMEOUT * 2
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', PORT).start()
+    # Todos comparten host en la prueba; en producción cada servidor es un host distinto
+    http_client = HTTPClient(limit_per_host=200)
+    await http_client.start()
+    servers = [GameServer(f"Servidor {index}", f"127.0.0.1:{PORT}/{index}", TIMEOUT) for index in range(SERVERS)]
+
+    try:
+        results, _ = await timed(http_client, servers, 20)
+        check(results, state, servers)
+        print(f"{SERVERS} servers, {LATENCY * 1000:.0f} ms latency, {TIMEOUT:g}s timeout (one server always times out)")
+        for concurrency in (1, 5, 20, SERVERS):
+            before = state['requests']
+            _, elapsed = await timed(http_client, servers, concurrency)
+            print(f"  concurrency {concurrency:>3}: {elapsed:8.1f} ms, {state['requests'] - before} requests")
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""Time the FiveM monitor bootstrap against fake guilds with slow fetch_message calls.
+
+Run from the repository root:
+    python -m benchmarks.bench_monitor_bootstrap
+
+Runs in a temporary directory with its own SQLite database. Some panels
+point at deleted channels or messages; the fixes are checked after every
+run, so the benchmark doubles as the bootstrap's regression check. The
+"sequential" row forces one validation at a time for comparison. A final
+run starts from a legacy config.json to check the one-time migration.
+"""
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import discord
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import cogs.fivem_status as fivem_status
+from cogs.fivem_status import FiveMStatus
+from models import Base, FiveMMonitor
+from utils.monitor_store import MonitorStore
+
+LATENCY = 0.05            # Segundos por fetch_message
+SIZES = (10, 50, 200)
+
+class FakeChannel:
+    def __init__(self, channel_id: int, deleted_message: bool):
+        self.id = channel_id
+        self.deleted_message = deleted_message
+        self.fetches = 0
+
+    async def fetch_message(self, message_id: int):
+        self.fetches += 1
+        await asyncio.sleep(LATENCY)
+        if self.deleted_message:
+            raise discord.NotFound(SimpleNamespace(status=404, reason='Not Found'), 'Unknown Message')
+        return SimpleNamespace(id=message_id, channel=self)
+
+def build(guilds: int) -> tuple:
+    """Guild i: every 10th has lost its channel, every 7th its message"""
+    channels = {}
+    monitors = {}
+    for guild_id in range(1, guilds + 1):
+        channel_id = 1000 + guild_id
+        if guild_id % 10:
+            channels[channel_id] = FakeChannel(channel_id, deleted_message=guild_id % 7 == 0)
+        monitors[guild_id] = (channel_id, 5000 + guild_id)
+    bot = SimpleNamespace(
+        guilds=[SimpleNamespace(id=guild_id) for guild_id in range(1, guilds + 1)],
+        get_channel=channels.get
+    )
+    return bot, channels, monitors
+
+def fresh_store(name: str) -> tuple:
+    engine = create_engine(f"sqlite:///{name}.db")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    return MonitorStore(session_factory), session_factory
+
+async def run(guilds: int, concurrency: int, legacy_config: bool = False) -> float:
+    bot, channels, monitors = build(guilds)
+    store, session_factory = fresh_store(f"bootstrap-{guilds}-{concurrency}-{legacy_config}")
+    if legacy_config:
+        servers = {
+            str(guild_id): {
+                'fivem_status_channel_id': channel_id,
+                'fivem_status_message_id': message_id,
+                'fivem_monitor_active': True,
+                'fivem_alerts': {'enabled': False}
+            }
+            for guild_id, (channel_id, message_id) in monitors.items()
+        }
+        with open('config.json', 'w') as f:
+            json.dump({'servers': servers}, f)
+    else:
+        await store.save_many(monitors)
+
+    fivem_status.BOOTSTRAP_CONCURRENCY = concurrency
+    cog = FiveMStatus(bot)
+    cog.monitor_store = store
+    cog.monitoring_needed = lambda: False  # Sin bucle de estado en la prueba
+
+    start = time.perf_counter()
+    await asyncio.gather(*(cog.ensure_bootstrapped() for _ in range(3)))  # on_ready repetido + before_loop
+    elapsed = (time.perf_counter() - start) * 1000
+
+    with session_factory() as session:
+        saved = {row.guild_id: row for row in session.scalars(select(FiveMMonitor))}
+    for guild_id in range(1, guilds + 1):
+        row = saved[guild_id]
+        if guild_id % 10 == 0:
+            assert not row.is_active and guild_id not in cog.active_monitors
+        elif guild_id % 7 == 0:
+            assert row.is_active and row.message_id is None and cog.active_monitors[guild_id]['message_id'] is None
+        else:
+            assert row.is_active and cog.active_monitors[guild_id]['message_id'] == 5000 + guild_id
+    fetches = sum(channel.fetches for channel in channels.values())
+    assert fetches == sum(1 for guild_id in range(1, guilds + 1) if guild_id % 10), "each panel validated once"
+
+    if legacy_config:
+        with open('config.json') as f:
+            servers = json.load(f)['servers']
+        assert all(list(server) == ['fivem_alerts'] for server in servers.values()), "legacy keys must be removed"
+        os.remove('config.json')
+    return elapsed
+
+async def main():
+    default_concurrency = fivem_status.BOOTSTRAP_CONCURRENCY
+    print(f"fetch_message latency {LATENCY * 1000:.0f} ms")
+    for guilds in SIZES:
+        sequential = await run(guilds, 1)
+        concurrent = await run(guilds, default_concurrency)
+        print(f"  {guilds:>4} monitors: sequential {sequential:8.1f} ms, concurrent ({default_concurrency}) {concurrent:7.1f} ms")
+    migrated = await run(SIZES[-1], default_concurrency, legacy_config=True)
+    print(f"  {SIZES[-1]:>4} monitors migrated from config.json: {migrated:7.1f} ms")
+
+if __name__ == '__main__':
+    logging.getLogger('cogs.fivem_status').setLevel(logging.ERROR)
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        asyncio.run(main())
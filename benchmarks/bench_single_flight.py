@@ -0,0 +1,58 @@
+"""Load test: bursts of concurrent status requests against the local stand-in.
+
+Run from the repository root:
+    python -m benchmarks.bench_single_flight
+
+Every burst forces a revalidation (max_age=0). With single-flight the stand-in
+should see one request per burst no matter how many callers there are; the
+uncoalesced row calls fetch_fivem_status directly for comparison.
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from aiohttp import web
+
+from benchmarks.status_server import create_app
+from cogs.fivem_status import FiveMStatus
+from utils.http import HTTPClient
+
+PORT = 8766
+LATENCY = 0.05
+BURSTS = (1, 10, 100, 1000)
+
+async def burst(state: dict, callers: int, call) -> tuple:
+    before = state['requests']
+    start = time.perf_counter()
+    results = await asyncio.gather(*(call() for _ in range(callers)))
+    elapsed = (time.perf_counter() - start) * 1000
+    assert all(results), "every caller must get a status"
+    return state['requests'] - before, elapsed
+
+async def main():
+    app = create_app('operational', latency=LATENCY)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', PORT).start()
+
+    http_client = HTTPClient(limit_per_host=100)
+    await http_client.start()
+    cog = FiveMStatus(SimpleNamespace(http_client=http_client))
+    cog.status_url = f"http://127.0.0.1:{PORT}"
+    cog.summary_url = f"{cog.status_url}/api/v2/summary.json"
+    state = app['state']
+
+    try:
+        print(f"Stand-in latency {LATENCY * 1000:.0f} ms")
+        for callers in BURSTS:
+            requests, elapsed = await burst(state, callers, lambda: cog.get_fivem_status(max_age=0))
+            print(f"  single-flight {callers:>5} callers -> {requests:>4} upstream requests in {elapsed:7.1f} ms")
+        for callers in BURSTS[:3]:
+            requests, elapsed = await burst(state, callers, cog.fetch_fivem_status)
+            print(f"  uncoalesced   {callers:>5} callers -> {requests:>4} upstream requests in {elapsed:7.1f} ms")
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,199 @@
+"""Run full status_monitor cycles offline: replayed status.cfx.re in, fake Discord out.
+
+Run from the repository root:
+    python -m benchmarks.bench_status_cycle
+
+Both stand-in scenarios are first recorded with benchmarks.record_status into
+a temporary directory and then replayed, so the record/replay path is checked
+too. Discord is faked below discord.py's HTTPClient.request: panels are real
+PartialMessage edits and sends, answered with message payloads after a fixed
+latency, with some 429s and deleted messages injected. Every cycle checks
+that each guild's panel shows the cog's current payload, so this doubles as
+an end-to-end regression check. Per-channel spacing is turned off so cycle
+times show only the work.
+"""
+import asyncio
+import logging
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+
+import discord
+from aiohttp import web
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import cogs.fivem_status as fivem_status
+from benchmarks.record_status import check_recording, record
+from benchmarks.status_server import create_app
+from cogs.fivem_status import FiveMStatus
+from models import Base
+from utils.concurrency import FanoutDispatcher
+from utils.http import HTTPClient
+from utils.monitor_store import MonitorStore
+from utils.status_history import StatusHistory
+
+PORT = 8767
+GUILDS = 200
+UPSTREAM_LATENCY = 0.02
+DISCORD_LATENCY = 0.02
+DISCORD_RETRY_AFTER = 0.05
+BOT_USER = {'id': '1', 'username': 'PT Scripts BOT', 'discriminator': '0', 'avatar': None, 'bot': True}
+
+class FakeDiscord:
+    """Stands in for discord.py's HTTPClient.request and keeps the last embed of every message"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.throttle_every = 0
+        self.calls = Counter()    # método HTTP: peticiones
+        self.throttled = 0
+        self.panels = {}          # message_id: último embed enviado
+        self.next_id = 900000
+
+    def response(self, status: int, reason: str, headers: dict = None) -> SimpleNamespace:
+        return SimpleNamespace(status=status, reason=reason, headers=headers or {})
+
+    async def request(self, route, *, files=None, form=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.calls[route.method] += 1
+        if self.throttle_every and sum(self.calls.values()) % self.throttle_every == 0:
+            self.throttled += 1
+            response = self.response(429, 'Too Many Requests', {'Retry-After': str(DISCORD_RETRY_AFTER)})
+            raise discord.HTTPException(response, {'message': 'You are being rate limited.', 'retry_after': DISCORD_RETRY_AFTER})
+
+        channel_id = route.channel_id
+        if route.method == 'PATCH':
+            message_id = int(route.url.rsplit('/', 1)[-1])
+            if message_id not in self.panels:
+                raise discord.NotFound(self.response(404, 'Not Found'), {'code': 10008, 'message': 'Unknown Message'})
+        else:
+            self.next_id += 1
+            message_id = self.next_id
+        embeds = kwargs.get('json', {}).get('embeds', [])
+        self.panels[message_id] = embeds[0] if embeds else None
+        return {
+            'id': str(message_id), 'channel_id': str(channel_id), 'author': BOT_USER, 'content': '',
+            'timestamp': '2026-10-18T21:04:11+00:00', 'edited_timestamp': None, 'tts': False,
+            'mention_everyone': False, 'mentions': [], 'mention_roles': [], 'attachments': [],
+            'embeds': embeds, 'pinned': False, 'type': 0
+        }
+
+def temp_session_factory(directory: Path):
+    engine = create_engine(f"sqlite:///{directory / 'bench.db'}")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)
+
+def check_panels(cog: FiveMStatus, fake: FakeDiscord):
+    description = cog.last_payload.embed['description']
+    for guild_id, monitor_info in cog.active_monitors.items():
+        panel = fake.panels.get(monitor_info['message_id'])
+        assert panel and panel['description'] == description, f"guild {guild_id} shows a stale panel"
+
+async def cycle(label: str, cog: FiveMStatus, state: dict, fake: FakeDiscord, expect_requests=None):
+    requests_before, calls_before, throttled_before = state['requests'], dict(fake.calls), fake.throttled
+    start = time.perf_counter()
+    await cog.status_monitor()
+    elapsed = (time.perf_counter() - start) * 1000
+    check_panels(cog, fake)
+    upstream = state['requests'] - requests_before
+    if expect_requests is not None:
+        assert upstream == expect_requests, f"{label}: {upstream} upstream requests, expected {expect_requests}"
+    patches = fake.calls['PATCH'] - calls_before.get('PATCH', 0)
+    posts = fake.calls['POST'] - calls_before.get('POST', 0)
+    print(
+        f"  {label:<28} {elapsed:8.1f} ms  upstream {upstream:>2}  PATCH {patches:>4}  POST {posts:>3}  "
+        f"429 {fake.throttled - throttled_before:>3}  breaker {cog.status_breaker.state}"
+    )
+
+async def main(directory: Path):
+    app = create_app('operational', latency=UPSTREAM_LATENCY, retry_after=1.0)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', PORT).start()
+    state = app['state']
+    url = f"http://127.0.0.1:{PORT}"
+
+    http_client = HTTPClient(limit_per_host=100)
+    await http_client.start()
+    client = discord.Client(intents=discord.Intents.none())
+    fake = FakeDiscord(DISCORD_LATENCY)
+    client.http.request = fake.request
+    fanout = FanoutDispatcher(max_concurrency=fivem_status.STATUS_FANOUT_CONCURRENCY, min_interval=0.0)
+
+    try:
+        # Grabar los dos escenarios del servidor local y reproducirlos desde disco
+        recordings = {}
+        for scenario in ('operational', 'partial_outage'):
+            state['scenario'] = scenario
+            recordings[scenario] = directory / scenario
+            await record(url, recordings[scenario], http_client)
+            assert all(components for components in check_recording(recordings[scenario]).values()), "recording must parse"
+        state['recording'] = recordings['operational']
+        print(f"Recorded and replaying {', '.join(recordings)}; {GUILDS} guilds, "
+              f"upstream {UPSTREAM_LATENCY * 1000:.0f} ms, Discord {DISCORD_LATENCY * 1000:.0f} ms")
+
+        async def wait_until_ready():
+            return None
+
+        bot = SimpleNamespace(
+            http_client=http_client,
+            user=None,
+            get_channel=client.get_partial_messageable,
+            wait_until_ready=wait_until_ready
+        )
+        session_factory = temp_session_factory(directory)
+        cog = FiveMStatus(bot)
+        cog.status_url = url
+        cog.summary_url = f"{url}/api/v2/summary.json"
+        cog.monitor_store = MonitorStore(session_factory)
+        cog.status_history = StatusHistory(session_factory)
+        cog.fanout = fanout
+
+        # Paneles existentes; uno de cada veinte fue borrado y se volverá a crear
+        for guild_id in range(1, GUILDS + 1):
+            message_id = 5000 + guild_id
+            if guild_id % 20:
+                fake.panels[message_id] = None
+            cog.active_monitors[guild_id] = {'channel_id': 1000 + guild_id, 'message_id': message_id}
+        await cog.monitor_store.save_many({
+            guild_id: (info['channel_id'], info['message_id']) for guild_id, info in cog.active_monitors.items()
+        })
+
+        await cycle("initial", cog, state, fake, expect_requests=1)
+        await cycle("unchanged (304)", cog, state, fake, expect_requests=1)
+        state['recording'] = recordings['partial_outage']
+        await cycle("partial outage", cog, state, fake, expect_requests=1)
+
+        fake.throttle_every = 7
+        state['recording'] = recordings['operational']
+        await cycle("recovered, Discord 429s", cog, state, fake, expect_requests=1)
+        fake.throttle_every = 0
+
+        # 429 en status.cfx.re: ni el HTML de respaldo ni el ciclo siguiente consultan antes de Retry-After
+        state['throttle_every'] = 1
+        await cycle("upstream 429", cog, state, fake, expect_requests=1)
+        await cycle("waiting for Retry-After", cog, state, fake, expect_requests=0)
+        state['throttle_every'] = 0
+        await asyncio.sleep(state['retry_after'])
+        await cycle("after Retry-After", cog, state, fake, expect_requests=1)
+
+        # Errores 500 seguidos: marca de datos desactualizados y, al tercero, circuito abierto
+        state['error_rate'] = 1.0
+        for attempt in range(1, fivem_status.BREAKER_FAILURE_THRESHOLD + 1):
+            await cycle(f"upstream 500 #{attempt}", cog, state, fake, expect_requests=2)
+        assert cog.status_stale and cog.status_breaker.state == cog.status_breaker.OPEN
+        await cycle("circuit open", cog, state, fake, expect_requests=0)
+        print(f"Stand-in: {state['requests']} requests, {state['not_modified']} not modified, "
+              f"{state['errors']} errors, {state['throttled']} throttled")
+    finally:
+        await fanout.close()
+        await http_client.close()
+        await runner.cleanup()
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.CRITICAL)
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(main(Path(directory)))
@@ -0,0 +1,131 @@
+"""Time one status-panel cycle for a growing number of guilds.
+
+Run from the repository root:
+    python -m benchmarks.bench_status_embed
+
+"legacy" rebuilds and hashes the whole embed per guild, as the cog used to.
+"shared" builds the snapshot payload once and, per guild, only hashes it
+with the guild's own bits; "shared, changed" also builds every guild's embed
+(what a cycle with a new status costs). Panels are first checked to be
+identical to the legacy rendering, so this doubles as a regression check.
+"""
+import hashlib
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+import discord
+
+from cogs.fivem_status import FiveMStatus, game_server_fields, panel_embed, panel_hash
+from utils.fxserver import GameServer, ServerStatus
+from utils.status_page import StatuspageParser
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'status_cfx'
+GUILDS = (1, 10, 100, 1000)
+ICON_URL = "https://cdn.discordapp.com/avatars/1/abc.png"
+
+def legacy_embed(cog: FiveMStatus, status_data: dict, game_servers=None) -> discord.Embed:
+    """The previous create_status_embed: three passes over status_data and emoji checks for the colour"""
+    if "🟢" in status_data.get("overall", ""):
+        color = 0x00ff00
+    elif "🟡" in status_data.get("overall", ""):
+        color = 0xffff00
+    elif "🟠" in status_data.get("overall", ""):
+        color = 0xff8000
+    elif "🔴" in status_data.get("overall", ""):
+        color = 0xff0000
+    else:
+        color = 0x808080
+    description = (
+        f"**Estado General:** {status_data.get('overall', 'Desconocido')}\n\n"
+        f"Información actualizada desde [status.cfx.re]({cog.status_url})"
+    )
+    if cog.status_stale and cog.last_status_time:
+        description += (
+            f"\n⚠️ **Datos desactualizados** desde <t:{int(cog.last_status_time.timestamp())}:R>: "
+            f"status.cfx.re no responde"
+        )
+    embed = discord.Embed(title="📊 Estado de los Servidores FiveM", description=description, color=color, timestamp=datetime.utcnow())
+    for field in game_server_fields(game_servers):
+        embed.add_field(**field)
+    for name, services in (
+        ("🎮 **Servicios de Juego**", ["🎮 FiveM", "🤠 RedM", "🖥️ FXServer", "🎯 Game Services"]),
+        ("🛠️ **Servicios de Plataforma**", ["🔗 CnL", "📋 Policy", "🔑 Keymaster", "🌐 Web Services"]),
+        ("👥 **Servicios de Comunidad**", ["💬 Forums", "📋 Server List", "⚡ Runtime", "🆔 IDMS", "🚪 Portal"])
+    ):
+        lines = [f"{service}: {status}" for service, status in status_data.items() if service in services]
+        if lines:
+            embed.add_field(name=name, value="\n".join(lines), inline=False)
+    embed.set_footer(text="🔄 Actualizado automáticamente cada 30 segundos • PT Scripts BOT", icon_url=ICON_URL)
+    return embed
+
+def legacy_hash(embed: discord.Embed) -> str:
+    payload = embed.to_dict()
+    payload.pop('timestamp', None)
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+def without_timestamp(embed: discord.Embed) -> dict:
+    payload = embed.to_dict()
+    payload.pop('timestamp', None)
+    return payload
+
+def make_cog() -> FiveMStatus:
+    bot = SimpleNamespace(user=SimpleNamespace(avatar=SimpleNamespace(url=ICON_URL)))
+    return FiveMStatus(bot)
+
+def check(cog: FiveMStatus, snapshots: list, game_servers: list):
+    for status_data in snapshots:
+        for servers in (None, game_servers):
+            for stale in (False, True):
+                cog.status_stale = stale
+                cog.last_status_time = datetime(2026, 10, 18, 21, 4, tzinfo=timezone.utc)
+                new = cog.create_status_embed(status_data, servers)
+                assert without_timestamp(new) == without_timestamp(legacy_embed(cog, status_data, servers)), "panel differs"
+    cog.status_stale = False
+    print("Panels OK")
+
+def main():
+    parser = StatuspageParser()
+    snapshots = [
+        parser.parse(json.loads((FIXTURES / f'summary_{scenario}.json').read_text()))
+        for scenario in ('operational', 'partial_outage')
+    ]
+    game_servers = [
+        (GameServer("Neon Vice", "127.0.0.1:30120"), ServerStatus("127.0.0.1:30120", True, players=45, max_players=128)),
+        (GameServer("Pruebas", "127.0.0.1:30121"), ServerStatus("127.0.0.1:30121", False, error="HTTP 503"))
+    ]
+    cog = make_cog()
+    check(cog, snapshots, game_servers)
+
+    status_data = snapshots[1]
+    for guilds in GUILDS:
+        # Uno de cada diez servidores de Discord muestra también sus FXServer
+        per_guild = [game_servers if index % 10 == 0 else None for index in range(guilds)]
+
+        start = time.perf_counter()
+        for servers in per_guild:
+            legacy_hash(legacy_embed(cog, status_data, servers))
+        legacy = (time.perf_counter() - start) * 1000
+
+        def shared_cycle(build: bool):
+            cog.last_payload = None  # Un estado nuevo por ciclo
+            payload = cog.status_payload(status_data)
+            icon_url = cog.panel_icon_url()
+            for servers in per_guild:
+                fields = game_server_fields(servers)
+                panel_hash(payload, fields, icon_url)
+                if build:
+                    panel_embed(payload, fields, icon_url)
+
+        start = time.perf_counter()
+        shared_cycle(build=False)
+        unchanged = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        shared_cycle(build=True)
+        changed = (time.perf_counter() - start) * 1000
+        print(f"  {guilds:>5} guilds: legacy {legacy:8.2f} ms, shared {unchanged:7.2f} ms, shared, changed {changed:7.2f} ms")
+
+if __name__ == '__main__':
+    main()
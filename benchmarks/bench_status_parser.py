@@ -0,0 +1,61 @@
+"""Check the FiveM status parsers against the recorded fixtures and time them.
+
+Run from the repository root:
+    python -m benchmarks.bench_status_parser
+
+Each fixture page must parse to its expected_<scenario>.json before anything
+is timed, so the benchmark doubles as the parser regression check.
+"""
+import json
+import re
+import time
+from pathlib import Path
+
+from utils.status_page import SERVICES, StatuspageParser, parse_status_html
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'status_cfx'
+SCENARIOS = ('operational', 'partial_outage')
+ITERATIONS = 500
+
+def legacy_parse(content: str) -> dict:
+    """The previous parser: one DOTALL re.search per service over the whole page"""
+    status_dict = {}
+    for name, display_name in SERVICES.items():
+        pattern = rf"{re.escape(name)}.*?(?:Operational|Degraded Performance|Partial Outage|Major Outage|Maintenance)"
+        match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
+        status_dict[display_name] = match.group(0)[-20:] if match else None
+    return status_dict
+
+def check_fixtures():
+    for scenario in SCENARIOS:
+        expected = json.loads((FIXTURES / f'expected_{scenario}.json').read_text())
+        html = parse_status_html((FIXTURES / f'status_{scenario}.html').read_text())
+        summary = StatuspageParser().parse(json.loads((FIXTURES / f'summary_{scenario}.json').read_text()))
+        assert html == expected, f"HTML parser mismatch for {scenario}: {html}"
+        assert summary == expected, f"JSON parser mismatch for {scenario}: {summary}"
+
+    components = StatuspageParser().parse(json.loads((FIXTURES / 'components.json').read_text()))
+    assert components == json.loads((FIXTURES / 'expected_operational.json').read_text()), "components.json mismatch"
+    assert parse_status_html((FIXTURES / 'not_found.html').read_text()) == {}, "404 page must not parse"
+    print("Fixtures OK")
+
+def timed(label: str, func, argument):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func(argument)
+    per_call = (time.perf_counter() - start) / ITERATIONS * 1e6
+    print(f"  {label:<22} {per_call:9.1f} µs/parse")
+
+def main():
+    check_fixtures()
+    for scenario in SCENARIOS:
+        page = (FIXTURES / f'status_{scenario}.html').read_text()
+        summary = json.loads((FIXTURES / f'summary_{scenario}.json').read_text())
+        parser = StatuspageParser()
+        print(f"{scenario} ({len(page) / 1024:.0f} KB page)")
+        timed("legacy HTML (13 scans)", legacy_parse, page)
+        timed("single-pass HTML", parse_status_html, page)
+        timed("summary.json", parser.parse, summary)
+
+if __name__ == '__main__':
+    main()
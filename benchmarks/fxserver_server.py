@@ -0,0 +1,87 @@
+"""Local stand-in for our FXServer instances (info.json, players.json, dynamic.json).
+
+Run from the repository root and add its servers with /servidores_fivem:
+    python -m benchmarks.fxserver_server --servers 3 --port 30120
+    /servidores_fivem agregar nombre:Local direccion:127.0.0.1:30120/1
+
+One process serves many game servers, each under its own path prefix
+(/0/info.json, /1/info.json, ...); server 0 also answers at the root. Each
+server's player count, availability and sv_requestParanoia-style blocking of
+dynamic.json can be changed through app['state'].
+"""
+import argparse
+import asyncio
+import copy
+import json
+from pathlib import Path
+
+from aiohttp import web
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'fxserver'
+
+def load_fixtures() -> dict:
+    return {name: json.loads((FIXTURES / f'{name}.json').read_text()) for name in ('info', 'players', 'dynamic')}
+
+def server_state(index: int, players: int) -> dict:
+    return {'players': players, 'online': True, 'paranoia': False, 'latency': 0.0, 'name': f"Neon Vice #{index}"}
+
+def create_app(servers: int = 1, latency: float = 0.0, max_players: int = 128) -> web.Application:
+    """Build the stand-in app; tests can change each server via app['state']['servers'][index]"""
+    app = web.Application()
+    fixtures = load_fixtures()
+    template_player = fixtures['players'][0]
+    state = app['state'] = {
+        'requests': 0,
+        'latency': latency,
+        'servers': [server_state(index, (index * 17 + 45) % (max_players + 1)) for index in range(servers)]
+    }
+
+    def players_list(count: int) -> list:
+        players = []
+        for index in range(count):
+            player = copy.deepcopy(template_player)
+            player.update(id=index + 1, name=f"Jugador{index + 1}", ping=30 + index % 60)
+            players.append(player)
+        return players
+
+    async def handler(request: web.Request) -> web.Response:
+        state['requests'] += 1
+        index = int(request.match_info.get('index', 0))
+        if index >= len(state['servers']):
+            raise web.HTTPNotFound()
+        server = state['servers'][index]
+        delay = state['latency'] + server['latency']
+        if delay:
+            await asyncio.sleep(delay)
+        if not server['online']:
+            raise web.HTTPServiceUnavailable()
+
+        endpoint = request.match_info['endpoint']
+        if endpoint == 'info':
+            data = copy.deepcopy(fixtures['info'])
+            data['vars']['sv_maxClients'] = str(max_players)
+            data['vars']['sv_projectName'] = server['name']
+        elif endpoint == 'players':
+            data = players_list(server['players'])
+        else:
+            if server['paranoia']:
+                raise web.HTTPNotFound()
+            data = dict(fixtures['dynamic'], clients=server['players'], sv_maxclients=str(max_players), hostname=server['name'])
+        # FXServer responde JSON sin content-type de JSON
+        return web.Response(text=json.dumps(data), content_type='text/plain')
+
+    app.router.add_get('/{endpoint:(info|players|dynamic)}.json', handler)
+    app.router.add_get('/{index:\\d+}/{endpoint:(info|players|dynamic)}.json', handler)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=30120)
+    parser.add_argument('--servers', type=int, default=1, help="Number of game servers to serve")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds to delay every response")
+    args = parser.parse_args()
+    web.run_app(create_app(args.servers, latency=args.latency), host=args.host, port=args.port)
+
+if __name__ == '__main__':
+    main()
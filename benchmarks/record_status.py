@@ -0,0 +1,106 @@
+"""Record status.cfx.re responses as replayable fixtures.
+
+Run from the repository root:
+    python -m benchmarks.record_status incident-2026-10-18
+    python -m benchmarks.record_status local --url http://127.0.0.1:8080
+
+Each recording is a directory under benchmarks/fixtures/status_cfx/recorded
+with one body file per endpoint and a manifest.json holding the status,
+content type and caching headers. Error pages are recorded as they are, so
+a format change or an outage upstream can be replayed exactly with
+    python -m benchmarks.status_server --recording incident-2026-10-18
+After recording, every body is run through the cog's parsers and the number
+of components recognised is printed; zero means the format changed.
+"""
+import argparse
+import asyncio
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from utils.http import HTTPClient
+from utils.status_page import StatuspageParser, parse_status_html
+
+RECORDINGS = Path(__file__).parent / 'fixtures' / 'status_cfx' / 'recorded'
+MANIFEST = 'manifest.json'
+# Ruta -> nombre del fichero con el cuerpo
+PATHS = {
+    '/api/v2/summary.json': 'summary.json',
+    '/api/v2/components.json': 'components.json',
+    '/': 'status.html'
+}
+KEPT_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Retry-After')
+
+def recording_path(name: str) -> Path:
+    """A recording name, or a path to a recording directory"""
+    path = Path(name)
+    return path if path.is_dir() else RECORDINGS / name
+
+def load_recording(directory: Path) -> dict:
+    """{path: {'status', 'content_type', 'headers', 'body'}} for a recorded directory"""
+    manifest = json.loads((directory / MANIFEST).read_text())
+    return {
+        path: {**response, 'body': (directory / response['file']).read_bytes()}
+        for path, response in manifest['responses'].items()
+    }
+
+async def record(url: str, directory: Path, http_client: Optional[HTTPClient] = None) -> dict:
+    """Fetch every endpoint under url and write the recording to directory"""
+    own_client = http_client is None
+    if own_client:
+        http_client = HTTPClient()
+        await http_client.start()
+    directory.mkdir(parents=True, exist_ok=True)
+    responses = {}
+    try:
+        for path, filename in PATHS.items():
+            async with http_client.get(url.rstrip('/') + path) as response:
+                body = await response.read()
+                responses[path] = {
+                    'status': response.status,
+                    'content_type': response.content_type,
+                    'headers': {key: response.headers[key] for key in KEPT_HEADERS if key in response.headers},
+                    'file': filename
+                }
+            (directory / filename).write_bytes(body)
+    finally:
+        if own_client:
+            await http_client.close()
+
+    manifest = {
+        'source': url,
+        'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'responses': responses
+    }
+    (directory / MANIFEST).write_text(json.dumps(manifest, indent=2) + '\n')
+    return manifest
+
+def check_recording(directory: Path) -> dict:
+    """Components each recorded body parses to, keyed by path"""
+    results = {}
+    for path, response in load_recording(directory).items():
+        if response['status'] != 200:
+            results[path] = f"HTTP {response['status']}"
+            continue
+        if path.endswith('.json'):
+            parsed = StatuspageParser().parse(json.loads(response['body']))
+        else:
+            parsed = parse_status_html(response['body'].decode('utf-8', errors='replace'))
+        results[path] = len([name for name in parsed if name != 'overall'])
+    return results
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('name', help="Recording name (directory under fixtures/status_cfx/recorded)")
+    parser.add_argument('--url', default='https://status.cfx.re')
+    args = parser.parse_args()
+
+    directory = recording_path(args.name)
+    manifest = await record(args.url, directory)
+    print(f"Recorded {args.url} to {directory}")
+    for path, components in check_recording(directory).items():
+        print(f"  {path:<26} HTTP {manifest['responses'][path]['status']}, components parsed: {components}")
+
+if __name__ == '__main__':
+    asyncio.run(main())
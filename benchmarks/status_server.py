@@ -0,0 +1,164 @@
+"""Local stand-in for status.cfx.re that serves the recorded fixtures.
+
+Run from the repository root and point the bot at it:
+    python -m benchmarks.status_server --scenario partial_outage --port 8080
+    FIVEM_STATUS_URL=http://127.0.0.1:8080 python main.py
+
+Scenarios map to fixture files in benchmarks/fixtures/status_cfx. With
+--no-api the JSON endpoints return 404 so the HTML fallback is exercised.
+--recording replays a capture made by benchmarks.record_status instead.
+Faults can be injected on top: --latency delays every response,
+--error-rate answers that fraction of requests with a 500, and
+--throttle-every N answers every Nth request with a 429 and Retry-After.
+"""
+import argparse
+import asyncio
+import hashlib
+import random
+from pathlib import Path
+from typing import Optional
+
+from aiohttp import web
+
+from benchmarks.record_status import load_recording, recording_path
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'status_cfx'
+LAST_MODIFIED = 'Sun, 18 Oct 2026 21:04:11 GMT'
+SCENARIOS = ('operational', 'partial_outage')
+
+def create_app(
+    scenario: str = 'operational',
+    api: bool = True,
+    latency: float = 0.0,
+    recording: Optional[Path] = None,
+    error_rate: float = 0.0,
+    throttle_every: int = 0,
+    retry_after: float = 1.0,
+    seed: int = 0
+) -> web.Application:
+    """Build the stand-in app; tests can switch the scenario, recording and faults via app['state']"""
+    app = web.Application()
+    state = app['state'] = {
+        'scenario': scenario,
+        'api': api,
+        'recording': recording,
+        'latency': latency,
+        'error_rate': error_rate,
+        'throttle_every': throttle_every,
+        'retry_after': retry_after,
+        'requests': 0,
+        'not_modified': 0,
+        'errors': 0,
+        'throttled': 0
+    }
+    # Fallos reproducibles: la misma semilla da la misma secuencia de errores
+    rng = random.Random(seed)
+    recordings = {}
+
+    @web.middleware
+    async def faults(request: web.Request, handler):
+        state['requests'] += 1
+        if state['latency']:
+            await asyncio.sleep(state['latency'])
+        if state['throttle_every'] and state['requests'] % state['throttle_every'] == 0:
+            state['throttled'] += 1
+            return web.Response(status=429, headers={'Retry-After': f"{state['retry_after']:g}"}, text='Too Many Requests')
+        if state['error_rate'] and rng.random() < state['error_rate']:
+            state['errors'] += 1
+            return web.Response(status=500, text='Internal Server Error')
+        return await handler(request)
+
+    app.middlewares.append(faults)
+
+    def fixture(name: str) -> bytes:
+        return (FIXTURES / name).read_bytes()
+
+    def cacheable(request: web.Request, body: bytes, content_type: str) -> web.Response:
+        """Answer with validators, or 304 when the client's ETag still matches"""
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        headers = {'ETag': etag, 'Last-Modified': LAST_MODIFIED, 'Cache-Control': 'max-age=0, private, must-revalidate'}
+        if request.headers.get('If-None-Match') == etag:
+            state['not_modified'] += 1
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=body, content_type=content_type, headers=headers)
+
+    def replay(request: web.Request) -> Optional[web.Response]:
+        """The recorded response for this path, if a recording is active"""
+        if state['recording'] is None:
+            return None
+        directory = Path(state['recording'])
+        if directory not in recordings:
+            recordings[directory] = load_recording(directory)
+        recorded = recordings[directory].get(request.path)
+        if recorded is None:
+            return web.Response(status=404, body=fixture('not_found.html'), content_type='text/html')
+        if recorded['status'] == 200:
+            return cacheable(request, recorded['body'], recorded['content_type'])
+        return web.Response(
+            status=recorded['status'],
+            body=recorded['body'],
+            content_type=recorded['content_type'],
+            headers=recorded['headers']
+        )
+
+    async def summary(request: web.Request) -> web.Response:
+        replayed = replay(request)
+        if replayed is not None:
+            return replayed
+        if not state['api']:
+            return web.Response(status=404, body=fixture('not_found.html'), content_type='text/html')
+        return cacheable(request, fixture(f"summary_{state['scenario']}.json"), 'application/json')
+
+    async def components(request: web.Request) -> web.Response:
+        replayed = replay(request)
+        if replayed is not None:
+            return replayed
+        if not state['api']:
+            return web.Response(status=404, body=fixture('not_found.html'), content_type='text/html')
+        return cacheable(request, fixture('components.json'), 'application/json')
+
+    async def page(request: web.Request) -> web.Response:
+        replayed = replay(request)
+        if replayed is not None:
+            return replayed
+        return cacheable(request, fixture(f"status_{state['scenario']}.html"), 'text/html')
+
+    async def not_found(request: web.Request) -> web.Response:
+        replayed = replay(request)
+        if replayed is not None:
+            return replayed
+        return web.Response(status=404, body=fixture('not_found.html'), content_type='text/html')
+
+    app.router.add_get('/api/v2/summary.json', summary)
+    app.router.add_get('/api/v2/components.json', components)
+    app.router.add_get('/', page)
+    app.router.add_get('/{tail:.*}', not_found)
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--scenario', choices=SCENARIOS, default='operational')
+    parser.add_argument('--no-api', action='store_true', help="Serve only the HTML page")
+    parser.add_argument('--recording', help="Replay a recording (name under fixtures/status_cfx/recorded, or a path)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds to delay every response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument('--throttle-every', type=int, default=0, help="Answer every Nth request with HTTP 429")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="Retry-After seconds sent with each 429")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the injected errors")
+    args = parser.parse_args()
+    app = create_app(
+        args.scenario,
+        api=not args.no_api,
+        latency=args.latency,
+        recording=recording_path(args.recording) if args.recording else None,
+        error_rate=args.error_rate,
+        throttle_every=args.throttle_every,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+if __name__ == '__main__':
+    main()
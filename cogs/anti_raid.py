@@ -0,0 +1,455 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import asyncio
+import logging
+import time
+from array import array
+from datetime import timedelta
+from typing import Dict, Optional
+from utils.helpers import load_config, save_config
+from utils.concurrency import RateLimitedExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANTI_RAID_SETTINGS = {
+    'enabled': False,
+    'join_threshold': 10,         # Entradas dentro de la ventana para activar el modo raid
+    'window_seconds': 10,
+    'young_account_days': 7,      # Cuentas más nuevas que esto cuentan como sospechosas
+    'young_threshold': 5,         # Cuentas nuevas dentro de la ventana para activar el modo raid
+    'raid_duration_minutes': 10,  # Tiempo sin nuevas ráfagas antes de salir del modo raid
+    'actions': ['alert', 'pause_welcome'],
+    'alert_channel_id': None,
+    'timeout_minutes': 60
+}
+
+RAID_ACTION_LABELS = {
+    'alert': '🚨 Alertar al staff',
+    'pause_welcome': '⏸️ Pausar bienvenidas',
+    'lockdown_verification': '🔒 Bloquear verificación',
+    'timeout': '🔇 Timeout automático'
+}
+
+class JoinWindow:
+    """Fixed-size ring buffers of recent joins for one guild.
+
+    The join buffer holds the last join_threshold joins, so after writing a join
+    the next slot is the oldest of them: if it falls inside the window, the
+    threshold was reached. Same for young accounts. Each join is O(1) and writes
+    into preallocated arrays without creating per-event objects.
+    """
+
+    __slots__ = (
+        'join_times', 'member_ids', 'join_head',
+        'young_times', 'young_head',
+        'raid_until', 'raid_started', 'joins_in_raid'
+    )
+
+    def __init__(self, join_threshold: int, young_threshold: int):
+        self.join_times = array('d', [0.0]) * join_threshold
+        self.member_ids = array('Q', [0]) * join_threshold
+        self.join_head = 0
+        self.young_times = array('d', [0.0]) * young_threshold
+        self.young_head = 0
+        self.raid_until = 0.0
+        self.raid_started = 0.0
+        self.joins_in_raid = 0
+
+    def record(self, now: float, member_id: int, young: bool, window: float) -> bool:
+        """Record a join and return whether a threshold tripped"""
+        head = self.join_head
+        self.join_times[head] = now
+        self.member_ids[head] = member_id
+        head = (head + 1) % len(self.join_times)
+        self.join_head = head
+        oldest = self.join_times[head]
+        tripped = oldest > 0.0 and now - oldest <= window
+
+        if young:
+            head = self.young_head
+            self.young_times[head] = now
+            head = (head + 1) % len(self.young_times)
+            self.young_head = head
+            oldest = self.young_times[head]
+            tripped = tripped or (oldest > 0.0 and now - oldest <= window)
+
+        return tripped
+
+    def recent_member_ids(self, now: float, window: float):
+        """Yield the IDs of members that joined within the window"""
+        for joined, member_id in zip(self.join_times, self.member_ids):
+            if joined > 0.0 and now - joined <= window:
+                yield member_id
+
+    def count_recent(self, now: float, window: float) -> int:
+        return sum(1 for joined in self.join_times if joined > 0.0 and now - joined <= window)
+
+    def is_raid_active(self, now: float) -> bool:
+        return now < self.raid_until
+
+class AntiRaid(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.settings: Dict[int, dict] = {}
+        self.windows: Dict[int, JoinWindow] = {}
+        self.executor = RateLimitedExecutor(max_concurrency=3, min_interval=0.3)
+        self.load_settings()
+
+    def load_settings(self):
+        """Cache anti-raid settings for every guild so joins never touch config.json"""
+        config = load_config()
+        self.settings = {}
+        for guild_id_str, server_config in config.get('servers', {}).items():
+            if 'anti_raid' in server_config:
+                self.settings[int(guild_id_str)] = {**DEFAULT_ANTI_RAID_SETTINGS, **server_config['anti_raid']}
+        self.windows = {}
+
+    def get_settings(self, guild_id: int) -> dict:
+        return self.settings.get(guild_id, DEFAULT_ANTI_RAID_SETTINGS)
+
+    def get_window(self, guild_id: int, settings: dict) -> JoinWindow:
+        window = self.windows.get(guild_id)
+        if window is None:
+            window = JoinWindow(settings['join_threshold'], settings['young_threshold'])
+            self.windows[guild_id] = window
+        return window
+
+    def _raid_action_active(self, guild_id: int, action: str) -> bool:
+        settings = self.settings.get(guild_id)
+        if not settings or not settings['enabled'] or action not in settings['actions']:
+            return False
+        window = self.windows.get(guild_id)
+        return bool(window and window.is_raid_active(time.monotonic()))
+
+    def welcomes_paused(self, guild_id: int) -> bool:
+        """Check if welcome messages are paused by an active raid"""
+        return self._raid_action_active(guild_id, 'pause_welcome')
+
+    def verification_locked(self, guild_id: int) -> bool:
+        """Check if verification is locked down by an active raid"""
+        return self._raid_action_active(guild_id, 'lockdown_verification')
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        """Track join bursts and trigger raid responses"""
+        settings = self.settings.get(member.guild.id)
+        if not settings or not settings['enabled']:
+            return
+
+        now = time.monotonic()
+        window_seconds = settings['window_seconds']
+        account_age = discord.utils.utcnow() - member.created_at
+        young = account_age.days < settings['young_account_days']
+
+        window = self.get_window(member.guild.id, settings)
+        tripped = window.record(now, member.id, young, window_seconds)
+        raid_active = window.is_raid_active(now)
+
+        if raid_active:
+            window.joins_in_raid += 1
+
+        if tripped:
+            # Cada ráfaga nueva extiende el modo raid
+            window.raid_until = now + settings['raid_duration_minutes'] * 60
+            if not raid_active:
+                window.raid_started = now
+                window.joins_in_raid = window.count_recent(now, window_seconds)
+                asyncio.create_task(self.start_raid_response(member.guild, settings, window, now))
+                return
+
+        if raid_active and 'timeout' in settings['actions'] and not member.bot:
+            asyncio.create_task(self._timeout_members(member.guild, [member], settings))
+
+    async def start_raid_response(self, guild: discord.Guild, settings: dict, window: JoinWindow, now: float):
+        """Apply the configured responses when a guild enters raid mode"""
+        try:
+            logger.warning(
+                f"Raid detected in {guild.name} ({guild.id}): {window.joins_in_raid} joins "
+                f"in {settings['window_seconds']}s"
+            )
+
+            if 'timeout' in settings['actions']:
+                members = []
+                for member_id in window.recent_member_ids(now, settings['window_seconds']):
+                    member = guild.get_member(member_id)
+                    if member and not member.bot:
+                        members.append(member)
+                await self._timeout_members(guild, members, settings)
+
+            if 'alert' in settings['actions']:
+                await self._send_alert(guild, settings, window)
+
+            await self._watch_raid_end(guild, settings, window)
+        except Exception as e:
+            logger.error(f"Error handling raid in {guild.name}: {e}")
+
+    async def _timeout_members(self, guild: discord.Guild, members, settings: dict):
+        if not members or not guild.me.guild_permissions.moderate_members:
+            return
+        until = discord.utils.utcnow() + timedelta(minutes=settings['timeout_minutes'])
+        results = await self.executor.map(
+            lambda member: member.timeout(until, reason="Anti-raid: ráfaga de entradas"),
+            members
+        )
+        failed = sum(1 for _, _, error in results if error)
+        logger.info(f"Anti-raid timed out {len(members) - failed} members in {guild.name} ({failed} failed)")
+
+    async def _send_alert(self, guild: discord.Guild, settings: dict, window: JoinWindow, ended: bool = False):
+        channel_id = settings.get('alert_channel_id')
+        channel = guild.get_channel(channel_id) if channel_id else None
+        if not channel:
+            logger.warning(f"Anti-raid alert channel not configured for {guild.name}")
+            return
+
+        if ended:
+            embed = discord.Embed(
+                title="✅ Modo raid finalizado",
+                description=f"No se detectaron nuevas ráfagas. Entradas durante el raid: **{window.joins_in_raid}**.",
+                color=0x00ff00
+            )
+            await channel.send(embed=embed)
+            return
+
+        embed = discord.Embed(
+            title="🚨 Posible raid detectado",
+            description=f"Se detectaron **{window.joins_in_raid}** entradas en menos de "
+                       f"**{settings['window_seconds']}** segundos.",
+            color=0xff0000,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(
+            name="Respuestas activas",
+            value="\n".join(RAID_ACTION_LABELS.get(action, action) for action in settings['actions']),
+            inline=False
+        )
+        embed.add_field(
+            name="Duración",
+            value=f"{settings['raid_duration_minutes']} minutos sin nuevas ráfagas",
+            inline=True
+        )
+        embed.set_footer(text="Usa /finalizar_raid para salir del modo raid manualmente")
+
+        server_config = load_config().get('servers', {}).get(str(guild.id), {})
+        role_id = server_config.get('staff_mention_role_id')
+        content = f"<@&{role_id}>" if role_id else None
+        await channel.send(content=content, embed=embed)
+
+    async def _watch_raid_end(self, guild: discord.Guild, settings: dict, window: JoinWindow):
+        """Sleep until raid mode expires (it may be extended) and announce the end"""
+        while True:
+            remaining = window.raid_until - time.monotonic()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(remaining)
+        logger.info(f"Raid mode ended in {guild.name}")
+        if 'alert' in settings['actions']:
+            await self._send_alert(guild, settings, window, ended=True)
+
+    @app_commands.command(name="configurar_antiraid", description="Configura la detección automática de raids")
+    @app_commands.describe(
+        activado="Activar o desactivar la detección",
+        umbral_entradas="Entradas dentro de la ventana que activan el modo raid",
+        ventana_segundos="Tamaño de la ventana en segundos",
+        dias_cuenta_nueva="Cuentas con menos días que esto se consideran nuevas",
+        umbral_cuentas_nuevas="Cuentas nuevas dentro de la ventana que activan el modo raid",
+        canal_alertas="Canal donde se avisará al staff",
+        pausar_bienvenida="Pausar los mensajes de bienvenida durante un raid",
+        bloquear_verificacion="Bloquear la verificación durante un raid",
+        timeout_automatico="Silenciar automáticamente a los usuarios de la ráfaga",
+        duracion_raid_minutos="Minutos sin ráfagas antes de salir del modo raid"
+    )
+    async def configure_anti_raid(
+        self,
+        interaction: discord.Interaction,
+        activado: Optional[bool] = None,
+        umbral_entradas: Optional[app_commands.Range[int, 2, 500]] = None,
+        ventana_segundos: Optional[app_commands.Range[int, 1, 3600]] = None,
+        dias_cuenta_nueva: Optional[app_commands.Range[int, 0, 365]] = None,
+        umbral_cuentas_nuevas: Optional[app_commands.Range[int, 2, 500]] = None,
+        canal_alertas: Optional[discord.TextChannel] = None,
+        pausar_bienvenida: Optional[bool] = None,
+        bloquear_verificacion: Optional[bool] = None,
+        timeout_automatico: Optional[bool] = None,
+        duracion_raid_minutos: Optional[app_commands.Range[int, 1, 1440]] = None
+    ):
+        """Configure anti-raid thresholds and responses"""
+        try:
+            if not interaction.user.guild_permissions.administrator:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="Necesitas permisos de administrador para usar este comando.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            config = load_config()
+            guild_id_str = str(interaction.guild.id)
+            if 'servers' not in config:
+                config['servers'] = {}
+            if guild_id_str not in config['servers']:
+                config['servers'][guild_id_str] = {}
+
+            settings = {**DEFAULT_ANTI_RAID_SETTINGS, **config['servers'][guild_id_str].get('anti_raid', {})}
+            actions = set(settings['actions'])
+
+            updates = {
+                'enabled': activado,
+                'join_threshold': umbral_entradas,
+                'window_seconds': ventana_segundos,
+                'young_account_days': dias_cuenta_nueva,
+                'young_threshold': umbral_cuentas_nuevas,
+                'raid_duration_minutes': duracion_raid_minutos,
+                'alert_channel_id': canal_alertas.id if canal_alertas else None
+            }
+            for key, value in updates.items():
+                if value is not None:
+                    settings[key] = value
+
+            if canal_alertas:
+                actions.add('alert')
+            for action, enabled in (
+                ('pause_welcome', pausar_bienvenida),
+                ('lockdown_verification', bloquear_verificacion),
+                ('timeout', timeout_automatico)
+            ):
+                if enabled is True:
+                    actions.add(action)
+                elif enabled is False:
+                    actions.discard(action)
+            settings['actions'] = sorted(actions)
+
+            config['servers'][guild_id_str]['anti_raid'] = settings
+            if not save_config(config):
+                embed = discord.Embed(
+                    title="❌ Error",
+                    description="No se pudo guardar la configuración. Inténtalo de nuevo.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            # Los umbrales pueden haber cambiado de tamaño, reiniciar las ventanas del servidor
+            self.settings[interaction.guild.id] = settings
+            self.windows.pop(interaction.guild.id, None)
+
+            embed = self._settings_embed(interaction.guild, settings)
+            embed.title = "✅ Anti-raid configurado"
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            logger.info(f"Anti-raid configured for guild {interaction.guild.id}: {settings}")
+
+        except Exception as e:
+            logger.error(f"Error configuring anti-raid: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al configurar el anti-raid.",
+                color=0xff0000
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    def _settings_embed(self, guild: discord.Guild, settings: dict) -> discord.Embed:
+        embed = discord.Embed(
+            title="🛡️ Estado del Anti-Raid",
+            color=0x3498db
+        )
+        embed.add_field(
+            name="Estado",
+            value="🟢 Activo" if settings['enabled'] else "🔴 Desactivado",
+            inline=True
+        )
+        embed.add_field(
+            name="Umbral de entradas",
+            value=f"{settings['join_threshold']} en {settings['window_seconds']}s",
+            inline=True
+        )
+        embed.add_field(
+            name="Cuentas nuevas",
+            value=f"{settings['young_threshold']} cuentas de menos de {settings['young_account_days']} días",
+            inline=True
+        )
+        channel = guild.get_channel(settings['alert_channel_id']) if settings.get('alert_channel_id') else None
+        embed.add_field(
+            name="Canal de alertas",
+            value=channel.mention if channel else "No configurado",
+            inline=True
+        )
+        embed.add_field(
+            name="Respuestas",
+            value="\n".join(RAID_ACTION_LABELS.get(action, action) for action in settings['actions']) or "Ninguna",
+            inline=False
+        )
+        return embed
+
+    @app_commands.command(name="estado_antiraid", description="Muestra la configuración y el estado actual del anti-raid")
+    async def anti_raid_status(self, interaction: discord.Interaction):
+        """Show anti-raid configuration and raid mode state"""
+        try:
+            settings = self.get_settings(interaction.guild.id)
+            embed = self._settings_embed(interaction.guild, settings)
+
+            window = self.windows.get(interaction.guild.id)
+            now = time.monotonic()
+            if window and window.is_raid_active(now):
+                embed.add_field(
+                    name="🚨 Modo raid",
+                    value=f"Activo • {window.joins_in_raid} entradas • termina en {int(window.raid_until - now)}s",
+                    inline=False
+                )
+            else:
+                embed.add_field(name="Modo raid", value="Inactivo", inline=False)
+
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+        except Exception as e:
+            logger.error(f"Error showing anti-raid status: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al mostrar el estado del anti-raid.",
+                color=0xff0000
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="finalizar_raid", description="Sale manualmente del modo raid")
+    async def end_raid(self, interaction: discord.Interaction):
+        """Manually end raid mode"""
+        try:
+            if not interaction.user.guild_permissions.manage_guild:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="Necesitas permisos para gestionar el servidor para usar este comando.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            window = self.windows.get(interaction.guild.id)
+            if not window or not window.is_raid_active(time.monotonic()):
+                embed = discord.Embed(
+                    title="ℹ️ Sin raid activo",
+                    description="El servidor no está en modo raid.",
+                    color=0x3498db
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            window.raid_until = 0.0
+            embed = discord.Embed(
+                title="✅ Modo raid finalizado",
+                description="Las bienvenidas y la verificación vuelven a funcionar con normalidad.",
+                color=0x00ff00
+            )
+            await interaction.response.send_message(embed=embed)
+            logger.info(f"Raid mode ended manually by {interaction.user} in {interaction.guild.name}")
+
+        except Exception as e:
+            logger.error(f"Error ending raid mode: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al finalizar el modo raid.",
+                color=0xff0000
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(AntiRaid(bot))
@@ -0,0 +1,339 @@
+import discord
+from discord.ext import commands, tasks
+from discord import app_commands
+import logging
+import time
+from collections import OrderedDict, deque
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+from utils.helpers import load_config, save_config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ANTI_SPAM_SETTINGS = {
+    'enabled': False,
+    'max_messages': 6,        # Mensajes permitidos en ráfaga...
+    'per_seconds': 5,         # ...que se recuperan en este tiempo
+    'duplicate_threshold': 4, # Mensajes idénticos seguidos (en cualquier canal)
+    'max_mentions': 8,        # Menciones permitidas en MENTION_REFILL_SECONDS
+    'timeout_minutes': 10,
+    'log_channel_id': None
+}
+
+SPAM_REASON_LABELS = {
+    'flood': 'Flood de mensajes',
+    'duplicate': 'Mensajes duplicados',
+    'mentions': 'Spam de menciones'
+}
+
+MENTION_REFILL_SECONDS = 30
+DUPLICATE_WINDOW_SECONDS = 60
+RECENT_MESSAGES = 25          # Mensajes recientes por usuario para el borrado dirigido
+PUNISHMENT_COOLDOWN = 30      # Ignorar al usuario tras sancionarlo para no repetir la acción
+IDLE_SECONDS = 600
+MAX_TRACKED_USERS = 50000
+
+class UserSpamState:
+    """Token buckets and recent-message ring for one (guild, user)"""
+
+    __slots__ = (
+        'tokens', 'mention_tokens', 'updated',
+        'last_hash', 'duplicates', 'recent', 'cooldown_until'
+    )
+
+    def __init__(self, now: float, settings: dict):
+        self.tokens = float(settings['max_messages'])
+        self.mention_tokens = float(settings['max_mentions'])
+        self.updated = now
+        self.last_hash = 0
+        self.duplicates = 0
+        self.recent = deque(maxlen=RECENT_MESSAGES)
+        self.cooldown_until = 0.0
+
+    def check(self, now: float, settings: dict, content_hash: int, mentions: int) -> Optional[str]:
+        """Account for a new message and return the spam reason if a limit was exceeded"""
+        elapsed = now - self.updated
+        max_messages = settings['max_messages']
+        self.tokens = min(max_messages, self.tokens + elapsed * max_messages / settings['per_seconds']) - 1
+        max_mentions = settings['max_mentions']
+        self.mention_tokens = min(max_mentions, self.mention_tokens + elapsed * max_mentions / MENTION_REFILL_SECONDS) - mentions
+
+        if content_hash and content_hash == self.last_hash and elapsed <= DUPLICATE_WINDOW_SECONDS:
+            self.duplicates += 1
+        else:
+            self.duplicates = 1
+        self.last_hash = content_hash
+        self.updated = now
+
+        if now < self.cooldown_until:
+            return None
+        if self.mention_tokens < 0:
+            return 'mentions'
+        if self.duplicates >= settings['duplicate_threshold']:
+            return 'duplicate'
+        if self.tokens < 0:
+            return 'flood'
+        return None
+
+class SpamTracker:
+    """Bounded map of per-user spam state.
+
+    Entries are kept in last-activity order, so idle eviction only walks the
+    entries it removes and the hard cap drops the least recently active user.
+    """
+
+    def __init__(self, max_entries: int = MAX_TRACKED_USERS, idle_seconds: float = IDLE_SECONDS):
+        self.max_entries = max_entries
+        self.idle_seconds = idle_seconds
+        self.entries: "OrderedDict[Tuple[int, int], UserSpamState]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, key: Tuple[int, int], now: float, settings: dict) -> UserSpamState:
+        state = self.entries.get(key)
+        if state is None:
+            state = UserSpamState(now, settings)
+            self.entries[key] = state
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        return state
+
+    def evict_idle(self, now: float) -> int:
+        evicted = 0
+        while self.entries:
+            key, state = next(iter(self.entries.items()))
+            if now - state.updated < self.idle_seconds:
+                break
+            del self.entries[key]
+            evicted += 1
+        return evicted
+
+    def drop_guild(self, guild_id: int):
+        for key in [key for key in self.entries if key[0] == guild_id]:
+            del self.entries[key]
+
+class AntiSpam(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.settings: Dict[int, dict] = {}
+        self.tracker = SpamTracker()
+        self.load_settings()
+
+    async def cog_load(self):
+        self.evict_idle_entries.start()
+
+    def cog_unload(self):
+        self.evict_idle_entries.cancel()
+
+    def load_settings(self):
+        """Cache anti-spam settings so messages never touch config.json"""
+        config = load_config()
+        for guild_id_str, server_config in config.get('servers', {}).items():
+            if 'anti_spam' in server_config:
+                self.settings[int(guild_id_str)] = {**DEFAULT_ANTI_SPAM_SETTINGS, **server_config['anti_spam']}
+
+    @tasks.loop(minutes=1)
+    async def evict_idle_entries(self):
+        evicted = self.tracker.evict_idle(time.monotonic())
+        if evicted:
+            logger.debug(f"Anti-spam: evicted {evicted} idle entries, {len(self.tracker)} tracked")
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Feed every guild message through the author's token buckets"""
+        if message.author.bot or not message.guild:
+            return
+
+        settings = self.settings.get(message.guild.id)
+        if not settings or not settings['enabled']:
+            return
+
+        now = time.monotonic()
+        state = self.tracker.get((message.guild.id, message.author.id), now, settings)
+        state.recent.append((message.channel.id, message.id))
+
+        content_hash = hash(message.content.casefold()) if message.content else 0
+        mentions = len(message.raw_mentions) + len(message.raw_role_mentions) + (5 if message.mention_everyone else 0)
+        reason = state.check(now, settings, content_hash, mentions)
+        if reason is None:
+            return
+
+        if not isinstance(message.author, discord.Member) or message.author.guild_permissions.manage_messages:
+            return
+
+        state.cooldown_until = now + PUNISHMENT_COOLDOWN
+        recent = list(state.recent)
+        state.recent.clear()
+        await self.punish(message, reason, settings, recent)
+
+    async def punish(self, message: discord.Message, reason: str, settings: dict, recent):
+        """Timeout the spammer and bulk delete only their recent messages"""
+        guild = message.guild
+        author = message.author
+        label = SPAM_REASON_LABELS[reason]
+
+        timed_out = False
+        if settings['timeout_minutes']:
+            try:
+                await author.timeout(timedelta(minutes=settings['timeout_minutes']), reason=f"Anti-spam: {label}")
+                timed_out = True
+            except (discord.Forbidden, discord.HTTPException) as e:
+                logger.error(f"Anti-spam: could not timeout {author} ({author.id}): {e}")
+
+        # Agrupar por canal: una sola petición de borrado masivo por canal
+        by_channel: Dict[int, list] = {}
+        for channel_id, message_id in recent:
+            by_channel.setdefault(channel_id, []).append(discord.Object(id=message_id))
+
+        deleted = 0
+        for channel_id, messages in by_channel.items():
+            channel = guild.get_channel_or_thread(channel_id)
+            if not channel:
+                continue
+            try:
+                if len(messages) == 1:
+                    await channel.get_partial_message(messages[0].id).delete()
+                else:
+                    await channel.delete_messages(messages, reason=f"Anti-spam: {label}")
+                deleted += len(messages)
+            except discord.NotFound:
+                pass
+            except (discord.Forbidden, discord.HTTPException) as e:
+                logger.error(f"Anti-spam: could not delete messages in {channel}: {e}")
+
+        case_store = getattr(self.bot, 'case_store', None)
+        if case_store:
+            case_store.record(
+                guild.id, author.id, self.bot.user.id, 'antispam', label,
+                count=deleted, minutes=settings['timeout_minutes'] if timed_out else 0
+            )
+
+        logger.info(
+            f"Anti-spam: {label} by {author} ({author.id}) in {guild.name} - "
+            f"deleted {deleted} messages in {len(by_channel)} channels"
+        )
+
+        log_channel_id = settings.get('log_channel_id')
+        log_channel = guild.get_channel(log_channel_id) if log_channel_id else None
+        if log_channel:
+            embed = discord.Embed(
+                title="🛑 Anti-spam",
+                description=f"{author.mention} fue sancionado por **{label.lower()}**.",
+                color=0xff8000,
+                timestamp=discord.utils.utcnow()
+            )
+            embed.add_field(name="Mensajes eliminados", value=str(deleted), inline=True)
+            embed.add_field(name="Canales", value=str(len(by_channel)), inline=True)
+            embed.add_field(
+                name="Timeout",
+                value=f"{settings['timeout_minutes']} minutos" if timed_out else "No",
+                inline=True
+            )
+            try:
+                await log_channel.send(embed=embed)
+            except discord.HTTPException as e:
+                logger.error(f"Anti-spam: could not send log message: {e}")
+
+    @app_commands.command(name="configurar_antispam", description="Configura la detección automática de spam")
+    @app_commands.describe(
+        activado="Activar o desactivar la detección",
+        max_mensajes="Mensajes permitidos en ráfaga",
+        por_segundos="Segundos en los que se recupera la ráfaga completa",
+        duplicados="Mensajes idénticos seguidos que se consideran spam",
+        max_menciones=f"Menciones permitidas cada {MENTION_REFILL_SECONDS} segundos",
+        timeout_minutos="Minutos de timeout al infractor (0 = solo borrar mensajes)",
+        canal_registro="Canal donde se registrarán las sanciones"
+    )
+    async def configure_anti_spam(
+        self,
+        interaction: discord.Interaction,
+        activado: Optional[bool] = None,
+        max_mensajes: Optional[app_commands.Range[int, 2, 50]] = None,
+        por_segundos: Optional[app_commands.Range[int, 1, 120]] = None,
+        duplicados: Optional[app_commands.Range[int, 2, 20]] = None,
+        max_menciones: Optional[app_commands.Range[int, 1, 100]] = None,
+        timeout_minutos: Optional[app_commands.Range[int, 0, 40320]] = None,
+        canal_registro: Optional[discord.TextChannel] = None
+    ):
+        """Configure anti-spam limits for this server"""
+        try:
+            if not interaction.user.guild_permissions.manage_guild:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="Necesitas permisos para gestionar el servidor para usar este comando.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            config = load_config()
+            guild_id_str = str(interaction.guild.id)
+            if 'servers' not in config:
+                config['servers'] = {}
+            if guild_id_str not in config['servers']:
+                config['servers'][guild_id_str] = {}
+
+            settings = {**DEFAULT_ANTI_SPAM_SETTINGS, **config['servers'][guild_id_str].get('anti_spam', {})}
+            updates = {
+                'enabled': activado,
+                'max_messages': max_mensajes,
+                'per_seconds': por_segundos,
+                'duplicate_threshold': duplicados,
+                'max_mentions': max_menciones,
+                'timeout_minutes': timeout_minutos,
+                'log_channel_id': canal_registro.id if canal_registro else None
+            }
+            for key, value in updates.items():
+                if value is not None:
+                    settings[key] = value
+
+            config['servers'][guild_id_str]['anti_spam'] = settings
+            if not save_config(config):
+                embed = discord.Embed(
+                    title="❌ Error",
+                    description="No se pudo guardar la configuración. Inténtalo de nuevo.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            self.settings[interaction.guild.id] = settings
+            self.tracker.drop_guild(interaction.guild.id)
+
+            log_channel = interaction.guild.get_channel(settings['log_channel_id']) if settings['log_channel_id'] else None
+            embed = discord.Embed(title="✅ Anti-spam configurado", color=0x00ff00)
+            embed.add_field(name="Estado", value="🟢 Activo" if settings['enabled'] else "🔴 Desactivado", inline=True)
+            embed.add_field(
+                name="Flood",
+                value=f"{settings['max_messages']} mensajes / {settings['per_seconds']}s",
+                inline=True
+            )
+            embed.add_field(name="Duplicados", value=f"{settings['duplicate_threshold']} seguidos", inline=True)
+            embed.add_field(
+                name="Menciones",
+                value=f"{settings['max_mentions']} / {MENTION_REFILL_SECONDS}s",
+                inline=True
+            )
+            embed.add_field(
+                name="Timeout",
+                value=f"{settings['timeout_minutes']} minutos" if settings['timeout_minutes'] else "No",
+                inline=True
+            )
+            embed.add_field(name="Canal de registro", value=log_channel.mention if log_channel else "No configurado", inline=True)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            logger.info(f"Anti-spam configured for guild {interaction.guild.id}: {settings}")
+
+        except Exception as e:
+            logger.error(f"Error configuring anti-spam: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al configurar el anti-spam.",
+                color=0xff0000
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(AntiSpam(bot))
@@ -0,0 +1,137 @@
+import discord
+from discord.ext import commands
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from utils.concurrency import RateLimitedExecutor
+
+logger = logging.getLogger(__name__)
+
+# Entradas a recuperar la primera vez que se ve un servidor (sin ID previo)
+INITIAL_BACKFILL_LIMIT = 500
+
+def audit_entry_to_cases(entry: discord.AuditLogEntry) -> List[dict]:
+    """Convert an audit log entry into moderation cases (none for untracked actions)"""
+    action = entry.action
+    target_id = getattr(entry.target, 'id', None)
+    base = {
+        'guild_id': entry.guild.id,
+        'moderator_id': entry.user_id,
+        'reason': entry.reason,
+        'audit_log_id': entry.id,
+        'created_at': entry.created_at.replace(tzinfo=None)
+    }
+
+    if action in (discord.AuditLogAction.ban, discord.AuditLogAction.unban, discord.AuditLogAction.kick):
+        return [{**base, 'user_id': target_id, 'action': action.name}]
+
+    if action == discord.AuditLogAction.member_update:
+        # Solo interesan los cambios de timeout; apodos y demás se ignoran
+        if not hasattr(entry.after, 'timed_out_until'):
+            return []
+        until = entry.after.timed_out_until
+        if until is None:
+            return [{**base, 'user_id': target_id, 'action': 'untimeout'}]
+        return [{**base, 'user_id': target_id, 'action': 'timeout', 'expires_at': int(until.timestamp())}]
+
+    if action == discord.AuditLogAction.member_role_update:
+        # Una fila por entrada para que el ID de auditoría siga siendo único
+        added = [role.id for role in getattr(entry.after, 'roles', [])]
+        removed = [role.id for role in getattr(entry.before, 'roles', [])]
+        if len(added) + len(removed) == 1:
+            kind = 'role_add' if added else 'role_remove'
+            return [{**base, 'user_id': target_id, 'action': kind, 'role_id': (added or removed)[0]}]
+        return [{**base, 'user_id': target_id, 'action': 'role_update', 'added': added, 'removed': removed}]
+
+    if action == discord.AuditLogAction.message_bulk_delete:
+        return [{**base, 'user_id': None, 'action': 'purge', 'count': entry.extra.count, 'channel_id': target_id}]
+
+    if action == discord.AuditLogAction.member_prune:
+        return [{
+            **base,
+            'user_id': None,
+            'action': 'prune',
+            'members': entry.extra.members_removed,
+            'days': entry.extra.delete_member_days
+        }]
+
+    return []
+
+class AuditLog(commands.Cog):
+    """Ingest manual moderation from the audit log into the case store"""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.last_seen: Dict[int, Optional[int]] = {}
+        self.backfill_task: Optional[asyncio.Task] = None
+        self.backfill_executor = RateLimitedExecutor(max_concurrency=2)
+
+    async def cog_load(self):
+        self.backfill_task = asyncio.create_task(self.backfill_all())
+
+    async def cog_unload(self):
+        if self.backfill_task:
+            self.backfill_task.cancel()
+
+    def ingest(self, entry: discord.AuditLogEntry) -> int:
+        """Queue the cases for an audit log entry, returning how many were queued"""
+        case_store = getattr(self.bot, 'case_store', None)
+        if case_store is None:
+            return 0
+        # Las acciones del propio bot ya las registran sus comandos con el moderador real
+        if self.bot.user and entry.user_id == self.bot.user.id:
+            return 0
+
+        queued = 0
+        for case in audit_entry_to_cases(entry):
+            if case_store.record(**case):
+                queued += 1
+        return queued
+
+    @commands.Cog.listener()
+    async def on_audit_log_entry_create(self, entry: discord.AuditLogEntry):
+        """Stream new audit log entries into the case store"""
+        try:
+            self.ingest(entry)
+        except Exception as e:
+            logger.error(f"Error ingesting audit log entry {entry.id}: {e}")
+
+    async def backfill_all(self):
+        """Fetch the audit log entries created while the bot was offline"""
+        case_store = getattr(self.bot, 'case_store', None)
+        if case_store is None:
+            return
+
+        try:
+            # Leer los puntos de reanudación antes de conectar, sin entradas en vivo todavía
+            self.last_seen = await case_store.get_last_audit_log_ids()
+            await self.bot.wait_until_ready()
+            guilds = [guild for guild in self.bot.guilds if guild.me.guild_permissions.view_audit_log]
+
+            results = await self.backfill_executor.map(self.backfill_guild, guilds)
+            total = 0
+            for guild, count, error in results:
+                if error:
+                    logger.error(f"Error backfilling audit log for {guild.name}: {error}")
+                else:
+                    total += count
+            logger.info(f"Audit log backfill queued {total} cases from {len(guilds)} guilds")
+        except Exception as e:
+            logger.error(f"Error in audit log backfill: {e}")
+
+    async def backfill_guild(self, guild: discord.Guild) -> int:
+        """Page through one guild's audit log from the last stored entry"""
+        last_id = self.last_seen.get(guild.id)
+        if last_id:
+            # Con 'after', discord.py pagina de la entrada más antigua a la más nueva
+            entries = guild.audit_logs(limit=None, after=discord.Object(id=last_id))
+        else:
+            entries = guild.audit_logs(limit=INITIAL_BACKFILL_LIMIT)
+
+        queued = 0
+        async for entry in entries:
+            queued += self.ingest(entry)
+        return queued
+
+async def setup(bot):
+    await bot.add_cog(AuditLog(bot))
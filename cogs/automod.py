@@ -0,0 +1,367 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import logging
+from datetime import timedelta
+from typing import Dict, Optional
+from utils.helpers import load_config, save_config
+from utils.automod import CompiledRules, AutomodMatch, validate_pattern
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUTOMOD_SETTINGS = {
+    'enabled': False,
+    'words': [],
+    'patterns': [],
+    'blocked_domains': [],
+    'block_invites': False,
+    'timeout_minutes': 0,  # 0 = solo eliminar el mensaje
+    'log_channel_id': None,
+    'exempt_role_ids': []
+}
+
+RULE_TYPES = {
+    'palabra': 'words',
+    'patron': 'patterns',
+    'dominio': 'blocked_domains'
+}
+
+MATCH_LABELS = {
+    'word': 'Palabra prohibida',
+    'pattern': 'Patrón prohibido',
+    'domain': 'Dominio bloqueado',
+    'invite': 'Invitación de Discord'
+}
+
+RULE_TYPE_CHOICES = [
+    app_commands.Choice(name="Palabra", value="palabra"),
+    app_commands.Choice(name="Patrón (regex)", value="patron"),
+    app_commands.Choice(name="Dominio", value="dominio")
+]
+
+class AutoMod(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.settings: Dict[int, dict] = {}
+        self.rules: Dict[int, CompiledRules] = {}
+        self.exempt_roles: Dict[int, frozenset] = {}
+        self.load_settings()
+
+    def load_settings(self):
+        """Load every guild's automod settings and compile their rules"""
+        config = load_config()
+        for guild_id_str, server_config in config.get('servers', {}).items():
+            if 'automod' in server_config:
+                self.settings[int(guild_id_str)] = {**DEFAULT_AUTOMOD_SETTINGS, **server_config['automod']}
+                self.rebuild(int(guild_id_str))
+
+    def rebuild(self, guild_id: int):
+        """Recompile a guild's matcher; only called when its rules change"""
+        settings = self.settings.get(guild_id)
+        if not settings or not settings['enabled']:
+            self.rules.pop(guild_id, None)
+            self.exempt_roles.pop(guild_id, None)
+            return
+        try:
+            self.rules[guild_id] = CompiledRules(
+                settings['words'],
+                settings['patterns'],
+                settings['blocked_domains'],
+                settings['block_invites']
+            )
+            self.exempt_roles[guild_id] = frozenset(settings['exempt_role_ids'])
+        except Exception as e:
+            logger.error(f"Error compiling automod rules for guild {guild_id}: {e}")
+            self.rules.pop(guild_id, None)
+
+    def save_settings(self, guild_id: int, settings: dict) -> bool:
+        config = load_config()
+        guild_id_str = str(guild_id)
+        if 'servers' not in config:
+            config['servers'] = {}
+        if guild_id_str not in config['servers']:
+            config['servers'][guild_id_str] = {}
+        config['servers'][guild_id_str]['automod'] = settings
+        if not save_config(config):
+            return False
+        self.settings[guild_id] = settings
+        self.rebuild(guild_id)
+        return True
+
+    def get_settings(self, guild_id: int) -> dict:
+        settings = self.settings.get(guild_id, DEFAULT_AUTOMOD_SETTINGS)
+        # Copiar las listas para no modificar la configuración en caché
+        return {key: list(value) if isinstance(value, list) else value for key, value in settings.items()}
+
+    def is_exempt(self, member: discord.Member) -> bool:
+        if member.guild_permissions.manage_messages:
+            return True
+        exempt = self.exempt_roles.get(member.guild.id)
+        return bool(exempt) and any(role.id in exempt for role in member.roles)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        """Scan every guild message against the compiled rules"""
+        if message.author.bot or not message.guild or not message.content:
+            return
+
+        rules = self.rules.get(message.guild.id)
+        if rules is None:
+            return
+
+        match = rules.scan(message.content)
+        if match is None or not isinstance(message.author, discord.Member) or self.is_exempt(message.author):
+            return
+
+        await self.handle_violation(message, match)
+
+    async def handle_violation(self, message: discord.Message, match: AutomodMatch):
+        """Delete the offending message, apply the configured timeout and log it"""
+        settings = self.settings[message.guild.id]
+        author = message.author
+        label = MATCH_LABELS.get(match.kind, match.kind)
+
+        try:
+            await message.delete()
+        except discord.NotFound:
+            pass
+        except discord.Forbidden:
+            logger.error(f"Automod: missing permissions to delete messages in {message.channel}")
+            return
+
+        timed_out = False
+        if settings['timeout_minutes']:
+            try:
+                await author.timeout(
+                    timedelta(minutes=settings['timeout_minutes']),
+                    reason=f"Automod: {label}"
+                )
+                timed_out = True
+            except (discord.Forbidden, discord.HTTPException) as e:
+                logger.error(f"Automod: could not timeout {author} ({author.id}): {e}")
+
+        case_store = getattr(self.bot, 'case_store', None)
+        if case_store:
+            case_store.record(
+                message.guild.id, author.id, self.bot.user.id, 'automod', label,
+                rule=match.value, channel_id=message.channel.id,
+                minutes=settings['timeout_minutes'] if timed_out else 0
+            )
+
+        logger.info(
+            f"Automod: deleted message from {author} ({author.id}) in {message.guild.name} "
+            f"#{message.channel} - {label}: {match.value}"
+        )
+
+        log_channel_id = settings.get('log_channel_id')
+        log_channel = message.guild.get_channel(log_channel_id) if log_channel_id else None
+        if log_channel:
+            embed = discord.Embed(
+                title="🤖 Automod: mensaje eliminado",
+                color=0xffaa00,
+                timestamp=discord.utils.utcnow()
+            )
+            embed.add_field(name="Usuario", value=f"{author.mention} ({author.id})", inline=True)
+            embed.add_field(name="Canal", value=message.channel.mention, inline=True)
+            embed.add_field(name="Motivo", value=f"{label}: `{match.value}`", inline=False)
+            embed.add_field(name="Contenido", value=message.content[:1000], inline=False)
+            if timed_out:
+                embed.add_field(name="Timeout", value=f"{settings['timeout_minutes']} minutos", inline=True)
+            try:
+                await log_channel.send(embed=embed)
+            except discord.HTTPException as e:
+                logger.error(f"Automod: could not send log message: {e}")
+
+    async def _check_manage_guild(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.guild_permissions.manage_guild:
+            return True
+        embed = discord.Embed(
+            title="❌ Sin permisos",
+            description="Necesitas permisos para gestionar el servidor para usar este comando.",
+            color=0xff0000
+        )
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        return False
+
+    @app_commands.command(name="automod_agregar", description="Agrega una regla de moderación automática")
+    @app_commands.describe(tipo="Tipo de regla", valor="Palabra, expresión regular o dominio a bloquear")
+    @app_commands.choices(tipo=RULE_TYPE_CHOICES)
+    async def add_rule(self, interaction: discord.Interaction, tipo: app_commands.Choice[str], valor: str):
+        """Add an automod rule and recompile the guild's matcher"""
+        try:
+            if not await self._check_manage_guild(interaction):
+                return
+
+            valor = valor.strip()
+            if tipo.value == 'palabra':
+                valor = valor.casefold()
+            elif tipo.value == 'dominio':
+                valor = valor.casefold().removeprefix('https://').removeprefix('http://').split('/')[0].strip('.')
+            elif tipo.value == 'patron':
+                error = validate_pattern(valor)
+                if error:
+                    embed = discord.Embed(title="❌ Patrón inválido", description=error, color=0xff0000)
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+                    return
+
+            if not valor:
+                embed = discord.Embed(title="❌ Valor vacío", description="Indica un valor para la regla.", color=0xff0000)
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            settings = self.get_settings(interaction.guild.id)
+            key = RULE_TYPES[tipo.value]
+            if valor in settings[key]:
+                embed = discord.Embed(
+                    title="⚠️ Regla existente",
+                    description=f"`{valor}` ya está en la lista de {tipo.name.lower()}s.",
+                    color=0xffaa00
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            settings[key].append(valor)
+            if not self.save_settings(interaction.guild.id, settings):
+                embed = discord.Embed(title="❌ Error", description="No se pudo guardar la configuración.", color=0xff0000)
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            embed = discord.Embed(
+                title="✅ Regla agregada",
+                description=f"{tipo.name}: `{valor}`" +
+                           ("" if settings['enabled'] else "\n\n⚠️ El automod está desactivado. Actívalo con `/automod_configurar`."),
+                color=0x00ff00
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            logger.info(f"Automod rule added in guild {interaction.guild.id} by {interaction.user}: {key}={valor}")
+
+        except Exception as e:
+            logger.error(f"Error adding automod rule: {e}")
+            embed = discord.Embed(title="❌ Error", description="Ocurrió un error al agregar la regla.", color=0xff0000)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="automod_quitar", description="Quita una regla de moderación automática")
+    @app_commands.describe(tipo="Tipo de regla", valor="Valor exacto de la regla a quitar")
+    @app_commands.choices(tipo=RULE_TYPE_CHOICES)
+    async def remove_rule(self, interaction: discord.Interaction, tipo: app_commands.Choice[str], valor: str):
+        """Remove an automod rule and recompile the guild's matcher"""
+        try:
+            if not await self._check_manage_guild(interaction):
+                return
+
+            settings = self.get_settings(interaction.guild.id)
+            key = RULE_TYPES[tipo.value]
+            valor = valor.strip() if tipo.value == 'patron' else valor.strip().casefold()
+            if valor not in settings[key]:
+                embed = discord.Embed(
+                    title="⚠️ Regla no encontrada",
+                    description=f"`{valor}` no está en la lista de {tipo.name.lower()}s.",
+                    color=0xffaa00
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            settings[key].remove(valor)
+            if not self.save_settings(interaction.guild.id, settings):
+                embed = discord.Embed(title="❌ Error", description="No se pudo guardar la configuración.", color=0xff0000)
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            embed = discord.Embed(title="✅ Regla quitada", description=f"{tipo.name}: `{valor}`", color=0x00ff00)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            logger.info(f"Automod rule removed in guild {interaction.guild.id} by {interaction.user}: {key}={valor}")
+
+        except Exception as e:
+            logger.error(f"Error removing automod rule: {e}")
+            embed = discord.Embed(title="❌ Error", description="Ocurrió un error al quitar la regla.", color=0xff0000)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="automod_configurar", description="Configura la moderación automática de mensajes")
+    @app_commands.describe(
+        activado="Activar o desactivar el automod",
+        bloquear_invitaciones="Eliminar invitaciones a otros servidores de Discord",
+        timeout_minutos="Minutos de timeout al infractor (0 = solo eliminar el mensaje)",
+        canal_registro="Canal donde se registrarán las infracciones",
+        rol_exento="Rol que no será moderado (se agrega o se quita si ya estaba)"
+    )
+    async def configure_automod(
+        self,
+        interaction: discord.Interaction,
+        activado: Optional[bool] = None,
+        bloquear_invitaciones: Optional[bool] = None,
+        timeout_minutos: Optional[app_commands.Range[int, 0, 40320]] = None,
+        canal_registro: Optional[discord.TextChannel] = None,
+        rol_exento: Optional[discord.Role] = None
+    ):
+        """Configure automod behaviour for this server"""
+        try:
+            if not await self._check_manage_guild(interaction):
+                return
+
+            settings = self.get_settings(interaction.guild.id)
+            if activado is not None:
+                settings['enabled'] = activado
+            if bloquear_invitaciones is not None:
+                settings['block_invites'] = bloquear_invitaciones
+            if timeout_minutos is not None:
+                settings['timeout_minutes'] = timeout_minutos
+            if canal_registro:
+                settings['log_channel_id'] = canal_registro.id
+            if rol_exento:
+                if rol_exento.id in settings['exempt_role_ids']:
+                    settings['exempt_role_ids'].remove(rol_exento.id)
+                else:
+                    settings['exempt_role_ids'].append(rol_exento.id)
+
+            if not self.save_settings(interaction.guild.id, settings):
+                embed = discord.Embed(title="❌ Error", description="No se pudo guardar la configuración.", color=0xff0000)
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            embed = self._rules_embed(interaction.guild, settings)
+            embed.title = "✅ Automod configurado"
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            logger.info(f"Automod configured for guild {interaction.guild.id} by {interaction.user}")
+
+        except Exception as e:
+            logger.error(f"Error configuring automod: {e}")
+            embed = discord.Embed(title="❌ Error", description="Ocurrió un error al configurar el automod.", color=0xff0000)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    def _rules_embed(self, guild: discord.Guild, settings: dict) -> discord.Embed:
+        embed = discord.Embed(title="🤖 Configuración del Automod", color=0x3498db)
+        embed.add_field(name="Estado", value="🟢 Activo" if settings['enabled'] else "🔴 Desactivado", inline=True)
+        embed.add_field(name="Invitaciones", value="🚫 Bloqueadas" if settings['block_invites'] else "✅ Permitidas", inline=True)
+        embed.add_field(
+            name="Timeout",
+            value=f"{settings['timeout_minutes']} minutos" if settings['timeout_minutes'] else "No",
+            inline=True
+        )
+        for name, key in (("Palabras", 'words'), ("Patrones", 'patterns'), ("Dominios", 'blocked_domains')):
+            values = settings[key]
+            text = ", ".join(f"`{value}`" for value in values[:30]) if values else "Ninguno"
+            if len(values) > 30:
+                text += f" y {len(values) - 30} más"
+            embed.add_field(name=f"{name} ({len(values)})", value=text[:1024], inline=False)
+
+        log_channel = guild.get_channel(settings['log_channel_id']) if settings.get('log_channel_id') else None
+        embed.add_field(name="Canal de registro", value=log_channel.mention if log_channel else "No configurado", inline=True)
+        exempt = [f"<@&{role_id}>" for role_id in settings['exempt_role_ids']]
+        embed.add_field(name="Roles exentos", value=", ".join(exempt) if exempt else "Ninguno", inline=True)
+        return embed
+
+    @app_commands.command(name="automod_reglas", description="Muestra las reglas de moderación automática")
+    async def list_rules(self, interaction: discord.Interaction):
+        """Show the automod rules for this server"""
+        try:
+            if not await self._check_manage_guild(interaction):
+                return
+            embed = self._rules_embed(interaction.guild, self.get_settings(interaction.guild.id))
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+        except Exception as e:
+            logger.error(f"Error listing automod rules: {e}")
+            embed = discord.Embed(title="❌ Error", description="Ocurrió un error al mostrar las reglas.", color=0xff0000)
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+async def setup(bot):
+    await bot.add_cog(AutoMod(bot))
@@ -3,14 +3,92 @@ from discord.ext import commands, tasks
 from discord import app_commands
 import aiohttp
 import asyncio
+import functools
+import hashlib
+import io
 import logging
-import re
 import json
-from datetime import datetime
-from typing import Dict, List, Optional
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from utils.concurrency import SUPERSEDED, CircuitBreaker, FanoutDispatcher, RateLimitedExecutor, SingleFlight
+from utils.fxserver import DEFAULT_SERVER_TIMEOUT, GameServer, ServerStatus, chunk_lines, format_server_line, poll_servers
+from utils.http import parse_retry_after
+from utils.monitor_store import MonitorStore
+from utils.player_chart import CHARTS_AVAILABLE, render_player_chart
+from utils.player_series import PlayerHistory
+from utils.status_history import StatusHistory
+from utils.status_page import (
+    COMPONENT_SEVERITY, COMPONENT_STATUS_LABELS, OVERALL_STATUS_LABELS, SERVICES, STATUS_KEYS_BY_LABEL,
+    StatuspageParser, parse_status_html
+)
 
 logger = logging.getLogger(__name__)
 
+# Se puede apuntar a un servidor local de pruebas (benchmarks/status_server.py)
+FIVEM_STATUS_URL = os.environ.get('FIVEM_STATUS_URL', 'https://status.cfx.re').rstrip('/')
+# Tiempos cortos: si status.cfx.re no responde, mejor fallar pronto y servir el último estado
+STATUS_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=8, connect=3, sock_read=5)
+# Antigüedad máxima del estado en caché para los comandos; el bucle siempre revalida
+STATUS_CACHE_TTL = float(os.environ.get('FIVEM_STATUS_CACHE_TTL', 60))
+STATUS_FANOUT_CONCURRENCY = 10  # Ediciones simultáneas como máximo entre todos los canales
+STATUS_CHANNEL_INTERVAL = 1.0   # Separación mínima entre envíos a un mismo canal
+STATUS_PUBLISH_WAIT = 10        # Segundos que un ciclo espera a los paneles; los canales lentos siguen en segundo plano
+BOOTSTRAP_CONCURRENCY = 10      # fetch_message simultáneos al validar los paneles al arrancar
+
+# Sondeo adaptativo: rápido durante incidencias o cambios recientes, retroceso exponencial si todo está estable
+POLL_FAST_INTERVAL = 30        # Segundos
+POLL_MAX_INTERVAL = 15 * 60    # Techo del retroceso
+POLL_BACKOFF_FACTOR = 2
+POLL_RECENT_CHANGE = 10 * 60   # Un cambio más reciente que esto mantiene el sondeo rápido
+POLL_JITTER = 0.1              # ±10 %
+
+# Circuit breaker de status.cfx.re: tras varios fallos seguidos se deja de consultar durante un tiempo creciente
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 30          # Primera apertura, en segundos
+BREAKER_MAX_RESET_TIMEOUT = 15 * 60
+BREAKER_STATE_LABELS = {
+    CircuitBreaker.CLOSED: "🟢 Cerrado",
+    CircuitBreaker.OPEN: "🔴 Abierto",
+    CircuitBreaker.HALF_OPEN: "🟡 Semiabierto (probando)"
+}
+
+ALERT_COOLDOWN = 10 * 60  # Tras una alerta, las mejoras de ese componente esperan este tiempo (anti-flapping)
+ALERT_COLORS = {
+    'operational': 0x00ff00,
+    'under_maintenance': 0x3498db,
+    'degraded_performance': 0xffff00,
+    'partial_outage': 0xff8000,
+    'major_outage': 0xff0000
+}
+DEFAULT_ALERT_SETTINGS = {
+    'enabled': False,
+    'channel_id': None,  # None: el canal del panel de estado
+    'role_id': None
+}
+
+# Servidores FXServer propios: se consultan a ritmo fijo, aparte del sondeo adaptativo de status.cfx.re
+SERVER_POLL_INTERVAL = 60      # Segundos
+SERVER_POLL_CONCURRENCY = 20   # Servidores consultados a la vez
+MAX_GAME_SERVERS = 25          # Por servidor de Discord
+MAX_SERVER_TIMEOUT = 15
+
+# Rangos de /grafico_jugadores: nombre -> (ventana, ancho de cada punto del gráfico)
+CHART_RANGES = {
+    "6h": ("Últimas 6 horas", timedelta(hours=6), timedelta(minutes=5)),
+    "24h": ("Últimas 24 horas", timedelta(hours=24), timedelta(minutes=15)),
+    "7d": ("Últimos 7 días", timedelta(days=7), timedelta(hours=1)),
+    "30d": ("Últimos 30 días", timedelta(days=30), timedelta(hours=6))
+}
+CHART_WORKERS = 1  # Procesos para renderizar gráficos
+
+HISTORY_WINDOWS = (("24 horas", timedelta(hours=24)), ("7 días", timedelta(days=7)), ("30 días", timedelta(days=30)))
+HISTORY_INCIDENT_LIMIT = 10
+
 async def load_config():
     """Load configuration from config.json"""
     try:
@@ -32,344 +110,675 @@ async def save_config(config):
         logger.error(f"Error saving config: {e}")
         return False
 
-async def save_fivem_monitor_config(guild_id: int, channel_id: int, message_id: Optional[int] = None):
-    """Save FiveM monitor configuration to config.json"""
-    try:
-        config = await load_config()
-        guild_id_str = str(guild_id)
-        
-        if 'servers' not in config:
-            config['servers'] = {}
-        if guild_id_str not in config['servers']:
-            config['servers'][guild_id_str] = {}
-        
-        config['servers'][guild_id_str]['fivem_status_channel_id'] = channel_id
-        config['servers'][guild_id_str]['fivem_status_message_id'] = message_id
-        config['servers'][guild_id_str]['fivem_monitor_active'] = True
-        
-        success = await save_config(config)
-        if success:
-            logger.info(f"FiveM monitor config saved to config.json: guild={guild_id}, channel={channel_id}, message={message_id}")
-        return success
-    except Exception as e:
-        logger.error(f"Error saving FiveM monitor config: {e}")
-        return False
-
-async def get_fivem_monitor_config(guild_id: int):
-    """Get FiveM monitor configuration from config.json"""
-    try:
-        config = await load_config()
-        guild_id_str = str(guild_id)
-        
-        if ('servers' in config and 
-            guild_id_str in config['servers'] and 
-            config['servers'][guild_id_str].get('fivem_monitor_active', False)):
-            
-            return {
-                'channel_id': config['servers'][guild_id_str].get('fivem_status_channel_id'),
-                'message_id': config['servers'][guild_id_str].get('fivem_status_message_id')
-            }
-        return None
-    except Exception as e:
-        logger.error(f"Error getting FiveM monitor config: {e}")
-        return None
+def format_interval(seconds: float) -> str:
+    """Format a polling interval for display, e.g. '30 segundos', '2 minutos' or '6 horas'"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} segundos"
+    if seconds >= 3600:
+        hours = round(seconds / 3600)
+        return "1 hora" if hours == 1 else f"{hours} horas"
+    minutes = round(seconds / 60)
+    return "1 minuto" if minutes == 1 else f"{minutes} minutos"
+
+# Color del panel según el estado general; el mantenimiento y los estados desconocidos van en gris
+PANEL_COLORS = {
+    OVERALL_STATUS_LABELS['none']: 0x00ff00,
+    OVERALL_STATUS_LABELS['minor']: 0xffff00,
+    OVERALL_STATUS_LABELS['major']: 0xff8000,
+    OVERALL_STATUS_LABELS['critical']: 0xff0000
+}
+PANEL_GROUPS = (
+    ("🎮 **Servicios de Juego**", ("🎮 FiveM", "🤠 RedM", "🖥️ FXServer", "🎯 Game Services")),
+    ("🛠️ **Servicios de Plataforma**", ("🔗 CnL", "📋 Policy", "🔑 Keymaster", "🌐 Web Services")),
+    ("👥 **Servicios de Comunidad**", ("💬 Forums", "📋 Server List", "⚡ Runtime", "🆔 IDMS", "🚪 Portal"))
+)
+
+class StatusPayload(NamedTuple):
+    """The part of the status panel shared by every guild for one status snapshot.
+
+    embed is an Embed.to_dict()-style dict without timestamp or footer icon;
+    it and its fields are never mutated, only copied into each guild's panel.
+    """
+    key: tuple
+    embed: dict
+    fields: Tuple[dict, ...]
+    digest: str
+
+def build_status_payload(status_data: Dict[str, str], key: tuple, status_url: str, stale_since: Optional[datetime], poll_interval: float) -> StatusPayload:
+    """Render the shared panel content once per status snapshot"""
+    overall = status_data.get('overall', 'Desconocido')
+    description = (
+        f"**Estado General:** {overall}\n\n"
+        f"Información actualizada desde [status.cfx.re]({status_url})"
+    )
+    if stale_since:
+        description += (
+            f"\n⚠️ **Datos desactualizados** desde <t:{int(stale_since.timestamp())}:R>: "
+            f"status.cfx.re no responde"
+        )
 
-async def disable_fivem_monitor_config(guild_id: int):
-    """Disable FiveM monitor in config.json"""
-    try:
-        config = await load_config()
-        guild_id_str = str(guild_id)
-        
-        if ('servers' in config and 
-            guild_id_str in config['servers']):
-            
-            config['servers'][guild_id_str]['fivem_monitor_active'] = False
-            if 'fivem_status_message_id' in config['servers'][guild_id_str]:
-                del config['servers'][guild_id_str]['fivem_status_message_id']
-            
-            success = await save_config(config)
-            if success:
-                logger.info(f"FiveM monitor disabled in config.json for guild {guild_id}")
-            return success
-        return True
-    except Exception as e:
-        logger.error(f"Error disabling FiveM monitor config: {e}")
-        return False
+    fields = []
+    for name, services in PANEL_GROUPS:
+        lines = [f"{service}: {status_data[service]}" for service in services if service in status_data]
+        if lines:
+            fields.append({'name': name, 'value': "\n".join(lines), 'inline': False})
+
+    embed = {
+        'type': 'rich',
+        'title': "📊 Estado de los Servidores FiveM",
+        'description': description,
+        'color': PANEL_COLORS.get(overall, 0x808080),
+        'footer': {'text': f"🔄 Actualizado automáticamente cada {format_interval(poll_interval)} • PT Scripts BOT"}
+    }
+    digest = hashlib.sha1(json.dumps([embed, fields], sort_keys=True).encode()).hexdigest()
+    return StatusPayload(key, embed, tuple(fields), digest)
+
+def game_server_fields(game_servers: Optional[List[tuple]]) -> List[dict]:
+    """Embed fields listing a guild's own FXServers"""
+    if not game_servers:
+        return []
+    lines = [format_server_line(server, status) for server, status in game_servers]
+    return [
+        {'name': "🕹️ **Nuestros Servidores**" if index == 0 else "\u200b", 'value': chunk, 'inline': False}
+        for index, chunk in enumerate(chunk_lines(lines))
+    ]
+
+def panel_hash(payload: StatusPayload, extra_fields: List[dict], icon_url: Optional[str]) -> str:
+    """Identify a guild's rendered panel without building it"""
+    parts = [payload.digest, icon_url or '']
+    parts.extend(field['value'] for field in extra_fields)
+    return hashlib.sha1('\x1f'.join(parts).encode()).hexdigest()
+
+def panel_embed(payload: StatusPayload, extra_fields: List[dict], icon_url: Optional[str]) -> discord.Embed:
+    """Build one guild's panel from the shared payload plus its own fields and footer icon"""
+    footer = dict(payload.embed['footer'])
+    if icon_url:
+        footer['icon_url'] = icon_url
+    # Listas nuevas: Embed.from_dict guarda referencias, y el payload es compartido
+    return discord.Embed.from_dict({
+        **payload.embed,
+        'fields': [*extra_fields, *payload.fields],
+        'footer': footer,
+        'timestamp': discord.utils.utcnow().isoformat()
+    })
+
+def chart_mp_context():
+    """Start chart workers from a clean process: forking the bot would copy its threads, sockets and SQLite handles"""
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        # El servidor de procesos solo precarga el renderizador, no el bot entero
+        context.set_forkserver_preload(['utils.player_chart'])
+        return context
+    return multiprocessing.get_context('spawn')
 
 class FiveMStatus(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.status_url = "https://status.cfx.re"
+        self.status_url = FIVEM_STATUS_URL
+        self.summary_url = f"{FIVEM_STATUS_URL}/api/v2/summary.json"
+        self.status_parser = StatuspageParser()
         self.active_monitors = {}  # guild_id: {'channel_id': int, 'message_id': int}
+        self.monitor_store = MonitorStore()
         self.last_status = {}
-        self.setup_complete = False
+        self.last_status_at = 0.0  # time.monotonic() del último estado válido
+        self.last_status_time: Optional[datetime] = None  # Hora (UTC) del último estado válido
+        self.status_stale = False  # True mientras se sirve el último estado porque status.cfx.re falla
+        self.last_payload: Optional[StatusPayload] = None  # Parte común del panel para el último estado
+        self.status_breaker = CircuitBreaker(
+            'status.cfx.re',
+            failure_threshold=BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=BREAKER_RESET_TIMEOUT,
+            max_reset_timeout=BREAKER_MAX_RESET_TIMEOUT
+        )
+        self.http_validators = {}  # url: {'etag', 'last_modified', 'data'} para GET condicionales
+        self.status_flight = SingleFlight()
+        self.status_history = StatusHistory()
+        self.poll_interval = POLL_FAST_INTERVAL  # Intervalo base actual, sin jitter
+        self.last_change_at = 0.0  # time.monotonic() del último cambio de algún componente
+        self.retry_after_until = 0.0  # No consultar status.cfx.re antes de este time.monotonic()
+        self.alert_settings: Dict[int, dict] = {}
+        self.server_settings: Dict[int, List[GameServer]] = {}  # guild_id: servidores FXServer configurados
+        self.server_status: Dict[str, ServerStatus] = {}  # dirección: último resultado
+        self.player_history = PlayerHistory()
+        self.chart_pool: Optional[ProcessPoolExecutor] = None  # Se crea con el primer gráfico
+        self.chart_cache: Dict[tuple, tuple] = {}  # (dirección, rango, bucket): (versión de la serie, PNG)
+        self.chart_flight = SingleFlight()
+        self.alerted: Dict[str, tuple] = {}  # componente: (último estado alertado, time.monotonic())
+        self.fanout = FanoutDispatcher(max_concurrency=STATUS_FANOUT_CONCURRENCY, min_interval=STATUS_CHANNEL_INTERVAL)
+        self.bootstrap_task: Optional[asyncio.Task] = None
 
     @commands.Cog.listener()
     async def on_ready(self):
-        """Setup monitor when bot is ready"""
-        if not self.setup_complete:
-            logger.info("Setting up FiveM monitors from config.json...")
-            await self.setup_monitor_from_config()
-            self.setup_complete = True
-
-    async def setup_monitor_from_config(self):
-        """Load monitor configuration from config.json for all guilds"""
-        try:
-            # Load monitors for all guilds from config.json
-            for guild in self.bot.guilds:
-                monitor_config = await get_fivem_monitor_config(guild.id)
-                if monitor_config:
-                    channel_id = monitor_config['channel_id']
-                    message_id = monitor_config['message_id']
-                    
-                    if not channel_id:
-                        continue
-                    
-                    # Verificar que el canal y mensaje todavía existen
-                    try:
-                        channel = self.bot.get_channel(channel_id)
-                        if channel and message_id:
-                            await channel.fetch_message(message_id)
-                            self.active_monitors[guild.id] = {
-                                'channel_id': channel_id,
-                                'message_id': message_id
-                            }
-                            logger.info(f"Loaded FiveM monitor for guild {guild.id}: channel={channel_id}, message={message_id}")
-                        elif channel:
-                            # Canal existe pero mensaje no, guardar solo el canal
-                            self.active_monitors[guild.id] = {
-                                'channel_id': channel_id,
-                                'message_id': None
-                            }
-                            logger.info(f"Loaded FiveM monitor for guild {guild.id}: channel={channel_id}, message not found")
-                        else:
-                            # Canal no existe, desactivar monitor
-                            await disable_fivem_monitor_config(guild.id)
-                            logger.warning(f"FiveM status channel not found for guild {guild.id}, disabling monitor")
-                    except discord.NotFound:
-                        # Mensaje no encontrado, mantener canal pero limpiar mensaje
-                        self.active_monitors[guild.id] = {
-                            'channel_id': channel_id,
-                            'message_id': None
-                        }
-                        await save_fivem_monitor_config(guild.id, channel_id, None)
-                        logger.warning(f"FiveM status message not found for guild {guild.id}, cleared message ID")
-                    except Exception as e:
-                        logger.error(f"Error validating FiveM status message for guild {guild.id}: {e}")
+        """Setup monitors when bot is ready"""
+        await self.ensure_bootstrapped()
+
+    async def ensure_bootstrapped(self):
+        """Run the monitor bootstrap once; later callers (reconnects, the loop) just await it"""
+        if self.bootstrap_task is None:
+            self.bootstrap_task = asyncio.create_task(self.bootstrap_monitors())
+        await asyncio.shield(self.bootstrap_task)
 
+    async def bootstrap_monitors(self):
+        """Load every active monitor in one query, validate them concurrently and save fixes in one batch"""
+        try:
+            start = time.perf_counter()
+            # Migración única: los monitores que aún estén en config.json pasan a la base de datos
+            migrated = await self.monitor_store.migrate_from_config(await load_config())
+            if migrated is not None and not await save_config(migrated):
+                logger.error("Failed to remove migrated FiveM monitors from config.json")
+
+            guild_ids = {guild.id for guild in self.bot.guilds}
+            entries = [
+                (record.guild_id, record.channel_id, record.message_id)
+                for record in await self.monitor_store.load_active()
+                if record.guild_id in guild_ids
+            ]
+
+            # Las comprobaciones van en paralelo: el arranque no crece con una ida y vuelta por servidor
+            results = await RateLimitedExecutor(BOOTSTRAP_CONCURRENCY).map(self.validate_monitor, entries)
+
+            fixes = {}
+            for (guild_id, channel_id, message_id), monitor_info, error in results:
+                if error is not None:
+                    # Error transitorio: se conserva el monitor y el bucle lo resolverá al editar
+                    logger.error(f"Error validating FiveM status message for guild {guild_id}: {error}")
+                    monitor_info = {'channel_id': channel_id, 'message_id': message_id}
+                if monitor_info is None:
+                    fixes[guild_id] = None
+                    logger.warning(f"FiveM status channel not found for guild {guild_id}, disabling monitor")
+                    continue
+                if monitor_info['message_id'] != message_id:
+                    fixes[guild_id] = monitor_info
+                    logger.warning(f"FiveM status message not found for guild {guild_id}, cleared message ID")
+                # Un monitor configurado por comando mientras tanto tiene prioridad
+                self.active_monitors.setdefault(guild_id, monitor_info)
+
+            if fixes:
+                await self.save_monitor_fixes(fixes)
+            logger.info(
+                f"Loaded {len(self.active_monitors)} FiveM monitors in {(time.perf_counter() - start) * 1000:.0f} ms "
+                f"({len(fixes)} fixed)"
+            )
         except Exception as e:
             logger.error(f"Error loading FiveM monitor configs: {e}")
 
         # Start the monitor if we have any active monitors
-        if self.active_monitors and not self.status_monitor.is_running():
+        if self.monitoring_needed() and not self.status_monitor.is_running():
             self.status_monitor.start()
             logger.info(f"Started FiveM status monitor for {len(self.active_monitors)} guilds")
 
-    def cog_unload(self):
-        self.status_monitor.cancel()
-
-    async def fetch_fivem_status(self) -> Dict[str, str]:
-        """Fetch the current FiveM service status"""
+    async def validate_monitor(self, entry: tuple) -> Optional[dict]:
+        """Check that a monitor's channel and message still exist; None if the channel is gone"""
+        guild_id, channel_id, message_id = entry
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            return None
+        if not message_id:
+            return {'channel_id': channel_id, 'message_id': None}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(self.status_url) as response:
-                    if response.status == 200:
-                        content = await response.text()
-                        return self.parse_status_content(content)
-                    else:
-                        logger.error(f"Error fetching status: HTTP {response.status}")
-                        return {}
+            message = await channel.fetch_message(message_id)
+        except discord.NotFound:
+            # Mensaje borrado: se mantiene el canal y el bucle publicará uno nuevo
+            return {'channel_id': channel_id, 'message_id': None}
+        return {'channel_id': channel_id, 'message_id': message_id, 'message': message}
+
+    async def save_monitor_fixes(self, fixes: Dict[int, Optional[dict]]):
+        """Write every bootstrap fix in one batch per kind (None disables the guild's monitor)"""
+        await self.monitor_store.deactivate(*(guild_id for guild_id, info in fixes.items() if info is None))
+        await self.monitor_store.save_many({
+            guild_id: (info['channel_id'], info['message_id'])
+            for guild_id, info in fixes.items() if info is not None
+        })
+
+    async def cog_load(self):
+        try:
+            await self.status_history.load()
         except Exception as e:
-            logger.error(f"Error fetching FiveM status: {e}")
-            return {}
+            logger.error(f"Error loading FiveM status history: {e}")
+        await self.load_alert_settings()
+        await self.load_server_settings()
+        try:
+            await self.player_history.load()
+        except Exception as e:
+            logger.error(f"Error loading player history: {e}")
+        if self.server_settings:
+            self.game_server_monitor.start()
 
-    def parse_status_content(self, content: str) -> Dict[str, str]:
-        """Parse the status page content to extract service statuses"""
-        status_dict = {}
-
-        # Map of service patterns and their display names
-        services = {
-            "FiveM": "🎮 FiveM",
-            "RedM": "🤠 RedM", 
-            "Cfx.re Platform Server \\(FXServer\\)": "🖥️ FXServer",
-            "Game Services": "🎯 Game Services",
-            "CnL": "🔗 CnL",
-            "Policy": "📋 Policy",
-            "Keymaster": "🔑 Keymaster",
-            "Web Services": "🌐 Web Services",
-            "Forums": "💬 Forums",
-            "Server List Frontend": "📋 Server List",
-            "\"Runtime\"": "⚡ Runtime",
-            "IDMS": "🆔 IDMS",
-            "Portal": "🚪 Portal"
-        }
-
-        # Look for operational status indicators
-        for service_pattern, display_name in services.items():
-            # Create regex pattern to find service status
-            pattern = rf"{service_pattern}.*?(?:Operational|Degraded Performance|Partial Outage|Major Outage|Maintenance)"
-            match = re.search(pattern, content, re.IGNORECASE | re.DOTALL)
-
-            if match:
-                text = match.group(0)
-                if "Operational" in text:
-                    status_dict[display_name] = "🟢 Operativo"
-                elif "Degraded Performance" in text:
-                    status_dict[display_name] = "🟡 Rendimiento Degradado"
-                elif "Partial Outage" in text:
-                    status_dict[display_name] = "🟠 Falla Parcial"
-                elif "Major Outage" in text:
-                    status_dict[display_name] = "🔴 Falla Mayor"
-                elif "Maintenance" in text:
-                    status_dict[display_name] = "🔧 Mantenimiento"
-                else:
-                    status_dict[display_name] = "❓ Desconocido"
-            else:
-                status_dict[display_name] = "❓ No disponible"
-
-        # Check overall system status
-        if "All Systems Operational" in content:
-            status_dict["overall"] = "🟢 Todos los sistemas operativos"
-        elif "Some Systems Experiencing Issues" in content:
-            status_dict["overall"] = "🟡 Algunos sistemas con problemas"
-        elif "Major Service Outage" in content:
-            status_dict["overall"] = "🔴 Falla mayor del servicio"
-        else:
-            status_dict["overall"] = "❓ Estado general desconocido"
-
-        return status_dict
-
-    def create_status_embed(self, status_data: Dict[str, str]) -> discord.Embed:
-        """Create an embed with the current FiveM status"""
-        # Determine embed color based on overall status
-        if "🟢" in status_data.get("overall", ""):
-            color = 0x00ff00  # Green
-        elif "🟡" in status_data.get("overall", ""):
-            color = 0xffff00  # Yellow
-        elif "🟠" in status_data.get("overall", ""):
-            color = 0xff8000  # Orange
-        elif "🔴" in status_data.get("overall", ""):
-            color = 0xff0000  # Red
-        else:
-            color = 0x808080  # Gray
+    async def load_alert_settings(self):
+        """Cache every guild's transition alert settings"""
+        config = await load_config()
+        self.alert_settings = {}
+        for guild_id_str, server_config in config.get('servers', {}).items():
+            if 'fivem_alerts' in server_config:
+                self.alert_settings[int(guild_id_str)] = {**DEFAULT_ALERT_SETTINGS, **server_config['fivem_alerts']}
 
-        embed = discord.Embed(
-            title="📊 Estado de los Servidores FiveM",
-            description=f"**Estado General:** {status_data.get('overall', 'Desconocido')}\n\n"
-                       f"Información actualizada desde [status.cfx.re]({self.status_url})",
-            color=color,
-            timestamp=datetime.utcnow()
-        )
+    async def load_server_settings(self):
+        """Cache every guild's list of FXServer endpoints"""
+        config = await load_config()
+        self.server_settings = {}
+        for guild_id_str, server_config in config.get('servers', {}).items():
+            servers = [GameServer(**server) for server in server_config.get('fivem_servers', [])]
+            if servers:
+                self.server_settings[int(guild_id_str)] = servers
 
-        # Main gaming services
-        gaming_services = []
-        for service, status in status_data.items():
-            if service in ["🎮 FiveM", "🤠 RedM", "🖥️ FXServer", "🎯 Game Services"]:
-                gaming_services.append(f"{service}: {status}")
+    def guild_game_servers(self, guild_id: int) -> List[tuple]:
+        """(server, last status) pairs for a guild's configured FXServers"""
+        return [(server, self.server_status.get(server.address)) for server in self.server_settings.get(guild_id, [])]
 
-        if gaming_services:
-            embed.add_field(
-                name="🎮 **Servicios de Juego**",
-                value="\n".join(gaming_services),
-                inline=False
-            )
+    def monitoring_needed(self) -> bool:
+        """The status loop runs while any guild has a panel or transition alerts"""
+        return bool(self.active_monitors) or any(settings['enabled'] for settings in self.alert_settings.values())
 
-        # Platform services
-        platform_services = []
-        for service, status in status_data.items():
-            if service in ["🔗 CnL", "📋 Policy", "🔑 Keymaster", "🌐 Web Services"]:
-                platform_services.append(f"{service}: {status}")
+    async def cog_unload(self):
+        self.status_monitor.cancel()
+        self.game_server_monitor.cancel()
+        await self.fanout.close()
+        if self.chart_pool:
+            self.chart_pool.shutdown(wait=False, cancel_futures=True)
 
-        if platform_services:
-            embed.add_field(
-                name="🛠️ **Servicios de Plataforma**",
-                value="\n".join(platform_services),
-                inline=False
-            )
+    async def fetch_fivem_status(self) -> Dict[str, str]:
+        """Fetch the current FiveM service status, preferring the Statuspage API"""
+        status_data = await self.fetch_statuspage_summary()
+        if status_data:
+            return status_data
+        if time.monotonic() < self.retry_after_until:
+            # Nos han pedido esperar: la página HTML está en el mismo host
+            return {}
 
-        # Community services
-        community_services = []
-        for service, status in status_data.items():
-            if service in ["💬 Forums", "📋 Server List", "⚡ Runtime", "🆔 IDMS", "🚪 Portal"]:
-                community_services.append(f"{service}: {status}")
+        logger.warning("Statuspage API unavailable, falling back to HTML scraping")
+        return await self.fetch_status_html()
 
-        if community_services:
-            embed.add_field(
-                name="👥 **Servicios de Comunidad**",
-                value="\n".join(community_services),
-                inline=False
+    async def get_fivem_status(self, max_age: float = STATUS_CACHE_TTL) -> Dict[str, str]:
+        """Return the cached status if it is younger than max_age, otherwise revalidate it upstream"""
+        now = time.monotonic()
+        if self.last_status and (now - self.last_status_at < max_age or now < self.retry_after_until):
+            return self.last_status
+
+        # Todas las peticiones simultáneas comparten una sola consulta a status.cfx.re
+        return await self.status_flight.do('status', self.refresh_status)
+
+    async def refresh_status(self) -> Dict[str, str]:
+        """Fetch upstream through the circuit breaker; on failure serve the last good status marked as stale"""
+        if not self.status_breaker.allow():
+            logger.debug("status.cfx.re circuit open, serving last known status")
+            return self.stale_status()
+
+        try:
+            status_data = await self.fetch_fivem_status()
+        except BaseException:
+            # Cancelada (bucle detenido, cog descargado) o error inesperado: sin resultado, liberar la prueba
+            self.status_breaker.release()
+            raise
+        if not status_data:
+            self.status_breaker.record_failure()
+            return self.stale_status()
+
+        self.status_breaker.record_success()
+        self.last_status = status_data
+        self.last_status_at = time.monotonic()
+        self.last_status_time = datetime.now(timezone.utc)
+        self.status_stale = False
+        try:
+            if await self.status_history.record(status_data):
+                self.last_change_at = time.monotonic()
+        except Exception as e:
+            logger.error(f"Error recording FiveM status history: {e}")
+        return status_data
+
+    def stale_status(self) -> Dict[str, str]:
+        """The last known good status, flagged as stale; {} if there never was one"""
+        if self.last_status:
+            self.status_stale = True
+        return self.last_status
+
+    async def conditional_get(self, url: str, parse) -> Dict[str, str]:
+        """GET with If-None-Match/If-Modified-Since; a 304 reuses the result parsed last time"""
+        cached = self.http_validators.get(url)
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+
+        async with self.bot.http_client.get(url, headers=headers, timeout=STATUS_REQUEST_TIMEOUT) as response:
+            if response.status == 304 and cached:
+                logger.debug(f"Status not modified: {url}")
+                return cached['data']
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None and response.status in (429, 503):
+                self.retry_after_until = max(self.retry_after_until, time.monotonic() + retry_after)
+                logger.warning(f"status.cfx.re asked to retry after {retry_after:.0f}s (HTTP {response.status})")
+            if response.status != 200:
+                logger.error(f"Error fetching {url}: HTTP {response.status}")
+                return {}
+            body = await response.read()
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+
+        data = parse(body)
+        if data and (etag or last_modified):
+            self.http_validators[url] = {'etag': etag, 'last_modified': last_modified, 'data': data}
+        return data
+
+    async def fetch_statuspage_summary(self) -> Dict[str, str]:
+        """Fetch and parse the Statuspage summary.json"""
+        try:
+            return await self.conditional_get(self.summary_url, lambda body: self.status_parser.parse(json.loads(body)))
+        except Exception as e:
+            logger.error(f"Error fetching FiveM status summary: {e}")
+            return {}
+
+    async def fetch_status_html(self) -> Dict[str, str]:
+        """Scrape the status page HTML"""
+        try:
+            return await self.conditional_get(
+                self.status_url,
+                lambda body: self.parse_status_content(body.decode('utf-8', errors='replace'))
             )
+        except Exception as e:
+            logger.error(f"Error fetching FiveM status: {e}")
+            return {}
 
-        embed.set_footer(
-            text="🔄 Actualizado automáticamente cada 5 minutos • PT Scripts BOT",
-            icon_url=self.bot.user.avatar.url if self.bot.user.avatar else None
+    def parse_status_content(self, content: str) -> Dict[str, str]:
+        """Parse the status page content to extract service statuses"""
+        return parse_status_html(content)
+
+    def status_payload(self, status_data: Dict[str, str]) -> StatusPayload:
+        """The shared panel payload for this status snapshot, built only when the snapshot changes"""
+        stale_since = self.last_status_time if self.status_stale else None
+        key = (tuple(status_data.items()), stale_since, self.poll_interval, self.status_url)
+        payload = self.last_payload
+        if payload is None or payload.key != key:
+            payload = self.last_payload = build_status_payload(status_data, key, self.status_url, stale_since, self.poll_interval)
+        return payload
+
+    def panel_icon_url(self) -> Optional[str]:
+        avatar = self.bot.user.avatar if self.bot.user else None
+        return avatar.url if avatar else None
+
+    def create_status_embed(self, status_data: Dict[str, str], game_servers: Optional[List[tuple]] = None) -> discord.Embed:
+        """Create an embed with the current FiveM status, plus the guild's own FXServers if any"""
+        return panel_embed(self.status_payload(status_data), game_server_fields(game_servers), self.panel_icon_url())
+
+    @tasks.loop(seconds=POLL_FAST_INTERVAL)
+    async def status_monitor(self):
+        """Monitor FiveM status on an adaptive interval and update all active monitors"""
+        await self.update_monitors()
+        self.status_monitor.change_interval(seconds=self.next_poll_delay())
+
+    def schedule_next_poll(self, status_data: Dict[str, str]):
+        """Poll fast while something is degraded or just changed, otherwise back off to the ceiling"""
+        unstable = any(
+            STATUS_KEYS_BY_LABEL.get(label, 'operational') != 'operational'
+            for service, label in status_data.items() if service != 'overall'
         )
+        if unstable or time.monotonic() - self.last_change_at < POLL_RECENT_CHANGE:
+            self.poll_interval = POLL_FAST_INTERVAL
+        else:
+            self.poll_interval = min(self.poll_interval * POLL_BACKOFF_FACTOR, POLL_MAX_INTERVAL)
 
-        return embed
+    def next_poll_delay(self) -> float:
+        """Seconds until the next poll: the base interval with jitter, never before Retry-After or the breaker's probe"""
+        delay = self.poll_interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+        return max(delay, self.retry_after_until - time.monotonic(), self.status_breaker.retry_in())
 
-    @tasks.loop(minutes=5)
-    async def status_monitor(self):
-        """Monitor FiveM status every 5 minutes and update all active monitors"""
+    async def update_monitors(self, force: bool = False):
+        """Publish the current status to every active monitor, skipping unchanged panels unless forced"""
         try:
-            if not self.active_monitors:
+            if not self.monitoring_needed():
                 logger.debug("Status monitor: No active monitors configured")
                 return
 
             logger.info("Status monitor: Checking FiveM status...")
-            status_data = await self.fetch_fivem_status()
+            status_data = await self.get_fivem_status(max_age=0)
             if not status_data:
                 logger.error("Status monitor: Failed to fetch status data")
                 return
 
-            self.last_status = status_data
-
-            # Update all active monitors
-            for guild_id, monitor_info in list(self.active_monitors.items()):
-                try:
-                    channel_id = monitor_info['channel_id']
-                    message_id = monitor_info.get('message_id')
-                    
-                    channel = self.bot.get_channel(channel_id)
-                    if not channel:
-                        logger.error(f"Status monitor: Channel {channel_id} not found for guild {guild_id}")
-                        # Remove from active monitors and disable in config
-                        del self.active_monitors[guild_id]
-                        await disable_fivem_monitor_config(guild_id)
-                        continue
-
-                    embed = self.create_status_embed(status_data)
-                    
-                    if message_id:
-                        try:
-                            message = await channel.fetch_message(message_id)
-                            await message.edit(embed=embed)
-                            logger.info(f"Status monitor: Updated message for guild {guild_id}")
-                        except discord.NotFound:
-                            # Message was deleted, create a new one
-                            logger.warning(f"Status monitor: Message not found for guild {guild_id}, creating new one")
-                            new_message = await channel.send(embed=embed)
-                            self.active_monitors[guild_id]['message_id'] = new_message.id
-                            await save_fivem_monitor_config(guild_id, channel_id, new_message.id)
-                            logger.info(f"Status monitor: Created new message for guild {guild_id}")
-                        except Exception as e:
-                            logger.error(f"Status monitor: Error updating message for guild {guild_id}: {e}")
-                    else:
-                        # No message ID, create new message
-                        new_message = await channel.send(embed=embed)
-                        self.active_monitors[guild_id]['message_id'] = new_message.id
-                        await save_fivem_monitor_config(guild_id, channel_id, new_message.id)
-                        logger.info(f"Status monitor: Created initial message for guild {guild_id}")
+            # Antes de renderizar, para que el pie del panel muestre el intervalo real
+            self.schedule_next_poll(status_data)
+            await self.publish_monitors(status_data, force)
 
-                except Exception as e:
-                    logger.error(f"Status monitor: Error processing guild {guild_id}: {e}")
+            alerts = self.collect_alerts()
+            if alerts:
+                await self.send_alerts(alerts)
 
         except Exception as e:
             logger.error(f"Status monitor: Unexpected error: {e}")
 
+    async def publish_monitors(self, status_data: Dict[str, str], force: bool = False):
+        """Fan the status out to every panel at once, waiting at most STATUS_PUBLISH_WAIT.
+
+        A throttled channel keeps working in the background instead of holding
+        up the loop (and the alerts), and its queued edit is dropped as soon as
+        a newer cycle publishes.
+        """
+        futures = {}
+        for guild_id, monitor_info in self.active_monitors.items():
+            future = self.fanout.submit(
+                monitor_info['channel_id'],
+                functools.partial(self.update_monitor, guild_id, monitor_info, status_data, force),
+                tag=('panel', guild_id)
+            )
+            future.add_done_callback(functools.partial(self.log_panel_result, guild_id))
+            futures[future] = guild_id
+        if not futures:
+            return
+
+        _, pending = await asyncio.wait(futures, timeout=STATUS_PUBLISH_WAIT)
+        if pending:
+            logger.info(f"Status monitor: {len(pending)} panels still pending, continuing in the background")
+
+    def log_panel_result(self, guild_id: int, future: asyncio.Future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error:
+            logger.error(f"Status monitor: Error processing guild {guild_id}: {error}")
+        elif future.result() is SUPERSEDED:
+            logger.info(f"Status monitor: Pending update for guild {guild_id} superseded by a newer status")
+
+    @tasks.loop(seconds=SERVER_POLL_INTERVAL)
+    async def game_server_monitor(self):
+        """Poll the configured FXServers and refresh the panels that show them"""
+        try:
+            if not self.server_settings:
+                return
+            await self.refresh_game_servers()
+            # Sin estado de status.cfx.re todavía no hay panel que actualizar
+            if self.last_status and self.active_monitors:
+                await self.publish_monitors(self.last_status)
+        except Exception as e:
+            logger.error(f"Game server monitor: Unexpected error: {e}")
+
+    @game_server_monitor.before_loop
+    async def before_game_server_monitor(self):
+        await self.bot.wait_until_ready()
+
+    async def refresh_game_servers(self, servers: Optional[List[GameServer]] = None):
+        """Poll the given servers (default: every configured one) concurrently and cache the results"""
+        if servers is None:
+            servers = [server for guild_servers in self.server_settings.values() for server in guild_servers]
+        start = time.perf_counter()
+        results = await poll_servers(self.bot.http_client, servers, max_concurrency=SERVER_POLL_CONCURRENCY)
+        self.server_status.update(results)
+        online = sum(1 for status in results.values() if status.online)
+        logger.info(f"Game server monitor: {online}/{len(results)} servers online ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        try:
+            # Un servidor caído no aporta muestra: el hueco queda visible en el gráfico
+            await self.player_history.record({
+                address: status.players for address, status in results.items()
+                if status.online and status.players is not None
+            })
+        except Exception as e:
+            logger.error(f"Error recording player counts: {e}")
+
+    async def get_player_chart(self, server: GameServer, range_key: str) -> Optional[bytes]:
+        """PNG chart for a server and range, reused until the series gets a new sample"""
+        label, window, bucket = CHART_RANGES[range_key]
+        key = (server.address, range_key, bucket.total_seconds())
+        version = self.player_history.version(server.address)
+        cached = self.chart_cache.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+
+        points = self.player_history.query(server.address, window.total_seconds(), bucket.total_seconds())
+        if not points:
+            return None
+
+        async def render() -> bytes:
+            if self.chart_pool is None:
+                self.chart_pool = ProcessPoolExecutor(max_workers=CHART_WORKERS, mp_context=chart_mp_context())
+            status = self.server_status.get(server.address)
+            png = await asyncio.get_running_loop().run_in_executor(
+                self.chart_pool,
+                functools.partial(
+                    render_player_chart,
+                    f"{server.name} · {label}",
+                    [tuple(point) for point in points],
+                    status.max_players if status else None
+                )
+            )
+            self.chart_cache[key] = (version, png)
+            return png
+
+        # Peticiones simultáneas del mismo gráfico comparten un único renderizado
+        return await self.chart_flight.do((key, version), render)
+
+    def collect_alerts(self) -> List[tuple]:
+        """Return (component, old status, new status) for components whose state should be announced.
+
+        Works on the current state rather than on raw transitions: worsening is
+        announced at once, but after an alert a component must settle for
+        ALERT_COOLDOWN before an improvement is announced, so a flapping
+        component produces one alert instead of one per flip.
+        """
+        now = time.monotonic()
+        alerts = []
+        for component, status in self.status_history.current.items():
+            last = self.alerted.get(component)
+            if last is None:
+                # Estado inicial al arrancar: no es una transición
+                self.alerted[component] = (status, 0.0)
+                continue
+            last_status, last_at = last
+            if status == last_status:
+                continue
+            worse = COMPONENT_SEVERITY.index(status) > COMPONENT_SEVERITY.index(last_status)
+            if not worse and now - last_at < ALERT_COOLDOWN:
+                continue
+            alerts.append((component, last_status, status))
+            self.alerted[component] = (status, now)
+        return alerts
+
+    def create_alert_embed(self, alerts: List[tuple]) -> discord.Embed:
+        """Create the embed announcing a set of component transitions"""
+        worst = max((new for _, _, new in alerts), key=COMPONENT_SEVERITY.index)
+        recovered = worst == 'operational'
+        embed = discord.Embed(
+            title="✅ Servicios de FiveM recuperados" if recovered else "🚨 Cambio de estado en FiveM",
+            description="\n".join(
+                f"{SERVICES.get(component, component)}: "
+                f"{COMPONENT_STATUS_LABELS.get(old, old)} → **{COMPONENT_STATUS_LABELS.get(new, new)}**"
+                for component, old, new in alerts
+            ),
+            color=ALERT_COLORS.get(worst, 0x808080),
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(name="Estado General", value=self.last_status.get('overall', 'Desconocido'), inline=False)
+        embed.set_footer(text="Usa /historial_fivem para ver la disponibilidad • PT Scripts BOT")
+        return embed
+
+    async def send_alerts(self, alerts: List[tuple]):
+        """Post one alert per guild through the fan-out dispatcher"""
+        embed = self.create_alert_embed(alerts)
+        futures = []
+        for guild_id, settings in self.alert_settings.items():
+            if not settings['enabled']:
+                continue
+            channel_id = settings['channel_id'] or self.active_monitors.get(guild_id, {}).get('channel_id')
+            channel = self.bot.get_channel(channel_id) if channel_id else None
+            if not channel:
+                continue
+            content = f"<@&{settings['role_id']}>" if settings['role_id'] else None
+            # Sin etiqueta: una alerta nunca se descarta por otra más nueva
+            future = self.fanout.submit(
+                channel.id,
+                functools.partial(
+                    channel.send,
+                    content=content,
+                    embed=embed,
+                    allowed_mentions=discord.AllowedMentions(roles=True)
+                )
+            )
+            future.add_done_callback(functools.partial(self.log_alert_result, guild_id))
+            futures.append(future)
+        if not futures:
+            return
+
+        # Como los paneles: un canal limitado termina en segundo plano sin frenar el bucle
+        done, pending = await asyncio.wait(futures, timeout=STATUS_PUBLISH_WAIT)
+        failed = sum(1 for future in done if future.cancelled() or future.exception())
+        logger.info(
+            f"Status alerts: {len(alerts)} transitions sent to {len(done) - failed} guilds "
+            f"({failed} failed, {len(pending)} still pending)"
+        )
+
+    def log_alert_result(self, guild_id: int, future: asyncio.Future):
+        if not future.cancelled() and future.exception():
+            logger.error(f"Status alerts: Error sending alert to guild {guild_id}: {future.exception()}")
+
+    async def update_monitor(self, guild_id: int, monitor_info: dict, status_data: Dict[str, str], force: bool = False):
+        """Edit one guild's status panel through its cached PartialMessage"""
+        if self.active_monitors.get(guild_id) is not monitor_info:
+            return  # Monitor desactivado o reconfigurado mientras esperaba
+        channel_id = monitor_info['channel_id']
+        channel = self.bot.get_channel(channel_id)
+        if not channel:
+            logger.error(f"Status monitor: Channel {channel_id} not found for guild {guild_id}")
+            # Remove from active monitors and disable in the database
+            self.active_monitors.pop(guild_id, None)
+            await self.monitor_store.deactivate(guild_id)
+            return
+
+        # Se compara el hash antes de construir nada: un panel sin cambios cuesta un sha1
+        payload = self.status_payload(status_data)
+        extra_fields = game_server_fields(self.guild_game_servers(guild_id))
+        icon_url = self.panel_icon_url()
+        embed_hash = panel_hash(payload, extra_fields, icon_url)
+        if not force and monitor_info.get('status_hash') == embed_hash:
+            logger.debug(f"Status monitor: No changes for guild {guild_id}, skipping edit")
+            return
+        embed = panel_embed(payload, extra_fields, icon_url)
+
+        message_id = monitor_info.get('message_id')
+        if message_id:
+            # PartialMessage: se edita directamente sin un fetch_message previo
+            message = monitor_info.get('message')
+            if message is None or message.id != message_id or message.channel.id != channel_id:
+                message = monitor_info['message'] = channel.get_partial_message(message_id)
+            try:
+                await message.edit(embed=embed)
+                monitor_info['status_hash'] = embed_hash
+                logger.info(f"Status monitor: Updated message for guild {guild_id}")
+                return
+            except discord.NotFound:
+                # Message was deleted, create a new one
+                logger.warning(f"Status monitor: Message not found for guild {guild_id}, creating new one")
+
+        new_message = await channel.send(embed=embed)
+        monitor_info['message_id'] = new_message.id
+        monitor_info['message'] = new_message
+        monitor_info['status_hash'] = embed_hash
+        await self.monitor_store.save(guild_id, channel_id, new_message.id)
+        logger.info(f"Status monitor: Created new message for guild {guild_id}")
+
     @status_monitor.before_loop
     async def before_status_monitor(self):
         await self.bot.wait_until_ready()
-        await self.setup_monitor_from_config()
+        await self.ensure_bootstrapped()
 
     @app_commands.command(name="estado_fivem", description="Muestra el estado actual de los servidores de FiveM")
     async def fivem_status_command(self, interaction: discord.Interaction):
@@ -377,7 +786,7 @@ class FiveMStatus(commands.Cog):
         try:
             await interaction.response.defer()
 
-            status_data = await self.fetch_fivem_status()
+            status_data = await self.get_fivem_status()
 
             if not status_data:
                 embed = discord.Embed(
@@ -388,7 +797,13 @@ class FiveMStatus(commands.Cog):
                 await interaction.followup.send(embed=embed)
                 return
 
-            embed = self.create_status_embed(status_data)
+            game_servers = self.guild_game_servers(interaction.guild.id)
+            pending = [server for server, status in game_servers if status is None]
+            if pending:
+                await self.refresh_game_servers(pending)
+                game_servers = self.guild_game_servers(interaction.guild.id)
+
+            embed = self.create_status_embed(status_data, game_servers)
             await interaction.followup.send(embed=embed)
 
         except Exception as e:
@@ -418,7 +833,7 @@ class FiveMStatus(commands.Cog):
             await interaction.response.defer()
 
             # Get initial status
-            status_data = await self.fetch_fivem_status()
+            status_data = await self.get_fivem_status()
             if not status_data:
                 embed = discord.Embed(
                     title="❌ Error",
@@ -429,22 +844,25 @@ class FiveMStatus(commands.Cog):
                 return
 
             # Create and send the status message
-            embed = self.create_status_embed(status_data)
-            message = await canal.send(embed=embed)
+            payload = self.status_payload(status_data)
+            extra_fields = game_server_fields(self.guild_game_servers(interaction.guild.id))
+            icon_url = self.panel_icon_url()
+            message = await canal.send(embed=panel_embed(payload, extra_fields, icon_url))
 
             # Store the message and channel info in active monitors
             self.active_monitors[interaction.guild.id] = {
                 'channel_id': canal.id,
-                'message_id': message.id
+                'message_id': message.id,
+                'message': message,
+                'status_hash': panel_hash(payload, extra_fields, icon_url)
             }
-            self.last_status = status_data
 
-            # Save to config.json for persistence
-            success = await save_fivem_monitor_config(interaction.guild.id, canal.id, message.id)
+            # Save to the database for persistence
+            success = await self.monitor_store.save(interaction.guild.id, canal.id, message.id)
             if success:
-                logger.info(f"FiveM monitor saved to config.json: guild={interaction.guild.id}, channel={canal.id}, message={message.id}")
+                logger.info(f"FiveM monitor saved: guild={interaction.guild.id}, channel={canal.id}, message={message.id}")
             else:
-                logger.error(f"Failed to save FiveM monitor to config.json for guild {interaction.guild.id}")
+                logger.error(f"Failed to save FiveM monitor for guild {interaction.guild.id}")
             
             # Start monitor if not running
             if not self.status_monitor.is_running():
@@ -454,7 +872,7 @@ class FiveMStatus(commands.Cog):
             # Confirmation message
             confirmation_embed = discord.Embed(
                 title="✅ Monitoreo configurado",
-                description=f"El estado de FiveM se mostrará en {canal.mention} y se actualizará automáticamente cada 5 minutos.\n\n"
+                description=f"El estado de FiveM se mostrará en {canal.mention} y se actualizará automáticamente: cada {format_interval(POLL_FAST_INTERVAL)} durante incidencias y hasta cada {format_interval(POLL_MAX_INTERVAL)} cuando todo está estable.\n\n"
                            f"**El monitoreo persistirá** incluso si el bot se reinicia.",
                 color=0x00ff00
             )
@@ -498,15 +916,15 @@ class FiveMStatus(commands.Cog):
             # Remove from active monitors
             del self.active_monitors[interaction.guild.id]
 
-            # Disable in config.json
-            success = await disable_fivem_monitor_config(interaction.guild.id)
+            # Disable in the database
+            success = await self.monitor_store.deactivate(interaction.guild.id)
             if success:
-                logger.info(f"FiveM monitor disabled in config.json for guild {interaction.guild.id}")
+                logger.info(f"FiveM monitor disabled for guild {interaction.guild.id}")
             else:
-                logger.error(f"Failed to disable FiveM monitor in config.json for guild {interaction.guild.id}")
+                logger.error(f"Failed to disable FiveM monitor for guild {interaction.guild.id}")
 
             # Stop monitor if no active monitors remain
-            if not self.active_monitors and self.status_monitor.is_running():
+            if not self.monitoring_needed() and self.status_monitor.is_running():
                 self.status_monitor.cancel()
                 logger.info("Stopped FiveM status monitor - no active monitors")
 
@@ -556,7 +974,7 @@ class FiveMStatus(commands.Cog):
 
             # Force run the status monitor
             logger.info(f"Manual FiveM status update requested by {interaction.user}")
-            await self.status_monitor()
+            await self.update_monitors(force=True)
 
             embed = discord.Embed(
                 title="✅ Actualización forzada",
@@ -574,6 +992,369 @@ class FiveMStatus(commands.Cog):
             )
             await interaction.followup.send(embed=embed, ephemeral=True)
 
+    @app_commands.command(name="alertas_fivem", description="Configura los avisos de cambios de estado de FiveM")
+    @app_commands.describe(
+        activar="Activar o desactivar los avisos",
+        canal="Canal para los avisos (por defecto, el del panel de estado)",
+        rol="Rol a mencionar en cada aviso"
+    )
+    async def configure_fivem_alerts(
+        self,
+        interaction: discord.Interaction,
+        activar: bool,
+        canal: Optional[discord.TextChannel] = None,
+        rol: Optional[discord.Role] = None
+    ):
+        """Configure transition alerts for this guild"""
+        try:
+            if not interaction.user.guild_permissions.administrator:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="Necesitas permisos de administrador para usar este comando.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            guild_id = interaction.guild.id
+            if activar and not canal and guild_id not in self.active_monitors:
+                embed = discord.Embed(
+                    title="❌ Falta el canal",
+                    description="Indica un canal o configura primero el panel con `/configurar_estado_fivem`.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            settings = {
+                'enabled': activar,
+                'channel_id': canal.id if canal else None,
+                'role_id': rol.id if rol else None
+            }
+            config = await load_config()
+            config.setdefault('servers', {}).setdefault(str(guild_id), {})['fivem_alerts'] = settings
+            if not await save_config(config):
+                raise RuntimeError("config.json could not be saved")
+            self.alert_settings[guild_id] = settings
+
+            if activar and not self.status_monitor.is_running():
+                self.status_monitor.start()
+            elif not self.monitoring_needed() and self.status_monitor.is_running():
+                self.status_monitor.cancel()
+
+            if activar:
+                target = canal.mention if canal else "el canal del panel de estado"
+                embed = discord.Embed(
+                    title="✅ Avisos activados",
+                    description=f"Los cambios de estado de FiveM se avisarán en {target}"
+                               + (f" mencionando a {rol.mention}." if rol else "."),
+                    color=0x00ff00
+                )
+            else:
+                embed = discord.Embed(
+                    title="✅ Avisos desactivados",
+                    description="Ya no se avisarán los cambios de estado de FiveM.",
+                    color=0x00ff00
+                )
+            await interaction.response.send_message(embed=embed)
+            logger.info(f"FiveM alerts for guild {guild_id} set to {settings} by {interaction.user}")
+
+        except Exception as e:
+            logger.error(f"Error in configure_fivem_alerts: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al configurar los avisos de FiveM.",
+                color=0xff0000
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="servidores_fivem", description="Gestiona los servidores FXServer propios que muestra el panel")
+    @app_commands.describe(
+        accion="Qué hacer con la lista de servidores",
+        nombre="Nombre que se mostrará en el panel",
+        direccion="IP:puerto o URL del servidor (p. ej. 127.0.0.1:30120)",
+        timeout="Segundos de espera para este servidor (por defecto, 5)"
+    )
+    @app_commands.choices(accion=[
+        app_commands.Choice(name="Agregar", value="agregar"),
+        app_commands.Choice(name="Quitar", value="quitar"),
+        app_commands.Choice(name="Ver lista", value="lista")
+    ])
+    async def configure_game_servers(
+        self,
+        interaction: discord.Interaction,
+        accion: app_commands.Choice[str],
+        nombre: Optional[str] = None,
+        direccion: Optional[str] = None,
+        timeout: Optional[app_commands.Range[float, 1, MAX_SERVER_TIMEOUT]] = None
+    ):
+        """Add, remove or list this guild's FXServer endpoints"""
+        try:
+            if not interaction.user.guild_permissions.administrator:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="Necesitas permisos de administrador para usar este comando.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            guild_id = interaction.guild.id
+            servers = list(self.server_settings.get(guild_id, []))
+
+            if accion.value == "lista":
+                embed = discord.Embed(title="🕹️ Servidores FXServer", color=0x3498db)
+                if servers:
+                    embed.description = "\n".join(
+                        f"**{server.name}**: `{server.address}` ({server.timeout:g}s)" for server in servers
+                    )
+                else:
+                    embed.description = "No hay servidores configurados.\nUsa `/servidores_fivem agregar` para añadir uno."
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if not nombre:
+                embed = discord.Embed(
+                    title="❌ Falta el nombre",
+                    description="Indica el nombre del servidor.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if accion.value == "agregar":
+                if not direccion:
+                    embed = discord.Embed(
+                        title="❌ Falta la dirección",
+                        description="Indica la IP:puerto o URL del servidor.",
+                        color=0xff0000
+                    )
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+                    return
+                servers = [server for server in servers if server.name.lower() != nombre.lower()]
+                if len(servers) >= MAX_GAME_SERVERS:
+                    embed = discord.Embed(
+                        title="❌ Límite alcanzado",
+                        description=f"Solo se pueden configurar {MAX_GAME_SERVERS} servidores.",
+                        color=0xff0000
+                    )
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+                    return
+                servers.append(GameServer(nombre, direccion.strip(), float(timeout or DEFAULT_SERVER_TIMEOUT)))
+            else:
+                remaining = [server for server in servers if server.name.lower() != nombre.lower()]
+                if len(remaining) == len(servers):
+                    embed = discord.Embed(
+                        title="❌ No encontrado",
+                        description=f"No hay ningún servidor llamado **{nombre}**.",
+                        color=0xff0000
+                    )
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+                    return
+                servers = remaining
+
+            await interaction.response.defer()
+            config = await load_config()
+            config.setdefault('servers', {}).setdefault(str(guild_id), {})['fivem_servers'] = [
+                server._asdict() for server in servers
+            ]
+            if not await save_config(config):
+                raise RuntimeError("config.json could not be saved")
+            if servers:
+                self.server_settings[guild_id] = servers
+            else:
+                self.server_settings.pop(guild_id, None)
+
+            if self.server_settings and not self.game_server_monitor.is_running():
+                self.game_server_monitor.start()
+            elif not self.server_settings and self.game_server_monitor.is_running():
+                self.game_server_monitor.cancel()
+
+            if accion.value == "agregar":
+                added = servers[-1]
+                await self.refresh_game_servers([added])
+                embed = discord.Embed(
+                    title="✅ Servidor agregado",
+                    description=format_server_line(added, self.server_status.get(added.address)),
+                    color=0x00ff00
+                )
+            else:
+                embed = discord.Embed(
+                    title="✅ Servidor eliminado",
+                    description=f"**{nombre}** ya no se mostrará en el panel.",
+                    color=0x00ff00
+                )
+            await interaction.followup.send(embed=embed)
+            logger.info(f"FiveM game servers for guild {guild_id} set to {servers} by {interaction.user}")
+
+        except Exception as e:
+            logger.error(f"Error in configure_game_servers: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al configurar los servidores FXServer.",
+                color=0xff0000
+            )
+            if interaction.response.is_done():
+                await interaction.followup.send(embed=embed, ephemeral=True)
+            else:
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="grafico_jugadores", description="Muestra un gráfico de jugadores conectados a un servidor")
+    @app_commands.describe(
+        servidor="Nombre del servidor (por defecto, el primero configurado)",
+        rango="Periodo que abarca el gráfico"
+    )
+    @app_commands.choices(rango=[
+        app_commands.Choice(name=label, value=key) for key, (label, _, _) in CHART_RANGES.items()
+    ])
+    async def player_chart(
+        self,
+        interaction: discord.Interaction,
+        servidor: Optional[str] = None,
+        rango: Optional[app_commands.Choice[str]] = None
+    ):
+        """Render the player count chart of one of this guild's FXServers"""
+        try:
+            if not CHARTS_AVAILABLE:
+                embed = discord.Embed(
+                    title="❌ Gráficos no disponibles",
+                    description="El bot no tiene instalado matplotlib (`pip install .[charts]`).",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            servers = self.server_settings.get(interaction.guild.id, [])
+            server = next(
+                (s for s in servers if servidor is None or s.name.lower() == servidor.lower()),
+                None
+            )
+            if server is None:
+                embed = discord.Embed(
+                    title="❌ Servidor no encontrado",
+                    description="Configura los servidores con `/servidores_fivem` y usa uno de sus nombres."
+                               if servers else "No hay servidores configurados. Usa `/servidores_fivem agregar`.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            await interaction.response.defer()
+            range_key = rango.value if rango else "24h"
+            label, window, bucket = CHART_RANGES[range_key]
+            png = await self.get_player_chart(server, range_key)
+            if png is None:
+                embed = discord.Embed(
+                    title="📈 Sin datos",
+                    description=f"Todavía no hay muestras de **{server.name}** para este periodo.",
+                    color=0x808080
+                )
+                await interaction.followup.send(embed=embed)
+                return
+
+            points = self.player_history.query(server.address, window.total_seconds(), bucket.total_seconds())
+            embed = discord.Embed(
+                title=f"📈 Jugadores en {server.name}",
+                description=f"{label} · un punto cada {format_interval(bucket.total_seconds())}",
+                color=0x9b59b6
+            )
+            if points:
+                peak = max(points, key=lambda point: point.max)
+                embed.add_field(name="Pico", value=f"{peak.max} jugadores <t:{int(peak.start)}:R>", inline=True)
+                embed.add_field(
+                    name="Media",
+                    value=f"{sum(point.avg for point in points) / len(points):.1f} jugadores",
+                    inline=True
+                )
+            embed.set_image(url="attachment://jugadores.png")
+            await interaction.followup.send(embed=embed, file=discord.File(io.BytesIO(png), filename="jugadores.png"))
+
+        except Exception as e:
+            logger.error(f"Error in player_chart: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al generar el gráfico de jugadores.",
+                color=0xff0000
+            )
+            if interaction.response.is_done():
+                await interaction.followup.send(embed=embed, ephemeral=True)
+            else:
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(name="historial_fivem", description="Muestra la disponibilidad y los incidentes recientes de FiveM")
+    @app_commands.describe(componente="Componente concreto (por defecto, todos)")
+    @app_commands.choices(componente=[
+        app_commands.Choice(name=display_name, value=name) for name, display_name in SERVICES.items()
+    ])
+    async def fivem_history(self, interaction: discord.Interaction, componente: Optional[app_commands.Choice[str]] = None):
+        """Show 24h/7d/30d uptime and incidents from the stored status transitions"""
+        try:
+            await interaction.response.defer()
+
+            now = discord.utils.utcnow()
+            reports = [await self.status_history.report(window, now) for _, window in HISTORY_WINDOWS]
+            components = [componente.value] if componente else list(SERVICES)
+
+            def uptime(report, component) -> str:
+                value = report.get(component)
+                return f"{value.uptime:.2f}%" if value and value.uptime is not None else "—"
+
+            # Los incidentes de 30 días incluyen los de las ventanas más cortas
+            incidents = sorted(
+                (incident for component in components for incident in reports[-1].get(component, (None, []))[1]),
+                key=lambda incident: incident.started_at,
+                reverse=True
+            )[:HISTORY_INCIDENT_LIMIT]
+
+            if componente:
+                embed = discord.Embed(
+                    title=f"📈 Historial de {componente.name}",
+                    description=f"Estado actual: {self.last_status.get(componente.name, '❓ Desconocido')}",
+                    color=0x3498db
+                )
+                for (label, _), report in zip(HISTORY_WINDOWS, reports):
+                    embed.add_field(name=f"⏱️ {label}", value=uptime(report, componente.value), inline=True)
+            else:
+                lines = [
+                    f"{SERVICES[component]}: " + " · ".join(uptime(report, component) for report in reports)
+                    for component in components
+                ]
+                embed = discord.Embed(
+                    title="📈 Historial de FiveM",
+                    description="**Disponibilidad** (24 horas · 7 días · 30 días)\n" + "\n".join(lines),
+                    color=0x3498db
+                )
+
+            if incidents:
+                incident_lines = []
+                for incident in incidents:
+                    started = int(incident.started_at.replace(tzinfo=timezone.utc).timestamp())
+                    if incident.ended_at:
+                        ended = int(incident.ended_at.replace(tzinfo=timezone.utc).timestamp())
+                        minutes = max(1, (ended - started) // 60)
+                        end_text = f"{minutes} min"
+                    else:
+                        end_text = "**en curso**"
+                    name = "" if componente else f"{SERVICES.get(incident.component, incident.component)} · "
+                    incident_lines.append(
+                        f"{name}{COMPONENT_STATUS_LABELS.get(incident.status, incident.status)} · <t:{started}:f> · {end_text}"
+                    )
+                embed.add_field(name="⚠️ Incidentes (30 días)", value="\n".join(incident_lines)[:1024], inline=False)
+            else:
+                embed.add_field(name="⚠️ Incidentes (30 días)", value="✅ Sin incidentes registrados", inline=False)
+
+            embed.set_footer(text="Calculado a partir de los cambios de estado registrados por el bot")
+            await interaction.followup.send(embed=embed)
+
+        except Exception as e:
+            logger.error(f"Error in fivem_history: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al obtener el historial de FiveM.",
+                color=0xff0000
+            )
+            await interaction.followup.send(embed=embed)
+
     @app_commands.command(name="info_monitor_fivem", description="Muestra información sobre el monitoreo de FiveM")
     async def monitor_info_fivem(self, interaction: discord.Interaction):
         """Show information about FiveM monitoring"""
@@ -593,17 +1374,17 @@ class FiveMStatus(commands.Cog):
                 )
                 embed.add_field(
                     name="Canal Configurado",
-                    value=channel.mention if channel else f"❌ Canal no encontrado (ID: {self.status_channel_id})",
+                    value=channel.mention if channel else f"❌ Canal no encontrado (ID: {monitor_info['channel_id']})",
                     inline=True
                 )
                 embed.add_field(
                     name="Frecuencia de Actualización",
-                    value="⏰ Cada 5 minutos",
+                    value=f"⏰ Cada {format_interval(self.poll_interval)} (adaptativo)",
                     inline=True
                 )
                 embed.add_field(
                     name="ID del Mensaje",
-                    value=f"`{self.status_message_id}`",
+                    value=f"`{monitor_info.get('message_id')}`" if monitor_info.get('message_id') else "Sin mensaje",
                     inline=True
                 )
                 embed.add_field(
@@ -624,6 +1405,20 @@ class FiveMStatus(commands.Cog):
                 )
                 embed.description = "El monitoreo automático de FiveM no está configurado.\nUsa `/configurar_estado_fivem` para configurarlo."
 
+            breaker = self.status_breaker
+            breaker_value = BREAKER_STATE_LABELS[breaker.state]
+            if breaker.state == CircuitBreaker.OPEN:
+                breaker_value += f"\nReintento <t:{int(time.time() + breaker.retry_in())}:R>"
+            if breaker.failures:
+                breaker_value += f"\n{breaker.failures} fallos consecutivos"
+            embed.add_field(name="Conexión con status.cfx.re", value=breaker_value, inline=True)
+            embed.add_field(
+                name="Último Estado Válido",
+                value=f"<t:{int(self.last_status_time.timestamp())}:R>" + (" ⚠️" if self.status_stale else "")
+                if self.last_status_time else "Nunca",
+                inline=True
+            )
+
             embed.set_footer(text="Usa /forzar_actualizacion_fivem para una actualización manual")
             await interaction.response.send_message(embed=embed)
 
@@ -4,8 +4,13 @@ from discord import app_commands
 import asyncio
 import logging
 import json
-from datetime import datetime, timedelta
-from typing import Optional
+import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Union
+from utils.concurrency import RateLimitedExecutor
+from utils.scheduler import ExpiryScheduler
+from utils.bulk_jobs import BulkRoleJobStore
 
 logger = logging.getLogger(__name__)
 
@@ -55,9 +60,363 @@ def has_moderation_permission(user: discord.Member, guild_id: int, config: dict)
 
     return False
 
+# Límites para acciones masivas
+MASS_ACTION_PREVIEW_LIMIT = 20
+MASS_ACTION_MAX_PATTERN_LENGTH = 100
+BULK_BAN_CHUNK_SIZE = 200  # Máximo de usuarios por llamada a bulk_ban
+
+def parse_id_list(raw: Optional[str]) -> List[int]:
+    """Extract unique Discord IDs from a free-form list (spaces, commas or newlines)"""
+    if not raw:
+        return []
+    return list(dict.fromkeys(int(match) for match in re.findall(r'\d{15,20}', raw)))
+
+def is_protected_target(member: discord.Member, moderator: discord.Member) -> bool:
+    """Check if a member must never be hit by a mass action"""
+    guild = member.guild
+    if member == moderator or member == guild.me or member == guild.owner:
+        return True
+    if member.top_role >= guild.me.top_role:
+        return True
+    if member.top_role >= moderator.top_role and moderator != guild.owner:
+        return True
+    return False
+
+def select_mass_targets(
+    guild: discord.Guild,
+    moderator: discord.Member,
+    joined_minutes: Optional[int] = None,
+    account_days: Optional[int] = None,
+    name_pattern: Optional[re.Pattern] = None,
+    ids: Optional[List[int]] = None,
+    allow_uncached: bool = False,
+    fetched: Optional[Dict[int, Optional[discord.Member]]] = None
+) -> Tuple[List[Union[discord.Member, discord.Object]], int]:
+    """Resolve a raid selector against the member cache, without API fetches of its own.
+
+    All given filters must match. fetched holds the IDs missing from the cache
+    that were looked up beforehand: the member, or None if the user is not in
+    the guild. Non-members are returned as discord.Object (ban-only) when
+    allow_uncached is set and no other filter needs member data; IDs that
+    could not be checked at all are never targeted.
+    Returns the targets and how many matches were skipped because they are protected or unverified.
+    """
+    now = discord.utils.utcnow()
+    joined_after = now - timedelta(minutes=joined_minutes) if joined_minutes else None
+    created_after = now - timedelta(days=account_days) if account_days else None
+    needs_member_data = bool(joined_after or created_after or name_pattern)
+
+    targets = []
+    skipped = 0
+    # Una lista vacía no significa "todos": solo None recorre la caché de miembros
+    if ids is not None:
+        fetched = fetched or {}
+        candidates = []
+        for user_id in ids:
+            member = guild.get_member(user_id) or fetched.get(user_id)
+            if member is None and user_id not in fetched:
+                # No se pudo comprobar si es miembro: nunca se trata como desprotegido
+                skipped += 1
+                continue
+            candidates.append(member or discord.Object(id=user_id))
+    else:
+        candidates = guild.members
+
+    for candidate in candidates:
+        if not isinstance(candidate, discord.Member):
+            if allow_uncached and not needs_member_data:
+                targets.append(candidate)
+            continue
+
+        if joined_after and (not candidate.joined_at or candidate.joined_at < joined_after):
+            continue
+        if created_after and candidate.created_at < created_after:
+            continue
+        if name_pattern and not (
+            name_pattern.search(candidate.name) or
+            name_pattern.search(candidate.display_name)
+        ):
+            continue
+
+        if is_protected_target(candidate, moderator):
+            skipped += 1
+            continue
+        targets.append(candidate)
+
+    return targets, skipped
+
+class MassActionConfirmView(discord.ui.View):
+    def __init__(self, moderator_id: int):
+        super().__init__(timeout=120)
+        self.moderator_id = moderator_id
+        self.confirmed = False
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.moderator_id:
+            await interaction.response.send_message(
+                "❌ Solo el moderador que inició la acción puede confirmarla.",
+                ephemeral=True
+            )
+            return False
+        return True
+
+    @discord.ui.button(label='Confirmar', style=discord.ButtonStyle.danger, emoji='⚠️')
+    async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.confirmed = True
+        await interaction.response.defer()
+        self.stop()
+
+    @discord.ui.button(label='Cancelar', style=discord.ButtonStyle.secondary, emoji='✖️')
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await interaction.response.defer()
+        self.stop()
+
+# Duraciones para sanciones temporales
+DURATION_UNITS = {'m': 1, 'h': 60, 'd': 1440, 'w': 10080}
+MAX_TEMP_DURATION = timedelta(days=365)
+
+def parse_duration(raw: str) -> Optional[timedelta]:
+    """Parse durations like '90m', '12h', '7d' or '1w3d' (a bare number means minutes)"""
+    raw = raw.strip().lower().replace(' ', '')
+    if raw.isdigit():
+        delta = timedelta(minutes=int(raw))
+    else:
+        parts = re.findall(r'(\d+)([mhdw])', raw)
+        if not parts or ''.join(number + unit for number, unit in parts) != raw:
+            return None
+        delta = timedelta(minutes=sum(int(number) * DURATION_UNITS[unit] for number, unit in parts))
+    if delta <= timedelta(0) or delta > MAX_TEMP_DURATION:
+        return None
+    return delta
+
+# Roles masivos
+BULK_ROLE_CHECKPOINT = 25  # Miembros procesados entre guardados de progreso
+MAX_ID_FILE_SIZE = 1024 * 1024
+
+def parse_date(raw: Optional[str]) -> Optional[datetime]:
+    """Parse a YYYY-MM-DD date as UTC midnight, raising ValueError if invalid"""
+    if not raw:
+        return None
+    return datetime.strptime(raw.strip(), '%Y-%m-%d').replace(tzinfo=timezone.utc)
+
+def select_role_targets(
+    guild: discord.Guild,
+    role: discord.Role,
+    action: str,
+    with_role: Optional[discord.Role] = None,
+    joined_after: Optional[datetime] = None,
+    joined_before: Optional[datetime] = None,
+    ids: Optional[List[int]] = None
+) -> List[discord.Member]:
+    """Resolve bulk role targets from the member cache, skipping members that need no change"""
+    # Una lista vacía no significa "todos": solo None recorre la caché de miembros
+    if ids is not None:
+        candidates = [guild.get_member(user_id) for user_id in ids]
+    elif with_role:
+        candidates = with_role.members
+    elif action == 'remove':
+        candidates = role.members
+    else:
+        candidates = guild.members
+
+    targets = []
+    for member in candidates:
+        if member is None or member.bot:
+            continue
+        if with_role and with_role not in member.roles:
+            continue
+        if joined_after and (not member.joined_at or member.joined_at < joined_after):
+            continue
+        if joined_before and (not member.joined_at or member.joined_at >= joined_before):
+            continue
+        if (role in member.roles) == (action == 'add'):
+            continue
+        targets.append(member)
+    return targets
+
+def bulk_role_progress_embed(job: dict, role_mention: str) -> discord.Embed:
+    """Build the progress embed for a bulk role job"""
+    total = len(job['member_ids'])
+    done = min(job['position'], total)
+    filled = int(20 * done / total) if total else 20
+    verb = "Asignando" if job['action'] == 'add' else "Quitando"
+
+    if job['status'] == 'done':
+        title, color = f"✅ Trabajo #{job['id']} completado", 0x00ff00
+    elif job['status'] == 'cancelled':
+        title, color = f"✖️ Trabajo #{job['id']} cancelado", 0x747f8d
+    elif job['status'] == 'failed':
+        title, color = f"❌ Trabajo #{job['id']} interrumpido", 0xff0000
+    else:
+        title, color = f"⏳ {verb} rol (trabajo #{job['id']})", 0xffaa00
+
+    embed = discord.Embed(
+        title=title,
+        description=f"Rol: {role_mention}\n`{'█' * filled}{'░' * (20 - filled)}` {done}/{total}",
+        color=color
+    )
+    embed.add_field(name="✅ Aplicados", value=str(job['succeeded']), inline=True)
+    embed.add_field(name="❌ Fallidos", value=str(job['failed']), inline=True)
+    embed.set_footer(text=f"Iniciado por {job['moderator_id']} • El progreso se guarda y se reanuda tras un reinicio")
+    return embed
+
+# Historial de casos de moderación
+CASE_HISTORY_PAGE_SIZE = 10
+
+CASE_ACTION_LABELS = {
+    'ban': '🔨 Baneo',
+    'tempban': '⏳ Baneo temporal',
+    'unban': '🔓 Desbaneo',
+    'timeout': '🔇 Timeout',
+    'untimeout': '🔊 Timeout retirado',
+    'role_add': '➕ Rol asignado',
+    'role_remove': '➖ Rol quitado',
+    'role_update': '🔁 Roles modificados',
+    'kick': '👢 Expulsión',
+    'prune': '🧹 Purga de miembros',
+    'purge': '🧹 Limpieza de mensajes',
+    'automod': '🤖 Automod',
+    'antispam': '🛑 Anti-spam'
+}
+
+def format_case_line(case: dict, show_user: bool = False) -> str:
+    """Format a moderation case as a single history entry"""
+    label = CASE_ACTION_LABELS.get(case['action'], case['action'])
+    timestamp = int(case['created_at'].replace(tzinfo=timezone.utc).timestamp())
+    line = f"**#{case['id']}** {label} · <t:{timestamp}:R>"
+    if show_user and case['user_id']:
+        line += f" · <@{case['user_id']}>"
+    if case['moderator_id']:
+        line += f" · por <@{case['moderator_id']}>"
+
+    details = case['details']
+    if 'minutes' in details:
+        line += f" · {details['minutes']} min"
+    if 'role_id' in details:
+        line += f" · <@&{details['role_id']}>"
+    if 'expires_at' in details:
+        line += f" · expira <t:{details['expires_at']}:R>"
+    if 'count' in details:
+        line += f" · {details['count']} mensajes"
+    if details.get('mass'):
+        line += " · masivo"
+    if details.get('added'):
+        line += " · +" + " ".join(f"<@&{role_id}>" for role_id in details['added'])
+    if details.get('removed'):
+        line += " · -" + " ".join(f"<@&{role_id}>" for role_id in details['removed'])
+    if 'members' in details:
+        line += f" · {details['members']} miembros ({details['days']} días inactivos)"
+    if case.get('audit_log_id'):
+        line += " · manual"
+    if case['reason']:
+        line += f"\n  Razón: {case['reason'][:200]}"
+    return line
+
+class CaseHistoryView(discord.ui.View):
+    """Paginate case history using the last case of each page as the keyset cursor"""
+
+    def __init__(self, moderator_id: int, fetch_page, build_embed):
+        super().__init__(timeout=300)
+        self.moderator_id = moderator_id
+        self.fetch_page = fetch_page
+        self.build_embed = build_embed
+        self.cursors = [None]  # Cursor used to load each visited page
+        self.cases = []
+
+    async def load(self, cursor: Optional[dict]):
+        """Load the page that starts after the given cursor"""
+        cases = await self.fetch_page(cursor)
+        self.cases = cases[:CASE_HISTORY_PAGE_SIZE]
+        self.previous_page.disabled = len(self.cursors) <= 1
+        self.next_page.disabled = len(cases) <= CASE_HISTORY_PAGE_SIZE
+
+    def embed(self) -> discord.Embed:
+        return self.build_embed(self.cases, len(self.cursors))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.moderator_id
+
+    @discord.ui.button(label='Anterior', style=discord.ButtonStyle.secondary, emoji='◀️')
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.cursors.pop()
+        await self.load(self.cursors[-1])
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
+    @discord.ui.button(label='Siguiente', style=discord.ButtonStyle.secondary, emoji='▶️')
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.cursors.append(self.cases[-1])
+        await self.load(self.cursors[-1])
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Ejecutor compartido por las acciones masivas para no saturar las rutas de la API
+        self.mass_executor = RateLimitedExecutor(max_concurrency=5, min_interval=0.25)
+        # Sanciones temporales persistidas (tempban, roles temporales)
+        self.expiry_scheduler = ExpiryScheduler(self.execute_expired_action)
+        # Trabajos de roles masivos reanudables
+        self.bulk_role_jobs = BulkRoleJobStore()
+        self.bulk_role_tasks: Dict[int, asyncio.Task] = {}
+        self.bulk_role_cancelled = set()  # Trabajos cancelados por un administrador (no por descargar el cog)
+        self.role_executor = RateLimitedExecutor(max_concurrency=2, min_interval=0.5)
+
+    async def cog_load(self):
+        await self.expiry_scheduler.start()
+        asyncio.create_task(self.resume_bulk_role_jobs())
+
+    async def cog_unload(self):
+        await self.expiry_scheduler.stop()
+        for task in list(self.bulk_role_tasks.values()):
+            task.cancel()
+
+    async def execute_expired_action(self, job: dict) -> bool:
+        """Revert an expired temporary punishment, returning False to retry later"""
+        await self.bot.wait_until_ready()
+
+        guild = self.bot.get_guild(job['guild_id'])
+        if not guild:
+            logger.warning(f"Expired {job['action']} for guild {job['guild_id']} dropped: guild not available")
+            return True
+
+        try:
+            if job['action'] == 'unban':
+                await guild.unban(discord.Object(id=job['user_id']), reason="Baneo temporal expirado")
+                self.record_case(guild.id, job['user_id'], self.bot.user.id, 'unban', "Baneo temporal expirado")
+            elif job['action'] == 'remove_role':
+                member = guild.get_member(job['user_id'])
+                role = guild.get_role(job['role_id'])
+                if not member or not role or role not in member.roles:
+                    return True
+                await member.remove_roles(role, reason="Rol temporal expirado")
+                self.record_case(guild.id, member.id, self.bot.user.id, 'role_remove', "Rol temporal expirado", role_id=role.id)
+            else:
+                logger.warning(f"Unknown scheduled action {job['action']} #{job['id']}")
+                return True
+
+            logger.info(f"Expired {job['action']} executed for user {job['user_id']} in {guild.name}")
+            return True
+
+        except discord.NotFound:
+            # Ya desbaneado o el miembro ya no existe
+            return True
+        except discord.Forbidden:
+            logger.error(f"Missing permissions to revert {job['action']} for user {job['user_id']} in {guild.name}")
+            return True
+
+    def record_case(
+        self,
+        guild_id: int,
+        user_id: Optional[int],
+        moderator_id: Optional[int],
+        action: str,
+        reason: Optional[str] = None,
+        **details
+    ):
+        """Queue a moderation case in the bot's case store, if available"""
+        case_store = getattr(self.bot, 'case_store', None)
+        if case_store:
+            case_store.record(guild_id, user_id, moderator_id, action, reason, **details)
 
     @app_commands.command(name="limpiar", description="Elimina una cantidad específica de mensajes del canal")
     @app_commands.describe(
@@ -118,6 +477,15 @@ class Moderation(commands.Cog):
                 else:
                     deleted = await interaction.channel.purge(limit=cantidad)
 
+                self.record_case(
+                    interaction.guild.id,
+                    usuario.id if usuario else None,
+                    interaction.user.id,
+                    'purge',
+                    channel_id=interaction.channel.id,
+                    count=len(deleted)
+                )
+
                 # Mensaje de confirmación
                 embed = discord.Embed(
                     title="🧹 Mensajes eliminados",
@@ -259,6 +627,11 @@ class Moderation(commands.Cog):
                 reason=f"Baneado por {interaction.user} - {razon}",
                 delete_message_days=eliminar_mensajes
             )
+            # Un baneo permanente sustituye a un /tempban anterior: su desbaneo ya no debe ejecutarse
+            try:
+                await self.expiry_scheduler.cancel(interaction.guild.id, usuario.id, 'unban')
+            except Exception as e:
+                logger.error(f"Error cancelling pending unban for {usuario.id}: {e}")
 
             # Mensaje de confirmación
             embed = discord.Embed(
@@ -286,6 +659,11 @@ class Moderation(commands.Cog):
 
             await interaction.followup.send(embed=embed)
 
+            self.record_case(
+                interaction.guild.id, usuario.id, interaction.user.id, 'ban', razon,
+                delete_message_days=eliminar_mensajes
+            )
+
             # Log de la acción
             logger.info(
                 f"User banned: {usuario} ({usuario.id}) by {interaction.user} "
@@ -311,6 +689,265 @@ class Moderation(commands.Cog):
             else:
                 await interaction.followup.send(embed=embed)
 
+    @app_commands.command(name="tempban", description="Banea temporalmente a un usuario del servidor")
+    @app_commands.describe(
+        usuario="Usuario a banear",
+        duracion="Duración del baneo (ej. 90m, 12h, 7d, 2w)",
+        razon="Razón del baneo",
+        eliminar_mensajes="Días de mensajes a eliminar (0-7, por defecto 1)"
+    )
+    async def temp_ban_user(
+        self,
+        interaction: discord.Interaction,
+        usuario: discord.Member,
+        duracion: str,
+        razon: Optional[str] = "No especificada",
+        eliminar_mensajes: Optional[int] = 1
+    ):
+        """Ban a user and schedule the unban"""
+        try:
+            # Verificar permisos de moderación
+            config = await load_config()
+            if not has_moderation_permission(interaction.user, interaction.guild.id, config):
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="No tienes permisos para usar comandos de moderación.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if usuario == interaction.user or usuario == interaction.guild.owner:
+                embed = discord.Embed(
+                    title="❌ Acción inválida",
+                    description="No puedes banear a este usuario.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if usuario.top_role >= interaction.user.top_role and interaction.user != interaction.guild.owner:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="No puedes banear a alguien con un rol igual o superior al tuyo.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if usuario.top_role >= interaction.guild.me.top_role:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="No puedo banear a alguien con un rol igual o superior al mío.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            delta = parse_duration(duracion)
+            if not delta:
+                embed = discord.Embed(
+                    title="❌ Duración inválida",
+                    description="Usa un formato como `90m`, `12h`, `7d` o `1w3d` (máximo 365 días).",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if eliminar_mensajes < 0 or eliminar_mensajes > 7:
+                eliminar_mensajes = 1
+
+            await interaction.response.defer(ephemeral=True)
+
+            expires_at = datetime.utcnow() + delta
+            expires_ts = int(expires_at.replace(tzinfo=timezone.utc).timestamp())
+
+            # Intentar enviar DM al usuario antes del baneo
+            dm_embed = discord.Embed(
+                title="🔨 Has sido baneado temporalmente",
+                description=f"Has sido baneado del servidor **{interaction.guild.name}**",
+                color=0xff0000
+            )
+            dm_embed.add_field(name="Razón", value=razon, inline=False)
+            dm_embed.add_field(name="Finaliza", value=f"<t:{expires_ts}:f>", inline=False)
+            dm_sent = await self._send_sanction_dm(usuario, dm_embed)
+
+            await usuario.ban(
+                reason=f"Baneo temporal por {interaction.user} - {razon}",
+                delete_message_seconds=eliminar_mensajes * 86400
+            )
+
+            # Reemplazar cualquier desbaneo pendiente por el nuevo
+            await self.expiry_scheduler.cancel(interaction.guild.id, usuario.id, 'unban')
+            await self.expiry_scheduler.schedule(
+                interaction.guild.id, usuario.id, 'unban', expires_at, reason=razon
+            )
+
+            embed = discord.Embed(
+                title="⏳ Usuario baneado temporalmente",
+                description=f"**{usuario.display_name}** ha sido baneado del servidor.",
+                color=0xff0000
+            )
+            embed.add_field(name="Usuario", value=f"{usuario.mention} ({usuario.id})", inline=True)
+            embed.add_field(name="Moderador", value=interaction.user.mention, inline=True)
+            embed.add_field(name="Razón", value=razon, inline=False)
+            embed.add_field(name="Finaliza", value=f"<t:{expires_ts}:f>", inline=True)
+            embed.add_field(name="DM enviado", value="✅ Sí" if dm_sent else "❌ No", inline=True)
+            embed.set_footer(
+                text=f"ID del usuario: {usuario.id}",
+                icon_url=usuario.display_avatar.url
+            )
+
+            await interaction.followup.send(embed=embed)
+
+            self.record_case(
+                interaction.guild.id, usuario.id, interaction.user.id, 'tempban', razon,
+                expires_at=expires_ts, delete_message_days=eliminar_mensajes
+            )
+
+            logger.info(
+                f"User temp-banned: {usuario} ({usuario.id}) by {interaction.user} "
+                f"({interaction.user.id}) in {interaction.guild.name} until {expires_at} - Reason: {razon}"
+            )
+
+        except discord.Forbidden:
+            embed = discord.Embed(
+                title="❌ Sin permisos",
+                description="No tengo permisos para banear usuarios.",
+                color=0xff0000
+            )
+            await interaction.followup.send(embed=embed)
+        except Exception as e:
+            logger.error(f"Error in temp_ban_user: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al banear temporalmente al usuario.",
+                color=0xff0000
+            )
+            if not interaction.response.is_done():
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+            else:
+                await interaction.followup.send(embed=embed)
+
+    @app_commands.command(name="rol-temporal", description="Asigna un rol a un usuario durante un tiempo limitado")
+    @app_commands.describe(
+        usuario="Usuario al que se le asignará el rol",
+        rol="El rol que se asignará temporalmente",
+        duracion="Duración (ej. 90m, 12h, 7d, 2w)"
+    )
+    async def temp_role(
+        self,
+        interaction: discord.Interaction,
+        usuario: discord.Member,
+        rol: discord.Role,
+        duracion: str
+    ):
+        """Assign a role and schedule its removal"""
+        try:
+            # Verificar que el usuario sea administrador
+            if not interaction.user.guild_permissions.administrator:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="Solo los administradores pueden usar este comando.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if not interaction.guild.me.guild_permissions.manage_roles or rol >= interaction.guild.me.top_role:
+                embed = discord.Embed(
+                    title="❌ Error de jerarquía",
+                    description=f"No puedo gestionar el rol {rol.mention}.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if rol >= interaction.user.top_role and interaction.user != interaction.guild.owner:
+                embed = discord.Embed(
+                    title="❌ Error de jerarquía",
+                    description=f"No puedes asignar el rol {rol.mention} porque está en una posición igual o superior a tu rol más alto.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if rol == interaction.guild.default_role or rol.managed:
+                embed = discord.Embed(
+                    title="❌ Rol inválido",
+                    description="Ese rol no se puede asignar manualmente.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            delta = parse_duration(duracion)
+            if not delta:
+                embed = discord.Embed(
+                    title="❌ Duración inválida",
+                    description="Usa un formato como `90m`, `12h`, `7d` o `1w3d` (máximo 365 días).",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            await interaction.response.defer()
+
+            expires_at = datetime.utcnow() + delta
+            expires_ts = int(expires_at.replace(tzinfo=timezone.utc).timestamp())
+
+            if rol not in usuario.roles:
+                await usuario.add_roles(rol, reason=f"Rol temporal asignado por {interaction.user}")
+
+            await self.expiry_scheduler.cancel(interaction.guild.id, usuario.id, 'remove_role', role_id=rol.id)
+            await self.expiry_scheduler.schedule(
+                interaction.guild.id, usuario.id, 'remove_role', expires_at, role_id=rol.id
+            )
+
+            embed = discord.Embed(
+                title="⏳ Rol temporal asignado",
+                description=f"Se asignó el rol {rol.mention} a {usuario.mention}.",
+                color=0x00ff00
+            )
+            embed.add_field(name="Usuario", value=f"{usuario.mention} ({usuario.id})", inline=True)
+            embed.add_field(name="Rol", value=rol.mention, inline=True)
+            embed.add_field(name="Expira", value=f"<t:{expires_ts}:R>", inline=True)
+            embed.set_footer(
+                text=f"Asignado por {interaction.user.display_name}",
+                icon_url=interaction.user.display_avatar.url
+            )
+
+            await interaction.followup.send(embed=embed)
+
+            self.record_case(
+                interaction.guild.id, usuario.id, interaction.user.id, 'role_add',
+                role_id=rol.id, expires_at=expires_ts
+            )
+
+            logger.info(
+                f"Temporary role assigned: {rol.name} to {usuario} ({usuario.id}) by "
+                f"{interaction.user} ({interaction.user.id}) until {expires_at}"
+            )
+
+        except discord.Forbidden:
+            embed = discord.Embed(
+                title="❌ Sin permisos",
+                description="No tengo permisos para asignar este rol.",
+                color=0xff0000
+            )
+            await interaction.followup.send(embed=embed)
+        except Exception as e:
+            logger.error(f"Error in temp_role: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al asignar el rol temporal.",
+                color=0xff0000
+            )
+            if not interaction.response.is_done():
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+            else:
+                await interaction.followup.send(embed=embed)
+
     @app_commands.command(name="timeout", description="Silencia temporalmente a un usuario")
     @app_commands.describe(
         usuario="Usuario a silenciar",
@@ -446,6 +1083,11 @@ class Moderation(commands.Cog):
 
             await interaction.followup.send(embed=embed)
 
+            self.record_case(
+                interaction.guild.id, usuario.id, interaction.user.id, 'timeout', razon,
+                minutes=duracion
+            )
+
             # Log de la acción
             logger.info(
                 f"User timed out: {usuario} ({usuario.id}) by {interaction.user} "
@@ -519,6 +1161,8 @@ class Moderation(commands.Cog):
 
             await interaction.followup.send(embed=embed)
 
+            self.record_case(interaction.guild.id, usuario.id, interaction.user.id, 'untimeout')
+
             # Log de la acción
             logger.info(
                 f"Timeout removed: {usuario} ({usuario.id}) by {interaction.user} "
@@ -544,41 +1188,143 @@ class Moderation(commands.Cog):
             else:
                 await interaction.followup.send(embed=embed)
 
-    @app_commands.command(name="set-moderator-role", description="Establecer rol que puede usar comandos de moderación")
-    @app_commands.describe(role="Rol que podrá usar comandos de moderación")
-    @app_commands.default_permissions(administrator=True)
-    async def set_moderator_role(
+    @app_commands.command(name="historial-moderacion", description="Muestra el historial de sanciones de un usuario o de un moderador")
+    @app_commands.describe(
+        usuario="Usuario del que consultar las sanciones",
+        moderador="Moderador del que consultar las acciones"
+    )
+    async def moderation_history(
         self,
         interaction: discord.Interaction,
-        role: discord.Role
+        usuario: Optional[discord.User] = None,
+        moderador: Optional[discord.User] = None
     ):
-        """Add a role to moderation permissions"""
+        """Show paginated moderation history for a user or moderator"""
         try:
             config = await load_config()
-            guild_id_str = str(interaction.guild.id)
-            if 'servers' not in config:
-                config['servers'] = {}
-            if guild_id_str not in config['servers']:
-                config['servers'][guild_id_str] = {}
-            if 'moderation_role_ids' not in config['servers'][guild_id_str]:
-                config['servers'][guild_id_str]['moderation_role_ids'] = []
-
-            # Agregar el rol si no está ya en la lista
-            if role.id not in config['servers'][guild_id_str]['moderation_role_ids']:
-                config['servers'][guild_id_str]['moderation_role_ids'].append(role.id)
-
-                await save_config(config)
-
+            if not has_moderation_permission(interaction.user, interaction.guild.id, config):
                 embed = discord.Embed(
-                    title="✅ Rol de moderación agregado",
-                    description=f"Rol agregado: {role.mention}\n"
-                               f"Los miembros con este rol ahora pueden usar comandos de moderación.",
-                    color=0x00ff00
+                    title="❌ Sin permisos",
+                    description="No tienes permisos para usar comandos de moderación.",
+                    color=0xff0000
                 )
                 await interaction.response.send_message(embed=embed, ephemeral=True)
-                logger.info(f"Moderation role {role.name} added by {interaction.user}")
-            else:
-                embed = discord.Embed(
+                return
+
+            case_store = getattr(self.bot, 'case_store', None)
+            if not case_store:
+                embed = discord.Embed(
+                    title="❌ Historial no disponible",
+                    description="El registro de casos de moderación no está activo.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if not usuario and not moderador:
+                embed = discord.Embed(
+                    title="❌ Falta un filtro",
+                    description="Indica un usuario, un moderador o ambos.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            await interaction.response.defer(ephemeral=True)
+
+            guild_id = interaction.guild.id
+            if usuario:
+                async def fetch_page(cursor):
+                    return await case_store.get_user_cases(
+                        guild_id,
+                        usuario.id,
+                        before_id=cursor['id'] if cursor else None,
+                        limit=CASE_HISTORY_PAGE_SIZE + 1,
+                        moderator_id=moderador.id if moderador else None
+                    )
+                subject = usuario
+            else:
+                async def fetch_page(cursor):
+                    return await case_store.get_moderator_cases(
+                        guild_id,
+                        moderador.id,
+                        before=cursor,
+                        limit=CASE_HISTORY_PAGE_SIZE + 1
+                    )
+                subject = moderador
+
+            def build_embed(cases, page):
+                embed = discord.Embed(
+                    title=f"📋 Historial de moderación: {subject.display_name}",
+                    description="\n".join(format_case_line(case, show_user=not usuario) for case in cases),
+                    color=0x3498db
+                )
+                if usuario and moderador:
+                    embed.add_field(name="Moderador", value=moderador.mention, inline=True)
+                embed.set_footer(text=f"Página {page} • ID: {subject.id}", icon_url=subject.display_avatar.url)
+                return embed
+
+            view = CaseHistoryView(interaction.user.id, fetch_page, build_embed)
+            await view.load(None)
+
+            if not view.cases:
+                embed = discord.Embed(
+                    title="📋 Sin registros",
+                    description=f"No hay casos de moderación registrados para {subject.mention}.",
+                    color=0x3498db
+                )
+                await interaction.followup.send(embed=embed)
+                return
+
+            await interaction.followup.send(embed=view.embed(), view=view)
+
+        except Exception as e:
+            logger.error(f"Error in moderation_history: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al consultar el historial de moderación.",
+                color=0xff0000
+            )
+            if not interaction.response.is_done():
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+            else:
+                await interaction.followup.send(embed=embed)
+
+    @app_commands.command(name="set-moderator-role", description="Establecer rol que puede usar comandos de moderación")
+    @app_commands.describe(role="Rol que podrá usar comandos de moderación")
+    @app_commands.default_permissions(administrator=True)
+    async def set_moderator_role(
+        self,
+        interaction: discord.Interaction,
+        role: discord.Role
+    ):
+        """Add a role to moderation permissions"""
+        try:
+            config = await load_config()
+            guild_id_str = str(interaction.guild.id)
+            if 'servers' not in config:
+                config['servers'] = {}
+            if guild_id_str not in config['servers']:
+                config['servers'][guild_id_str] = {}
+            if 'moderation_role_ids' not in config['servers'][guild_id_str]:
+                config['servers'][guild_id_str]['moderation_role_ids'] = []
+
+            # Agregar el rol si no está ya en la lista
+            if role.id not in config['servers'][guild_id_str]['moderation_role_ids']:
+                config['servers'][guild_id_str]['moderation_role_ids'].append(role.id)
+
+                await save_config(config)
+
+                embed = discord.Embed(
+                    title="✅ Rol de moderación agregado",
+                    description=f"Rol agregado: {role.mention}\n"
+                               f"Los miembros con este rol ahora pueden usar comandos de moderación.",
+                    color=0x00ff00
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                logger.info(f"Moderation role {role.name} added by {interaction.user}")
+            else:
+                embed = discord.Embed(
                     title="⚠️ Rol ya configurado",
                     description=f"El rol {role.mention} ya está configurado como rol de moderación.",
                     color=0xffaa00
@@ -694,7 +1440,7 @@ class Moderation(commands.Cog):
             # Comandos disponibles
             embed.add_field(
                 name="⚙️ Comandos Disponibles",
-                value="• `/limpiar` - Eliminar mensajes\n• `/banear` - Banear usuarios\n• `/timeout` - Silenciar usuarios\n• `/quitar-timeout` - Quitar silencio\n• `/asignar_rol` - Asignar rol a usuario (Solo Admin)\n• `/quitar_rol` - Quitar rol de usuario (Solo Admin)\n• `/set_moderator_role` - Configurar rol de moderación (Solo Admin)\n• `/remove_moderator_role` - Remover rol de moderación (Solo Admin)",
+                value="• `/limpiar` - Eliminar mensajes\n• `/banear` - Banear usuarios\n• `/timeout` - Silenciar usuarios\n• `/tempban` - Banear temporalmente\n• `/rol-temporal` - Asignar rol temporal (Solo Admin)\n• `/quitar-timeout` - Quitar silencio\n• `/ban-masivo` - Banear usuarios por selector\n• `/timeout-masivo` - Silenciar usuarios por selector\n• `/historial-moderacion` - Ver historial de sanciones\n• `/asignar_rol` - Asignar rol a usuario (Solo Admin)\n• `/quitar_rol` - Quitar rol de usuario (Solo Admin)\n• `/asignar_rol_masivo` / `/quitar_rol_masivo` - Roles en masa (Solo Admin)\n• `/set_moderator_role` - Configurar rol de moderación (Solo Admin)\n• `/remove_moderator_role` - Remover rol de moderación (Solo Admin)",
                 inline=False
             )
 
@@ -954,6 +1700,8 @@ class Moderation(commands.Cog):
 
             await interaction.followup.send(embed=embed)
 
+            self.record_case(interaction.guild.id, usuario.id, interaction.user.id, 'role_add', role_id=rol.id)
+
             # Log de la acción
             logger.info(f"Role assigned: {rol.name} to {usuario} ({usuario.id}) by {interaction.user} ({interaction.user.id})")
 
@@ -1082,6 +1830,8 @@ class Moderation(commands.Cog):
 
             await interaction.followup.send(embed=embed)
 
+            self.record_case(interaction.guild.id, usuario.id, interaction.user.id, 'role_remove', role_id=rol.id)
+
             # Log de la acción
             logger.info(f"Role removed: {rol.name} from {usuario} ({usuario.id}) by {interaction.user} ({interaction.user.id})")
 
@@ -1104,5 +1854,755 @@ class Moderation(commands.Cog):
             else:
                 await interaction.followup.send(embed=embed)
 
+    async def resume_bulk_role_jobs(self):
+        """Resume bulk role jobs that were running when the bot stopped"""
+        await self.bot.wait_until_ready()
+        try:
+            for job in await self.bulk_role_jobs.load_running():
+                logger.info(f"Resuming bulk role job #{job['id']} at {job['position']}/{len(job['member_ids'])}")
+                self.start_bulk_role_job(job)
+        except Exception as e:
+            logger.error(f"Error resuming bulk role jobs: {e}")
+
+    def start_bulk_role_job(self, job: dict):
+        self.bulk_role_tasks[job['id']] = asyncio.create_task(self.run_bulk_role_job(job))
+
+    async def save_bulk_role_progress(self, job: dict):
+        """Checkpoint a job; if the task is cancelled meanwhile, the write still lands before the cancellation propagates"""
+        save = asyncio.ensure_future(self.bulk_role_jobs.save_progress(job))
+        try:
+            await asyncio.shield(save)
+        except asyncio.CancelledError:
+            await save
+            raise
+
+    async def run_bulk_role_job(self, job: dict):
+        """Apply a bulk role job in checkpointed chunks through the paced role executor"""
+        try:
+            guild = self.bot.get_guild(job['guild_id'])
+            role = guild.get_role(job['role_id']) if guild else None
+            if not role:
+                job['status'] = 'failed'
+                await self.save_bulk_role_progress(job)
+                logger.warning(f"Bulk role job #{job['id']} aborted: guild or role not found")
+                return
+
+            channel = guild.get_channel(job['channel_id']) if job['channel_id'] else None
+            message = None
+            if channel:
+                if job['message_id']:
+                    message = channel.get_partial_message(job['message_id'])
+                else:
+                    message = await channel.send(embed=bulk_role_progress_embed(job, role.mention))
+                    job['message_id'] = message.id
+                    await self.save_bulk_role_progress(job)
+
+            adding = job['action'] == 'add'
+            reason = f"Rol {'asignado' if adding else 'quitado'} en masa (trabajo #{job['id']})"
+            case_action = 'role_add' if adding else 'role_remove'
+
+            async def apply(member_id: int) -> bool:
+                member = guild.get_member(member_id)
+                if member is None:
+                    return False
+                # Idempotente: un reinicio puede repetir parte del último bloque
+                if (role in member.roles) == adding:
+                    return True
+                if adding:
+                    await member.add_roles(role, reason=reason)
+                else:
+                    await member.remove_roles(role, reason=reason)
+                self.record_case(guild.id, member.id, job['moderator_id'], case_action, role_id=role.id, bulk_job=job['id'])
+                return True
+
+            member_ids = job['member_ids']
+            while job['position'] < len(member_ids):
+                chunk = member_ids[job['position']:job['position'] + BULK_ROLE_CHECKPOINT]
+                results = await self.role_executor.map(apply, chunk)
+                job['succeeded'] += sum(1 for _, applied, error in results if applied and not error)
+                job['failed'] += sum(1 for _, applied, error in results if error or not applied)
+                job['position'] += len(chunk)
+                await self.save_bulk_role_progress(job)
+
+                if message:
+                    try:
+                        await message.edit(embed=bulk_role_progress_embed(job, role.mention))
+                    except discord.HTTPException:
+                        pass
+
+            job['status'] = 'done'
+            await self.save_bulk_role_progress(job)
+            if message:
+                try:
+                    await message.edit(embed=bulk_role_progress_embed(job, role.mention))
+                except discord.HTTPException:
+                    pass
+
+            logger.info(
+                f"Bulk role job #{job['id']} finished in {guild.name}: {role.name} {job['action']} - "
+                f"{job['succeeded']} succeeded, {job['failed']} failed"
+            )
+
+        except asyncio.CancelledError:
+            # Único punto que guarda la cancelación: ningún checkpoint anterior puede pisarla
+            if job['id'] in self.bulk_role_cancelled:
+                job['status'] = 'cancelled'
+                await self.bulk_role_jobs.save_progress(job)
+            # Si no, el progreso ya está guardado y el trabajo se reanudará al volver a cargar el cog
+            raise
+        except Exception as e:
+            logger.error(f"Error in bulk role job #{job['id']}: {e}")
+        finally:
+            self.bulk_role_tasks.pop(job['id'], None)
+            self.bulk_role_cancelled.discard(job['id'])
+
+    async def _start_bulk_role_command(
+        self,
+        interaction: discord.Interaction,
+        action: str,
+        rol: discord.Role,
+        con_rol: Optional[discord.Role],
+        unidos_desde: Optional[str],
+        unidos_hasta: Optional[str],
+        archivo: Optional[discord.Attachment]
+    ):
+        """Validate a bulk role request, preview it and start a persisted job"""
+        try:
+            if not interaction.user.guild_permissions.administrator:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="Solo los administradores pueden usar este comando.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if not interaction.guild.me.guild_permissions.manage_roles or rol >= interaction.guild.me.top_role:
+                embed = discord.Embed(
+                    title="❌ Error de jerarquía",
+                    description=f"No puedo gestionar el rol {rol.mention}.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if rol >= interaction.user.top_role and interaction.user != interaction.guild.owner:
+                embed = discord.Embed(
+                    title="❌ Error de jerarquía",
+                    description=f"No puedes gestionar el rol {rol.mention} porque está en una posición igual o superior a tu rol más alto.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if rol == interaction.guild.default_role or rol.managed:
+                embed = discord.Embed(
+                    title="❌ Rol inválido",
+                    description="Ese rol no se puede gestionar manualmente.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            try:
+                joined_after = parse_date(unidos_desde)
+                joined_before = parse_date(unidos_hasta)
+            except ValueError:
+                embed = discord.Embed(
+                    title="❌ Fecha inválida",
+                    description="Usa el formato `AAAA-MM-DD` para las fechas.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if action == 'add' and not any([con_rol, joined_after, joined_before, archivo]):
+                embed = discord.Embed(
+                    title="❌ Selector vacío",
+                    description="Indica al menos un filtro: rol actual, fechas de entrada o archivo de IDs.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            ids = None
+            if archivo:
+                if archivo.size > MAX_ID_FILE_SIZE:
+                    embed = discord.Embed(
+                        title="❌ Archivo demasiado grande",
+                        description="El archivo de IDs no puede superar 1 MB.",
+                        color=0xff0000
+                    )
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+                    return
+                ids = parse_id_list((await archivo.read()).decode('utf-8', errors='ignore'))
+                if not ids:
+                    embed = discord.Embed(
+                        title="❌ Archivo sin IDs",
+                        description="No se encontraron IDs de Discord en el archivo.",
+                        color=0xff0000
+                    )
+                    await interaction.response.send_message(embed=embed, ephemeral=True)
+                    return
+
+            targets = select_role_targets(
+                interaction.guild, rol, action,
+                with_role=con_rol, joined_after=joined_after, joined_before=joined_before, ids=ids
+            )
+
+            await interaction.response.defer(ephemeral=True)
+            title = f"{'Asignar' if action == 'add' else 'Quitar'} {rol.name} en masa"
+            message = await self._confirm_mass_action(interaction, title, targets, 0)
+            if message is None:
+                return
+
+            job = await self.bulk_role_jobs.create(
+                interaction.guild.id, rol.id, action, interaction.user.id,
+                [member.id for member in targets], channel_id=interaction.channel.id
+            )
+            self.start_bulk_role_job(job)
+
+            embed = discord.Embed(
+                title=f"✅ Trabajo #{job['id']} iniciado",
+                description=f"Procesando **{len(targets)}** miembros. El progreso se mostrará en {interaction.channel.mention}.",
+                color=0x00ff00
+            )
+            await message.edit(embed=embed)
+
+            logger.info(
+                f"Bulk role job #{job['id']} started by {interaction.user} ({interaction.user.id}) "
+                f"in {interaction.guild.name}: {action} {rol.name} for {len(targets)} members"
+            )
+
+        except Exception as e:
+            logger.error(f"Error starting bulk role job: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al iniciar el trabajo de roles.",
+                color=0xff0000
+            )
+            if not interaction.response.is_done():
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+            else:
+                await interaction.followup.send(embed=embed)
+
+    @app_commands.command(name="asignar_rol_masivo", description="Asigna un rol a muchos miembros según un filtro")
+    @app_commands.describe(
+        rol="El rol que se asignará",
+        con_rol="Solo miembros que ya tengan este rol",
+        unidos_desde="Solo miembros que entraron desde esta fecha (AAAA-MM-DD)",
+        unidos_hasta="Solo miembros que entraron antes de esta fecha (AAAA-MM-DD)",
+        archivo="Archivo de texto con IDs de usuario"
+    )
+    async def bulk_assign_role(
+        self,
+        interaction: discord.Interaction,
+        rol: discord.Role,
+        con_rol: Optional[discord.Role] = None,
+        unidos_desde: Optional[str] = None,
+        unidos_hasta: Optional[str] = None,
+        archivo: Optional[discord.Attachment] = None
+    ):
+        """Assign a role to every member matching a filter"""
+        await self._start_bulk_role_command(interaction, 'add', rol, con_rol, unidos_desde, unidos_hasta, archivo)
+
+    @app_commands.command(name="quitar_rol_masivo", description="Quita un rol a muchos miembros según un filtro")
+    @app_commands.describe(
+        rol="El rol que se quitará (sin filtros: a todos los que lo tengan)",
+        con_rol="Solo miembros que tengan también este rol",
+        unidos_desde="Solo miembros que entraron desde esta fecha (AAAA-MM-DD)",
+        unidos_hasta="Solo miembros que entraron antes de esta fecha (AAAA-MM-DD)",
+        archivo="Archivo de texto con IDs de usuario"
+    )
+    async def bulk_remove_role(
+        self,
+        interaction: discord.Interaction,
+        rol: discord.Role,
+        con_rol: Optional[discord.Role] = None,
+        unidos_desde: Optional[str] = None,
+        unidos_hasta: Optional[str] = None,
+        archivo: Optional[discord.Attachment] = None
+    ):
+        """Remove a role from every member matching a filter"""
+        await self._start_bulk_role_command(interaction, 'remove', rol, con_rol, unidos_desde, unidos_hasta, archivo)
+
+    @app_commands.command(name="cancelar_rol_masivo", description="Cancela un trabajo de roles masivos en curso")
+    @app_commands.describe(trabajo="Número del trabajo a cancelar")
+    async def cancel_bulk_role(self, interaction: discord.Interaction, trabajo: int):
+        """Cancel a running bulk role job"""
+        try:
+            if not interaction.user.guild_permissions.administrator:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="Solo los administradores pueden usar este comando.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            job = await self.bulk_role_jobs.get(trabajo)
+            if not job or job['guild_id'] != interaction.guild.id or job['status'] != 'running':
+                embed = discord.Embed(
+                    title="ℹ️ Trabajo no encontrado",
+                    description=f"No hay ningún trabajo en curso con el número #{trabajo}.",
+                    color=0x3498db
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            # Esperar a la tarea puede superar los 3 segundos de la interacción
+            await interaction.response.defer()
+
+            task = self.bulk_role_tasks.get(trabajo)
+            if task:
+                # La tarea guarda su propio estado final; se espera a que termine y se relee
+                self.bulk_role_cancelled.add(trabajo)
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                job = await self.bulk_role_jobs.get(trabajo)
+            else:
+                job['status'] = 'cancelled'
+                await self.bulk_role_jobs.save_progress(job)
+
+            embed = bulk_role_progress_embed(job, f"<@&{job['role_id']}>")
+            await interaction.followup.send(embed=embed)
+            logger.info(f"Bulk role job #{trabajo} cancelled by {interaction.user} at {job['position']}/{len(job['member_ids'])}")
+
+        except Exception as e:
+            logger.error(f"Error cancelling bulk role job: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error al cancelar el trabajo.",
+                color=0xff0000
+            )
+            if not interaction.response.is_done():
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+            else:
+                await interaction.followup.send(embed=embed)
+
+
+    async def _send_sanction_dm(self, member: discord.Member, embed: discord.Embed) -> bool:
+        """Try to DM a sanctioned member, returning whether it was delivered"""
+        try:
+            await member.send(embed=embed)
+            return True
+        except (discord.Forbidden, discord.HTTPException):
+            return False
+
+    async def _resolve_mass_selector(
+        self,
+        interaction: discord.Interaction,
+        unidos_hace_minutos: Optional[int],
+        cuenta_menor_dias: Optional[int],
+        patron_nombre: Optional[str],
+        ids: Optional[str],
+        allow_uncached: bool
+    ):
+        """Validate the selector options and resolve targets, answering with an error embed on failure.
+
+        On success the interaction has been deferred (ephemeral), since IDs
+        missing from the cache are looked up with fetch_member.
+        """
+        id_list = None
+        if ids:
+            id_list = parse_id_list(ids)
+            if not id_list:
+                embed = discord.Embed(
+                    title="❌ Lista sin IDs",
+                    description="No se encontraron IDs de Discord válidos en la lista.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return None
+
+        if not any([unidos_hace_minutos, cuenta_menor_dias, patron_nombre, id_list]):
+            embed = discord.Embed(
+                title="❌ Selector vacío",
+                description="Debes indicar al menos un filtro: minutos desde la entrada, antigüedad de la cuenta, patrón de nombre o lista de IDs.",
+                color=0xff0000
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return None
+
+        name_pattern = None
+        if patron_nombre:
+            if len(patron_nombre) > MASS_ACTION_MAX_PATTERN_LENGTH:
+                embed = discord.Embed(
+                    title="❌ Patrón inválido",
+                    description=f"El patrón no puede superar los {MASS_ACTION_MAX_PATTERN_LENGTH} caracteres.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return None
+            try:
+                name_pattern = re.compile(patron_nombre, re.IGNORECASE)
+            except re.error as e:
+                embed = discord.Embed(
+                    title="❌ Patrón inválido",
+                    description=f"La expresión regular no es válida: `{e}`",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return None
+
+        await interaction.response.defer(ephemeral=True)
+        fetched = {}
+        if id_list:
+            missing = [user_id for user_id in id_list if interaction.guild.get_member(user_id) is None]
+            results = await self.mass_executor.map(interaction.guild.fetch_member, missing)
+            for user_id, member, error in results:
+                if isinstance(error, discord.NotFound):
+                    fetched[user_id] = None  # No es miembro del servidor: solo se puede banear
+                elif member is not None:
+                    fetched[user_id] = member
+
+        return select_mass_targets(
+            interaction.guild,
+            interaction.user,
+            joined_minutes=unidos_hace_minutos,
+            account_days=cuenta_menor_dias,
+            name_pattern=name_pattern,
+            ids=id_list,
+            allow_uncached=allow_uncached,
+            fetched=fetched
+        )
+
+    async def _confirm_mass_action(
+        self,
+        interaction: discord.Interaction,
+        title: str,
+        targets: List[Union[discord.Member, discord.Object]],
+        skipped: int
+    ) -> Optional[discord.WebhookMessage]:
+        """Send a dry-run preview built from the cache and wait for the moderator to confirm"""
+        lines = []
+        for target in targets[:MASS_ACTION_PREVIEW_LIMIT]:
+            if isinstance(target, discord.Member):
+                lines.append(f"• {target.mention} (`{target.id}`) - cuenta creada <t:{int(target.created_at.timestamp())}:R>")
+            else:
+                lines.append(f"• `{target.id}` (no es miembro del servidor)")
+        if len(targets) > MASS_ACTION_PREVIEW_LIMIT:
+            lines.append(f"... y {len(targets) - MASS_ACTION_PREVIEW_LIMIT} más")
+
+        embed = discord.Embed(
+            title=f"👁️ Vista previa: {title}",
+            description=f"La acción afectará a **{len(targets)}** usuarios. Todavía no se ha ejecutado nada.\n\n" +
+                       ("\n".join(lines) if lines else "Ningún usuario coincide con el selector."),
+            color=0xffaa00
+        )
+        if skipped:
+            embed.add_field(
+                name="🛡️ Protegidos",
+                value=f"{skipped} usuarios omitidos por jerarquía de roles o por no poder verificarlos",
+                inline=False
+            )
+        if not interaction.guild.chunked:
+            embed.add_field(
+                name="⚠️ Caché incompleta",
+                value="La lista de miembros aún no está completa; algunos usuarios podrían no aparecer.",
+                inline=False
+            )
+
+        if not targets:
+            await interaction.followup.send(embed=embed)
+            return None
+
+        view = MassActionConfirmView(interaction.user.id)
+        message = await interaction.followup.send(embed=embed, view=view, wait=True)
+        await view.wait()
+
+        if not view.confirmed:
+            cancelled = discord.Embed(
+                title="✖️ Acción cancelada",
+                description="No se ha aplicado ninguna sanción.",
+                color=0x747f8d
+            )
+            await message.edit(embed=cancelled, view=None)
+            return None
+
+        progress = discord.Embed(
+            title=f"⏳ Ejecutando: {title}",
+            description=f"Procesando **{len(targets)}** usuarios...",
+            color=0xffaa00
+        )
+        await message.edit(embed=progress, view=None)
+        return message
+
+    def _mass_summary_embed(
+        self,
+        title: str,
+        color: int,
+        succeeded: int,
+        failed: List[int],
+        dm_sent: Optional[int],
+        elapsed: float
+    ) -> discord.Embed:
+        """Build the final summary embed for a mass action"""
+        embed = discord.Embed(title=title, color=color)
+        embed.add_field(name="✅ Aplicadas", value=str(succeeded), inline=True)
+        embed.add_field(name="❌ Fallidas", value=str(len(failed)), inline=True)
+        embed.add_field(
+            name="✉️ DMs enviados",
+            value=str(dm_sent) if dm_sent is not None else "Omitidos",
+            inline=True
+        )
+        if failed:
+            failed_text = ", ".join(f"`{user_id}`" for user_id in failed[:MASS_ACTION_PREVIEW_LIMIT])
+            if len(failed) > MASS_ACTION_PREVIEW_LIMIT:
+                failed_text += f" y {len(failed) - MASS_ACTION_PREVIEW_LIMIT} más"
+            embed.add_field(name="IDs con error", value=failed_text, inline=False)
+        embed.set_footer(text=f"Completado en {elapsed:.1f}s")
+        return embed
+
+    @app_commands.command(name="ban-masivo", description="Banea a varios usuarios a la vez según un selector (respuesta a raids)")
+    @app_commands.describe(
+        razon="Razón del baneo",
+        unidos_hace_minutos="Usuarios que entraron en los últimos N minutos",
+        cuenta_menor_dias="Usuarios con cuentas de menos de N días",
+        patron_nombre="Expresión regular aplicada al nombre de usuario",
+        ids="Lista de IDs separados por espacios o comas",
+        eliminar_mensajes="Días de mensajes a eliminar (0-7, por defecto 1)",
+        enviar_dm="Enviar un DM a cada usuario antes del baneo (más lento)"
+    )
+    async def mass_ban(
+        self,
+        interaction: discord.Interaction,
+        razon: Optional[str] = "Raid",
+        unidos_hace_minutos: Optional[app_commands.Range[int, 1, 10080]] = None,
+        cuenta_menor_dias: Optional[app_commands.Range[int, 1, 3650]] = None,
+        patron_nombre: Optional[str] = None,
+        ids: Optional[str] = None,
+        eliminar_mensajes: Optional[int] = 1,
+        enviar_dm: Optional[bool] = False
+    ):
+        """Ban every member matched by a raid selector"""
+        try:
+            config = await load_config()
+            if not has_moderation_permission(interaction.user, interaction.guild.id, config):
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="No tienes permisos para usar comandos de moderación.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if not interaction.guild.me.guild_permissions.ban_members:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="No tengo permisos para banear usuarios.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if eliminar_mensajes < 0 or eliminar_mensajes > 7:
+                eliminar_mensajes = 1
+
+            selection = await self._resolve_mass_selector(
+                interaction, unidos_hace_minutos, cuenta_menor_dias, patron_nombre, ids,
+                allow_uncached=True
+            )
+            if selection is None:
+                return
+            targets, skipped = selection
+
+            message = await self._confirm_mass_action(interaction, "Baneo masivo", targets, skipped)
+            if message is None:
+                return
+
+            start = time.monotonic()
+            guild = interaction.guild
+
+            dm_sent = None
+            if enviar_dm:
+                dm_embed = discord.Embed(
+                    title="🔨 Has sido baneado",
+                    description=f"Has sido baneado del servidor **{guild.name}**",
+                    color=0xff0000
+                )
+                dm_embed.add_field(name="Razón", value=razon, inline=False)
+                members = [target for target in targets if isinstance(target, discord.Member)]
+                results = await self.mass_executor.map(
+                    lambda member: self._send_sanction_dm(member, dm_embed),
+                    members
+                )
+                dm_sent = sum(1 for _, delivered, _ in results if delivered)
+
+            reason = f"Baneo masivo por {interaction.user} - {razon}"
+            delete_seconds = eliminar_mensajes * 86400
+            banned_ids = []
+            failed = []
+
+            if guild.me.guild_permissions.manage_guild:
+                # bulk_ban agrupa hasta 200 usuarios por petición
+                for i in range(0, len(targets), BULK_BAN_CHUNK_SIZE):
+                    chunk = targets[i:i + BULK_BAN_CHUNK_SIZE]
+                    try:
+                        result = await self.mass_executor.submit(
+                            guild.bulk_ban, chunk, reason=reason, delete_message_seconds=delete_seconds
+                        )
+                        banned_ids.extend(user.id for user in result.banned)
+                        failed.extend(user.id for user in result.failed)
+                    except discord.HTTPException as e:
+                        logger.error(f"Bulk ban chunk failed in {guild.name}: {e}")
+                        failed.extend(target.id for target in chunk)
+            else:
+                results = await self.mass_executor.map(
+                    lambda target: guild.ban(target, reason=reason, delete_message_seconds=delete_seconds),
+                    targets
+                )
+                for target, _, error in results:
+                    if error:
+                        failed.append(target.id)
+                    else:
+                        banned_ids.append(target.id)
+
+            for user_id in banned_ids:
+                self.record_case(guild.id, user_id, interaction.user.id, 'ban', razon, mass=True)
+            # Los baneos permanentes anulan los desbaneos pendientes de /tempban
+            try:
+                await self.expiry_scheduler.cancel_many(guild.id, banned_ids, 'unban')
+            except Exception as e:
+                logger.error(f"Error cancelling pending unbans after mass ban: {e}")
+
+            banned = len(banned_ids)
+            elapsed = time.monotonic() - start
+            summary = self._mass_summary_embed("🔨 Baneo masivo completado", 0xff0000, banned, failed, dm_sent, elapsed)
+            summary.add_field(name="Razón", value=razon, inline=False)
+            await message.edit(embed=summary)
+
+            logger.info(
+                f"Mass ban: {banned} banned, {len(failed)} failed by {interaction.user} "
+                f"({interaction.user.id}) in {guild.name} in {elapsed:.1f}s - Reason: {razon}"
+            )
+
+        except Exception as e:
+            logger.error(f"Error in mass_ban: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error durante el baneo masivo.",
+                color=0xff0000
+            )
+            if not interaction.response.is_done():
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+            else:
+                await interaction.followup.send(embed=embed)
+
+    @app_commands.command(name="timeout-masivo", description="Silencia a varios usuarios a la vez según un selector (respuesta a raids)")
+    @app_commands.describe(
+        duracion="Duración en minutos (máximo 40320 = 28 días)",
+        razon="Razón del timeout",
+        unidos_hace_minutos="Usuarios que entraron en los últimos N minutos",
+        cuenta_menor_dias="Usuarios con cuentas de menos de N días",
+        patron_nombre="Expresión regular aplicada al nombre de usuario",
+        ids="Lista de IDs separados por espacios o comas",
+        enviar_dm="Enviar un DM a cada usuario (más lento)"
+    )
+    async def mass_timeout(
+        self,
+        interaction: discord.Interaction,
+        duracion: app_commands.Range[int, 1, 40320],
+        razon: Optional[str] = "Raid",
+        unidos_hace_minutos: Optional[app_commands.Range[int, 1, 10080]] = None,
+        cuenta_menor_dias: Optional[app_commands.Range[int, 1, 3650]] = None,
+        patron_nombre: Optional[str] = None,
+        ids: Optional[str] = None,
+        enviar_dm: Optional[bool] = False
+    ):
+        """Timeout every member matched by a raid selector"""
+        try:
+            config = await load_config()
+            if not has_moderation_permission(interaction.user, interaction.guild.id, config):
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="No tienes permisos para usar comandos de moderación.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            if not interaction.guild.me.guild_permissions.moderate_members:
+                embed = discord.Embed(
+                    title="❌ Sin permisos",
+                    description="No tengo permisos para silenciar usuarios.",
+                    color=0xff0000
+                )
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+                return
+
+            selection = await self._resolve_mass_selector(
+                interaction, unidos_hace_minutos, cuenta_menor_dias, patron_nombre, ids,
+                allow_uncached=False
+            )
+            if selection is None:
+                return
+            targets, skipped = selection
+
+            message = await self._confirm_mass_action(interaction, "Timeout masivo", targets, skipped)
+            if message is None:
+                return
+
+            start = time.monotonic()
+            until = discord.utils.utcnow() + timedelta(minutes=duracion)
+            reason = f"Timeout masivo por {interaction.user} - {razon}"
+
+            dm_sent = None
+            if enviar_dm:
+                dm_embed = discord.Embed(
+                    title="🔇 Has sido silenciado",
+                    description=f"Has sido silenciado en **{interaction.guild.name}**",
+                    color=0xff8000
+                )
+                dm_embed.add_field(name="Duración", value=f"{duracion} minutos", inline=True)
+                dm_embed.add_field(name="Razón", value=razon, inline=False)
+                results = await self.mass_executor.map(
+                    lambda member: self._send_sanction_dm(member, dm_embed),
+                    targets
+                )
+                dm_sent = sum(1 for _, delivered, _ in results if delivered)
+
+            results = await self.mass_executor.map(
+                lambda member: member.timeout(until, reason=reason),
+                targets
+            )
+            timed_out = sum(1 for _, _, error in results if error is None)
+            failed = [member.id for member, _, error in results if error is not None]
+
+            for member, _, error in results:
+                if error is None:
+                    self.record_case(
+                        interaction.guild.id, member.id, interaction.user.id, 'timeout', razon,
+                        minutes=duracion, mass=True
+                    )
+
+            elapsed = time.monotonic() - start
+            summary = self._mass_summary_embed("🔇 Timeout masivo completado", 0xff8000, timed_out, failed, dm_sent, elapsed)
+            summary.add_field(name="Finaliza", value=f"<t:{int(until.timestamp())}:f>", inline=True)
+            summary.add_field(name="Razón", value=razon, inline=False)
+            await message.edit(embed=summary)
+
+            logger.info(
+                f"Mass timeout: {timed_out} timed out, {len(failed)} failed by {interaction.user} "
+                f"({interaction.user.id}) in {interaction.guild.name} for {duracion} minutes "
+                f"in {elapsed:.1f}s - Reason: {razon}"
+            )
+
+        except Exception as e:
+            logger.error(f"Error in mass_timeout: {e}")
+            embed = discord.Embed(
+                title="❌ Error",
+                description="Ocurrió un error durante el timeout masivo.",
+                color=0xff0000
+            )
+            if not interaction.response.is_done():
+                await interaction.response.send_message(embed=embed, ephemeral=True)
+            else:
+                await interaction.followup.send(embed=embed)
+
+
 async def setup(bot):
     await bot.add_cog(Moderation(bot))
\ No newline at end of file
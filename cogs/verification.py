@@ -29,6 +29,11 @@ class Verification(commands.Cog):
         if not config:
             return
 
+        # Verificación bloqueada mientras el anti-raid esté activo
+        anti_raid = self.bot.get_cog('AntiRaid')
+        if anti_raid and anti_raid.verification_locked(payload.guild_id):
+            return
+
         guild = self.bot.get_guild(payload.guild_id)
         if not guild:
             return
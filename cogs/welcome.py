@@ -15,6 +15,11 @@ class Welcome(commands.Cog):
     async def on_member_join(self, member):
         """Send welcome message when a new member joins"""
         try:
+            # No saturar el canal de bienvenida durante un raid
+            anti_raid = self.bot.get_cog('AntiRaid')
+            if anti_raid and anti_raid.welcomes_paused(member.guild.id):
+                return
+
             config = load_config()
             # Fix: Use 'servers' instead of 'guilds' to match config.json structure
             guild_config = config.get('servers', {}).get(str(member.guild.id), {})
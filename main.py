@@ -10,6 +10,9 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from utils.case_store import CaseStore
+from utils.http import HTTPClient
+from models import init_db
 
 # Set up logging
 logging.basicConfig(
@@ -55,15 +58,29 @@ class DiscordBot(commands.Bot):
             intents=intents,
             help_command=None
         )
+        self.case_store = CaseStore()
+        # Cliente HTTP compartido por todos los cogs; 'http' ya lo usa discord.py
+        self.http_client = HTTPClient()
         
     async def setup_hook(self):
+        # Database first: every store binds to it, and importing models no longer touches it
+        await asyncio.to_thread(init_db)
+        # Start the moderation case writer and the shared HTTP client before cogs use them
+        self.case_store.start()
+        await self.http_client.start()
+
         # Load cogs
         await self.load_extension('cogs.tickets')
+        # Anti-raid se carga antes que verificación y bienvenida para ver cada entrada primero
+        await self.load_extension('cogs.anti_raid')
         await self.load_extension('cogs.verification')
         await self.load_extension('cogs.welcome')
         await self.load_extension('cogs.utility')
         await self.load_extension('cogs.fivem_status')
         await self.load_extension('cogs.moderation')
+        await self.load_extension('cogs.automod')
+        await self.load_extension('cogs.anti_spam')
+        await self.load_extension('cogs.audit_log')
         
         # Sync slash commands
         try:
@@ -163,6 +180,8 @@ class DiscordBot(commands.Bot):
     async def close(self):
         """Override close method to send notification before shutdown"""
         await self.send_shutdown_notification()
+        await self.case_store.close()
+        await self.http_client.close()
         await super().close()
     
     async def on_command_error(self, ctx, error):
@@ -1,14 +1,19 @@
 import os
-from sqlalchemy import create_engine, Column, Integer, BigInteger, String, Boolean, DateTime, Text
+from sqlalchemy import create_engine, event, inspect, text, Column, Index, Integer, BigInteger, String, Boolean, DateTime, Text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+from typing import Optional
 
 Base = declarative_base()
 
 class FiveMMonitor(Base):
     __tablename__ = 'fivem_monitors'
-    
+    __table_args__ = (
+        # Carga de todos los monitores activos al arrancar
+        Index('ix_fivem_monitors_active', 'is_active'),
+    )
+
     id = Column(Integer, primary_key=True)
     guild_id = Column(BigInteger, nullable=False, unique=True)
     channel_id = Column(BigInteger, nullable=False)
@@ -26,17 +31,131 @@ class ServerConfig(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-# Database setup
-DATABASE_URL = os.environ.get('DATABASE_URL')
-if DATABASE_URL:
-    engine = create_engine(DATABASE_URL)
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    
-    # Create tables
+class ModerationCase(Base):
+    __tablename__ = 'moderation_cases'
+    __table_args__ = (
+        # Historial por usuario con paginación por clave (id descendente)
+        Index('ix_moderation_cases_guild_user', 'guild_id', 'user_id', 'id'),
+        # Acciones de un moderador en un rango de tiempo
+        Index('ix_moderation_cases_guild_moderator', 'guild_id', 'moderator_id', 'created_at'),
+        # Deduplicación de entradas del registro de auditoría y punto de reanudación del backfill
+        Index('ix_moderation_cases_guild_audit', 'guild_id', 'audit_log_id', unique=True),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True)
+    guild_id = Column(BigInteger, nullable=False)
+    user_id = Column(BigInteger, nullable=True)  # None for channel-wide actions like purges
+    moderator_id = Column(BigInteger, nullable=True)
+    action = Column(String(32), nullable=False)
+    reason = Column(Text, nullable=True)
+    details = Column(Text, nullable=True)  # JSON string
+    audit_log_id = Column(BigInteger, nullable=True)  # Set for cases ingested from the audit log
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+class ScheduledAction(Base):
+    __tablename__ = 'scheduled_actions'
+    __table_args__ = (
+        Index('ix_scheduled_actions_target', 'guild_id', 'user_id', 'action'),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True)
+    guild_id = Column(BigInteger, nullable=False)
+    user_id = Column(BigInteger, nullable=False)
+    action = Column(String(32), nullable=False)  # 'unban' or 'remove_role'
+    role_id = Column(BigInteger, nullable=True)
+    reason = Column(Text, nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class BulkRoleJob(Base):
+    __tablename__ = 'bulk_role_jobs'
+
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True)
+    guild_id = Column(BigInteger, nullable=False)
+    role_id = Column(BigInteger, nullable=False)
+    action = Column(String(16), nullable=False)  # 'add' or 'remove'
+    moderator_id = Column(BigInteger, nullable=False)
+    channel_id = Column(BigInteger, nullable=True)  # Progress message location
+    message_id = Column(BigInteger, nullable=True)
+    member_ids = Column(Text, nullable=False)  # JSON list, processed in order
+    position = Column(Integer, default=0, nullable=False)  # Next index to process
+    succeeded = Column(Integer, default=0, nullable=False)
+    failed = Column(Integer, default=0, nullable=False)
+    status = Column(String(16), default='running', nullable=False, index=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class FiveMStatusTransition(Base):
+    __tablename__ = 'fivem_status_transitions'
+    __table_args__ = (
+        # Estado de un componente en una ventana de tiempo
+        Index('ix_fivem_status_transitions_component_time', 'component', 'changed_at'),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True)
+    component = Column(String(64), nullable=False)  # Statuspage component name
+    status = Column(String(32), nullable=False)  # 'operational', 'partial_outage', ...
+    changed_at = Column(DateTime, nullable=False, index=True)
+
+class PlayerCountBucket(Base):
+    __tablename__ = 'player_count_buckets'
+    __table_args__ = (
+        Index('ix_player_count_buckets_address_start', 'address', 'bucket_start', unique=True),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, 'sqlite'), primary_key=True)
+    address = Column(String(255), nullable=False)  # Dirección del FXServer tal como se configuró
+    bucket_start = Column(DateTime, nullable=False)  # Naive UTC, múltiplo del ancho del bucket
+    min_players = Column(Integer, nullable=False)
+    max_players = Column(Integer, nullable=False)
+    sum_players = Column(Integer, nullable=False)  # avg = sum_players / samples
+    samples = Column(Integer, nullable=False)
+
+# Database setup (SQLite by default, Postgres when DATABASE_URL is set).
+# Nothing connects on import: SessionLocal is bound by init_db() in setup_hook.
+engine = None
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL so batched writes don't block readers"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.close()
+
+# Columnas añadidas a tablas que ya existían: create_all no altera tablas
+ADDED_COLUMNS = (
+    ModerationCase.__table__.c.audit_log_id,
+)
+
+def _migrate(engine):
+    """Add missing columns and indexes to existing tables; every step is idempotent"""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for column in ADDED_COLUMNS:
+            table = column.table.name
+            if column.name not in {existing['name'] for existing in inspector.get_columns(table)}:
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {column.name} {column_type}'))
+    # Equivale a CREATE [UNIQUE] INDEX IF NOT EXISTS
+    for table in (FiveMMonitor.__table__, ModerationCase.__table__):
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def init_db(database_url: Optional[str] = None):
+    """Create the engine, bind SessionLocal and create missing tables and indexes; safe to call twice"""
+    global engine
+    if engine is not None:
+        return engine
+    engine = create_engine(database_url or os.environ.get('DATABASE_URL', 'sqlite:///bot.db'))
+    if engine.dialect.name == 'sqlite':
+        event.listen(engine, 'connect', _set_sqlite_pragmas)
+    SessionLocal.configure(bind=engine)
+
     Base.metadata.create_all(bind=engine)
-else:
-    engine = None
-    SessionLocal = None
+    _migrate(engine)
+    return engine
 
 def get_db():
     """Get database session"""
@@ -0,0 +1,167 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+# Invitaciones de Discord (con o sin esquema) y enlaces http(s)
+URL_PATTERN = (
+    r'(?P<invite>(?:https?://)?(?:www\.)?(?:discord(?:app)?\.com/invite|discord\.gg)/[\w-]+)'
+    r'|https?://(?P<host>[^\s/:?#<>]+)'
+)
+
+class AutomodMatch(NamedTuple):
+    kind: str   # 'word', 'pattern', 'domain' or 'invite'
+    value: str  # Regla que coincidió
+
+class AhoCorasick:
+    """Multi-word literal matcher built once from a word list.
+
+    Matching walks the text a single time regardless of how many words there
+    are. Matches must sit on word boundaries so 'class' doesn't trip on 'ass'.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[str]] = [[]]
+
+        for word in words:
+            word = word.casefold()
+            if not word:
+                continue
+            state = 0
+            for char in word:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(word)
+
+        # Enlaces de fallo en anchura; cada estado hereda las salidas de su fallo
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def __bool__(self) -> bool:
+        return len(self.goto) > 1
+
+    def search(self, text: str) -> Optional[str]:
+        """Return the first word found on word boundaries in already casefolded text"""
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        length = len(text)
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                after = index + 1
+                if after < length and text[after].isalnum():
+                    continue
+                for word in output[state]:
+                    start = after - len(word)
+                    if start == 0 or not text[start - 1].isalnum():
+                        return word
+        return None
+
+class CompiledRules:
+    """A guild's automod rules compiled into a single matcher.
+
+    Literal words go into one Aho-Corasick automaton. Custom patterns and link
+    detection share one alternation regex, with domains checked against a set
+    (including parent domains), so a message costs two linear scans no matter
+    how many rules exist.
+    """
+
+    def __init__(
+        self,
+        words: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+        blocked_domains: Iterable[str] = (),
+        block_invites: bool = False
+    ):
+        self.words = AhoCorasick(words)
+        self.patterns = list(patterns)
+        self.blocked_domains = frozenset(domain.casefold().strip('.') for domain in blocked_domains if domain)
+        self.block_invites = block_invites
+
+        # Grupos sin captura: los grupos con nombre por patrón triplican el coste del escaneo.
+        # El patrón concreto solo se identifica cuando hay coincidencia.
+        self.compiled_patterns = [re.compile(pattern, re.IGNORECASE) for pattern in self.patterns]
+        alternatives = []
+        if self.blocked_domains or self.block_invites:
+            alternatives.append(URL_PATTERN)
+        alternatives.extend(f'(?:{pattern})' for pattern in self.patterns)
+        self.regex = re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+
+    def _domain_blocked(self, host: str) -> Optional[str]:
+        host = host.casefold().rstrip('.')
+        # Comprobar el dominio y sus padres: a.b.example.com -> b.example.com -> example.com
+        while host:
+            if host in self.blocked_domains:
+                return host
+            _, _, host = host.partition('.')
+        return None
+
+    def scan(self, content: str) -> Optional[AutomodMatch]:
+        """Return the first rule the message content breaks, if any"""
+        if self.words:
+            word = self.words.search(content.casefold())
+            if word:
+                return AutomodMatch('word', word)
+
+        if self.regex:
+            for match in self.regex.finditer(content):
+                group = match.lastgroup
+                if group == 'invite':
+                    if self.block_invites:
+                        return AutomodMatch('invite', match.group('invite'))
+                elif group == 'host':
+                    domain = self._domain_blocked(match.group('host'))
+                    if domain:
+                        return AutomodMatch('domain', domain)
+                elif group is None:
+                    return AutomodMatch('pattern', self._identify_pattern(content, match))
+        return None
+
+    def _identify_pattern(self, content: str, match: re.Match) -> str:
+        """Find which pattern produced a combined match (leftmost branch wins)"""
+        for pattern, compiled in zip(self.patterns, self.compiled_patterns):
+            candidate = compiled.match(content, match.start())
+            if candidate and candidate.end() == match.end():
+                return pattern
+        return match.group(0)
+
+def validate_pattern(pattern: str) -> Optional[str]:
+    """Return an error message if a pattern can't be safely combined with the others"""
+    if len(pattern) > 200:
+        return "El patrón no puede superar los 200 caracteres."
+    if '(?P<' in pattern or '(?P=' in pattern:
+        return "Los patrones no pueden usar grupos con nombre."
+    if re.search(r'\\\d', pattern):
+        return "Los patrones no pueden usar referencias a grupos."
+    try:
+        compiled = re.compile(pattern)
+    except re.error as e:
+        return f"Expresión regular inválida: {e}"
+    if compiled.match(''):
+        return "El patrón no puede coincidir con un texto vacío."
+    try:
+        # Los flags globales como (?i) no se pueden combinar en medio de una alternancia
+        re.compile(f'x|(?:{pattern})')
+    except re.error as e:
+        return f"El patrón no se puede combinar: {e}"
+    return None
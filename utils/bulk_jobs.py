@@ -0,0 +1,94 @@
+import asyncio
+import json
+import logging
+from typing import List, Optional
+
+from sqlalchemy import select, update
+
+from models import BulkRoleJob, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+class BulkRoleJobStore:
+    """Persist bulk role jobs and their progress so they survive restarts"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    @staticmethod
+    def _to_dict(job: BulkRoleJob) -> dict:
+        return {
+            'id': job.id,
+            'guild_id': job.guild_id,
+            'role_id': job.role_id,
+            'action': job.action,
+            'moderator_id': job.moderator_id,
+            'channel_id': job.channel_id,
+            'message_id': job.message_id,
+            'member_ids': json.loads(job.member_ids),
+            'position': job.position,
+            'succeeded': job.succeeded,
+            'failed': job.failed,
+            'status': job.status
+        }
+
+    def _create(self, job: dict) -> int:
+        with self.session_factory() as session:
+            row = BulkRoleJob(
+                guild_id=job['guild_id'],
+                role_id=job['role_id'],
+                action=job['action'],
+                moderator_id=job['moderator_id'],
+                channel_id=job.get('channel_id'),
+                member_ids=json.dumps(job['member_ids'])
+            )
+            session.add(row)
+            session.commit()
+            return row.id
+
+    def _update(self, job_id: int, values: dict):
+        with self.session_factory() as session:
+            session.execute(update(BulkRoleJob).where(BulkRoleJob.id == job_id).values(**values))
+            session.commit()
+
+    def _load(self, stmt) -> List[dict]:
+        with self.session_factory() as session:
+            return [self._to_dict(job) for job in session.scalars(stmt)]
+
+    async def create(self, guild_id: int, role_id: int, action: str, moderator_id: int,
+                     member_ids: List[int], channel_id: Optional[int] = None) -> dict:
+        job = {
+            'guild_id': guild_id,
+            'role_id': role_id,
+            'action': action,
+            'moderator_id': moderator_id,
+            'channel_id': channel_id,
+            'message_id': None,
+            'member_ids': member_ids,
+            'position': 0,
+            'succeeded': 0,
+            'failed': 0,
+            'status': 'running'
+        }
+        job['id'] = await asyncio.to_thread(self._create, job)
+        return job
+
+    async def save_progress(self, job: dict):
+        """Store the job's cursor and counters"""
+        await asyncio.to_thread(self._update, job['id'], {
+            'position': job['position'],
+            'succeeded': job['succeeded'],
+            'failed': job['failed'],
+            'status': job['status'],
+            'message_id': job['message_id']
+        })
+
+    async def load_running(self) -> List[dict]:
+        return await asyncio.to_thread(
+            self._load,
+            select(BulkRoleJob).where(BulkRoleJob.status == 'running').order_by(BulkRoleJob.id)
+        )
+
+    async def get(self, job_id: int) -> Optional[dict]:
+        jobs = await asyncio.to_thread(self._load, select(BulkRoleJob).where(BulkRoleJob.id == job_id))
+        return jobs[0] if jobs else None
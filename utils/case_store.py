@@ -0,0 +1,142 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, insert, select, and_, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import ModerationCase, SessionLocal
+from utils.database import BatchWriter
+
+logger = logging.getLogger(__name__)
+
+class CaseStore:
+    """Persistent moderation case log backed by the moderation_cases table.
+
+    Writes are queued and inserted in batches by a BatchWriter; reads use keyset
+    pagination over the (guild, user) and (guild, moderator, time) indexes so a
+    page costs the same no matter how many cases exist. Cases ingested from the
+    audit log carry their entry ID, which is unique per guild, so replays from
+    the backfill are dropped on insert.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.writer = BatchWriter(self._insert_cases, name="moderation-cases")
+
+    def start(self):
+        self.writer.start()
+
+    async def close(self):
+        await self.writer.close()
+
+    def record(
+        self,
+        guild_id: int,
+        user_id: Optional[int],
+        moderator_id: Optional[int],
+        action: str,
+        reason: Optional[str] = None,
+        audit_log_id: Optional[int] = None,
+        created_at: Optional[datetime] = None,
+        **details
+    ) -> bool:
+        """Queue a moderation case for writing without blocking the caller"""
+        return self.writer.submit({
+            'guild_id': guild_id,
+            'user_id': user_id,
+            'moderator_id': moderator_id,
+            'action': action,
+            'reason': reason,
+            'details': json.dumps(details) if details else None,
+            'audit_log_id': audit_log_id,
+            'created_at': created_at or datetime.utcnow()
+        })
+
+    def _insert_cases(self, rows: List[dict]):
+        with self.session_factory() as session:
+            dialect = session.get_bind().dialect.name
+            if dialect in ('sqlite', 'postgresql'):
+                dialect_insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+                stmt = dialect_insert(ModerationCase).on_conflict_do_nothing(
+                    index_elements=['guild_id', 'audit_log_id']
+                )
+            else:
+                stmt = insert(ModerationCase)
+            session.execute(stmt, rows)
+            session.commit()
+
+    @staticmethod
+    def _to_dict(case: ModerationCase) -> dict:
+        return {
+            'id': case.id,
+            'guild_id': case.guild_id,
+            'user_id': case.user_id,
+            'moderator_id': case.moderator_id,
+            'action': case.action,
+            'reason': case.reason,
+            'details': json.loads(case.details) if case.details else {},
+            'audit_log_id': case.audit_log_id,
+            'created_at': case.created_at
+        }
+
+    def _rows(self, stmt) -> list:
+        with self.session_factory() as session:
+            return session.execute(stmt).all()
+
+    async def get_last_audit_log_ids(self) -> Dict[int, int]:
+        """Get the newest audit log entry ID stored for each guild"""
+        stmt = select(ModerationCase.guild_id, func.max(ModerationCase.audit_log_id)).where(
+            ModerationCase.audit_log_id.is_not(None)
+        ).group_by(ModerationCase.guild_id)
+        return dict(await asyncio.to_thread(self._rows, stmt))
+
+    def _query(self, stmt) -> List[dict]:
+        with self.session_factory() as session:
+            return [self._to_dict(case) for case in session.scalars(stmt)]
+
+    async def get_user_cases(
+        self,
+        guild_id: int,
+        user_id: int,
+        before_id: Optional[int] = None,
+        limit: int = 10,
+        moderator_id: Optional[int] = None
+    ) -> List[dict]:
+        """Get a user's cases, newest first, starting after the given case ID"""
+        stmt = select(ModerationCase).where(
+            ModerationCase.guild_id == guild_id,
+            ModerationCase.user_id == user_id
+        )
+        if moderator_id is not None:
+            stmt = stmt.where(ModerationCase.moderator_id == moderator_id)
+        if before_id is not None:
+            stmt = stmt.where(ModerationCase.id < before_id)
+        stmt = stmt.order_by(ModerationCase.id.desc()).limit(limit)
+        return await asyncio.to_thread(self._query, stmt)
+
+    async def get_moderator_cases(
+        self,
+        guild_id: int,
+        moderator_id: int,
+        before: Optional[dict] = None,
+        limit: int = 10
+    ) -> List[dict]:
+        """Get the cases a moderator opened, newest first, starting after the given case"""
+        stmt = select(ModerationCase).where(
+            ModerationCase.guild_id == guild_id,
+            ModerationCase.moderator_id == moderator_id
+        )
+        if before is not None:
+            stmt = stmt.where(or_(
+                ModerationCase.created_at < before['created_at'],
+                and_(
+                    ModerationCase.created_at == before['created_at'],
+                    ModerationCase.id < before['id']
+                )
+            ))
+        stmt = stmt.order_by(ModerationCase.created_at.desc(), ModerationCase.id.desc()).limit(limit)
+        return await asyncio.to_thread(self._query, stmt)
@@ -0,0 +1,316 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class RateLimitedExecutor:
+    """Run coroutines with bounded concurrency and a minimum spacing between starts.
+
+    discord.py already retries 429s per route, but firing hundreds of requests at
+    once still burns through the bucket and stalls every other call on that route.
+    Pacing the starts keeps us under the limit instead of bouncing off it.
+    """
+
+    def __init__(self, max_concurrency: int = 5, min_interval: float = 0.0):
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_interval = max(0.0, min_interval)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._pace_lock = asyncio.Lock()
+        self._next_start = 0.0
+
+    async def _pace(self):
+        """Wait until the next start slot is free"""
+        if not self.min_interval:
+            return
+        async with self._pace_lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            delay = self._next_start - now
+            if delay > 0:
+                await asyncio.sleep(delay)
+                now = loop.time()
+            self._next_start = now + self.min_interval
+
+    async def submit(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Run a single coroutine function under the concurrency and pacing limits"""
+        async with self._semaphore:
+            await self._pace()
+            return await func(*args, **kwargs)
+
+    async def map(
+        self,
+        func: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any]
+    ) -> List[Tuple[Any, Any, Optional[BaseException]]]:
+        """Apply func to every item and return (item, result, error) in input order.
+
+        Uses a fixed pool of workers pulling from the iterable, so the number of
+        live tasks stays at max_concurrency no matter how many items there are.
+        """
+        items = list(items)
+        results: List[Optional[Tuple[Any, Any, Optional[BaseException]]]] = [None] * len(items)
+        iterator = iter(enumerate(items))
+
+        async def worker():
+            for index, item in iterator:
+                try:
+                    result = await self.submit(func, item)
+                    results[index] = (item, result, None)
+                except Exception as e:
+                    results[index] = (item, None, e)
+
+        workers = min(self.max_concurrency, len(items))
+        if workers:
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into a single in-flight call.
+
+    The first caller for a key starts the call; everyone who arrives before it
+    finishes awaits the same future and gets the same result (or exception).
+    A caller being cancelled doesn't cancel the shared call for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func(*args, **kwargs))
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # Evitar el aviso de excepción no recuperada si todos los llamantes se cancelaron
+        if not future.cancelled():
+            future.exception()
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker for an unreliable upstream.
+
+    After failure_threshold consecutive failures the circuit opens and calls
+    are refused without touching the upstream. Once the open period is over a
+    single probe is let through (half-open): success closes the circuit, failure
+    reopens it for backoff_factor times longer, up to max_reset_timeout.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        reset_timeout: float = 30.0,
+        max_reset_timeout: float = 600.0,
+        backoff_factor: float = 2.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max(reset_timeout, max_reset_timeout)
+        self.backoff_factor = backoff_factor
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0                     # Fallos consecutivos
+        self.open_timeout = reset_timeout     # Duración de la próxima apertura
+        self.open_until = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Whether a call may go upstream now; in half-open only one probe at a time"""
+        if self.state == self.OPEN:
+            if self.clock() < self.open_until:
+                return False
+            self.state = self.HALF_OPEN
+            logger.info(f"Circuit {self.name} half-open, probing upstream")
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit {self.name} closed after {self.failures} failures")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.open_timeout = self.reset_timeout
+        self._probing = False
+
+    def release(self):
+        """End a call allowed by allow() without an outcome (e.g. cancelled), so the next call may probe again"""
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            # La prueba falló: volver a abrir con retroceso exponencial
+            self.open_timeout = min(self.open_timeout * self.backoff_factor, self.max_reset_timeout)
+            self._open()
+        elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self._probing = False
+        self.open_until = self.clock() + self.open_timeout
+        logger.warning(f"Circuit {self.name} open for {self.open_timeout:.0f}s after {self.failures} failures")
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed; 0 unless open"""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.open_until - self.clock())
+
+# Resultado de un trabajo reemplazado por uno más nuevo antes de ejecutarse
+SUPERSEDED = object()
+
+def default_retry_after(error: BaseException) -> Optional[float]:
+    """Seconds to wait before retrying a rate-limited call (HTTP 429), or None if it wasn't one"""
+    if getattr(error, 'status', None) != 429:
+        return None
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after is None:
+        headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+        retry_after = headers.get('Retry-After')
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return 1.0
+
+class _FanoutJob:
+    __slots__ = ('func', 'tag', 'future', 'attempts')
+
+    def __init__(self, func: Callable[[], Awaitable[Any]], tag: Optional[Hashable], future: asyncio.Future):
+        self.func = func
+        self.tag = tag
+        self.future = future
+        self.attempts = 0
+
+class _FanoutKey:
+    __slots__ = ('jobs', 'worker', 'blocked_until')
+
+    def __init__(self):
+        self.jobs: Deque[_FanoutJob] = deque()
+        self.worker: Optional[asyncio.Task] = None
+        self.blocked_until = 0.0
+
+class FanoutDispatcher:
+    """Run jobs for many keys (e.g. channels) concurrently under one global limit.
+
+    Jobs for the same key run in order with at least min_interval between them,
+    and a rate-limited job (429) blocks only its own key for Retry-After seconds.
+    Submitting a job with a tag drops any not-yet-started job with the same tag
+    on that key, resolving its future to SUPERSEDED, so a slow channel never
+    works through stale updates.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 10,
+        min_interval: float = 1.0,
+        max_retries: int = 3,
+        retry_after: Callable[[BaseException], Optional[float]] = default_retry_after
+    ):
+        self.min_interval = max(0.0, min_interval)
+        self.max_retries = max_retries
+        self.retry_after = retry_after
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._keys: Dict[Hashable, _FanoutKey] = {}
+
+    def submit(self, key: Hashable, func: Callable[[], Awaitable[Any]], tag: Optional[Hashable] = None) -> asyncio.Future:
+        """Queue a job for a key and return a future with its result"""
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = _FanoutKey()
+
+        if tag is not None and state.jobs:
+            kept = deque()
+            for job in state.jobs:
+                if job.tag == tag:
+                    if not job.future.done():
+                        job.future.set_result(SUPERSEDED)
+                else:
+                    kept.append(job)
+            state.jobs = kept
+
+        job = _FanoutJob(func, tag, asyncio.get_running_loop().create_future())
+        state.jobs.append(job)
+        if state.worker is None:
+            state.worker = asyncio.create_task(self._drain(key, state))
+        return job.future
+
+    def blocked_for(self, key: Hashable) -> float:
+        """Seconds until a key may run its next job"""
+        state = self._keys.get(key)
+        if state is None:
+            return 0.0
+        return max(0.0, state.blocked_until - asyncio.get_running_loop().time())
+
+    async def _drain(self, key: Hashable, state: _FanoutKey):
+        loop = asyncio.get_running_loop()
+        try:
+            while state.jobs:
+                # Esperar fuera del semáforo: un canal limitado no ocupa un hueco global
+                delay = state.blocked_until - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    continue
+
+                job = state.jobs.popleft()
+                if job.future.done():
+                    continue  # El llamante ya lo canceló: no hay a quién entregar el resultado
+                async with self._semaphore:
+                    state.blocked_until = loop.time() + self.min_interval
+                    try:
+                        result = await job.func()
+                    except asyncio.CancelledError:
+                        job.future.cancel()
+                        raise
+                    except Exception as e:
+                        wait = self.retry_after(e)
+                        if wait is None or job.attempts >= self.max_retries:
+                            if not job.future.done():
+                                job.future.set_exception(e)
+                            continue
+                        job.attempts += 1
+                        state.blocked_until = loop.time() + wait
+                        logger.warning(f"Fan-out key {key} rate limited, retrying in {wait:.1f}s")
+                        if job.tag is not None and any(pending.tag == job.tag for pending in state.jobs):
+                            if not job.future.done():
+                                job.future.set_result(SUPERSEDED)
+                        else:
+                            state.jobs.appendleft(job)
+                        continue
+                    if not job.future.done():
+                        job.future.set_result(result)
+        finally:
+            state.worker = None
+            for job in state.jobs:
+                if not job.future.done():
+                    job.future.cancel()
+            state.jobs.clear()
+            if state.blocked_until <= loop.time() and self._keys.get(key) is state:
+                del self._keys[key]
+
+    async def close(self):
+        """Cancel all queued and running jobs"""
+        workers = [state.worker for state in self._keys.values() if state.worker]
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._keys.clear()
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class BatchWriter:
+    """Buffer rows in memory and write them to the database in batches.
+
+    Command handlers call submit() without awaiting any I/O. A single background
+    task groups pending rows (up to batch_size, or whatever arrived within
+    flush_interval) and hands them to flush_func in a worker thread, so the
+    blocking database driver never runs on the event loop.
+    """
+
+    def __init__(
+        self,
+        flush_func: Callable[[List[dict]], None],
+        name: str,
+        batch_size: int = 200,
+        flush_interval: float = 0.5,
+        max_pending: int = 10000
+    ):
+        self.flush_func = flush_func
+        self.name = name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the background writer task"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"batch-writer-{self.name}")
+
+    def submit(self, row: dict) -> bool:
+        """Queue a row for writing, returning False if the buffer is full"""
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except asyncio.QueueFull:
+            logger.warning(f"{self.name} writer buffer full, dropping row")
+            return False
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self._queue.get()
+            if item is _STOP:
+                return
+
+            batch = [item]
+            stop = False
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        item = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+
+            await self._write(batch)
+            if stop:
+                return
+
+    async def _write(self, batch: List[dict]):
+        try:
+            await asyncio.to_thread(self.flush_func, batch)
+            logger.debug(f"{self.name} writer flushed {len(batch)} rows")
+        except Exception as e:
+            logger.error(f"{self.name} writer failed to flush {len(batch)} rows: {e}")
+
+    async def close(self):
+        """Flush everything still pending and stop the writer"""
+        if self._task is None or self._task.done():
+            # Nothing is consuming the queue, write what's left directly
+            pending = []
+            while not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is not _STOP:
+                    pending.append(item)
+            if pending:
+                await self._write(pending)
+            return
+        await self._queue.put(_STOP)
+        await self._task
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import aiohttp
+
+from utils.concurrency import RateLimitedExecutor
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVER_TIMEOUT = 5.0   # Segundos por servidor (las tres consultas van en paralelo)
+SERVER_ENDPOINTS = ('info.json', 'players.json', 'dynamic.json')
+COLOR_CODE_PATTERN = re.compile(r'\^\d')
+
+class GameServer(NamedTuple):
+    name: str
+    address: str                    # 'ip:puerto' o URL base
+    timeout: float = DEFAULT_SERVER_TIMEOUT
+
+class ServerStatus(NamedTuple):
+    address: str
+    online: bool
+    players: Optional[int] = None
+    max_players: Optional[int] = None
+    hostname: Optional[str] = None
+    version: Optional[str] = None
+    resources: Optional[int] = None
+    latency: Optional[float] = None  # Milisegundos hasta la respuesta más lenta
+    error: Optional[str] = None
+
+def server_base_url(address: str) -> str:
+    """Normalise 'ip:port' or a URL into the base URL the FXServer endpoints hang from"""
+    address = address.strip().rstrip('/')
+    if not address.startswith(('http://', 'https://')):
+        address = f"http://{address}"
+    return address
+
+def strip_color_codes(text: str) -> str:
+    """Remove FiveM ^0-^9 colour codes from a hostname"""
+    return COLOR_CODE_PATTERN.sub('', text).strip()
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def parse_server(address: str, info, players, dynamic, latency: Optional[float] = None) -> ServerStatus:
+    """Combine whichever of info.json, players.json and dynamic.json answered into one status.
+
+    dynamic.json is the cheap source for counts; servers with sv_requestParanoia
+    may block it, so players.json and info.json vars fill in the gaps.
+    """
+    info = info if isinstance(info, dict) else None
+    dynamic = dynamic if isinstance(dynamic, dict) else None
+    players = players if isinstance(players, list) else None
+    if info is None and dynamic is None and players is None:
+        return ServerStatus(address, False, latency=latency, error="Sin respuesta")
+
+    server_vars = (info or {}).get('vars') or {}
+    count = _to_int((dynamic or {}).get('clients'))
+    if count is None and players is not None:
+        count = len(players)
+    max_players = _to_int((dynamic or {}).get('sv_maxclients')) or _to_int(server_vars.get('sv_maxClients'))
+    hostname = (
+        server_vars.get('sv_projectName')
+        or (dynamic or {}).get('hostname')
+        or server_vars.get('sv_hostname')
+    )
+    resources = (info or {}).get('resources')
+    return ServerStatus(
+        address,
+        True,
+        players=count,
+        max_players=max_players,
+        hostname=strip_color_codes(hostname) if hostname else None,
+        version=(info or {}).get('server'),
+        resources=len(resources) if isinstance(resources, list) else None,
+        latency=latency
+    )
+
+async def _get_json(http_client, url: str, timeout: aiohttp.ClientTimeout):
+    async with http_client.get(url, timeout=timeout) as response:
+        if response.status != 200:
+            raise aiohttp.ClientResponseError(
+                response.request_info, response.history, status=response.status, message=response.reason or ''
+            )
+        # FXServer no siempre envía application/json
+        return await response.json(content_type=None)
+
+async def fetch_server(http_client, address: str, timeout: float = DEFAULT_SERVER_TIMEOUT) -> ServerStatus:
+    """Query the three endpoints of one FXServer concurrently, bounded by its own timeout"""
+    base = server_base_url(address)
+    client_timeout = aiohttp.ClientTimeout(total=timeout, connect=min(timeout, 3))
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_get_json(http_client, f"{base}/{endpoint}", client_timeout) for endpoint in SERVER_ENDPOINTS),
+        return_exceptions=True
+    )
+    latency = (time.perf_counter() - start) * 1000
+    info, players, dynamic = (None if isinstance(result, BaseException) else result for result in results)
+    status = parse_server(address, info, players, dynamic, latency)
+    if not status.online:
+        error = next(result for result in results if isinstance(result, BaseException))
+        if isinstance(error, asyncio.TimeoutError):
+            reason = "Tiempo de espera agotado"
+        elif isinstance(error, aiohttp.ClientResponseError):
+            reason = f"HTTP {error.status}"
+        else:
+            reason = "Sin conexión"
+        logger.debug(f"FXServer {address} unreachable: {error!r}")
+        status = status._replace(error=reason)
+    return status
+
+async def poll_servers(http_client, servers: Iterable[GameServer], max_concurrency: int = 20) -> Dict[str, ServerStatus]:
+    """Poll every distinct address once, at most max_concurrency servers at a time"""
+    unique: Dict[str, GameServer] = {}
+    for server in servers:
+        known = unique.get(server.address)
+        # Si varios servidores de Discord configuran la misma dirección, manda el timeout mayor
+        if known is None or server.timeout > known.timeout:
+            unique[server.address] = server
+
+    executor = RateLimitedExecutor(max_concurrency)
+    results = await executor.map(
+        lambda server: fetch_server(http_client, server.address, server.timeout),
+        unique.values()
+    )
+    statuses = {}
+    for server, status, error in results:
+        if error is not None:
+            logger.error(f"Error polling FXServer {server.address}: {error}")
+            status = ServerStatus(server.address, False, error="Error interno")
+        statuses[server.address] = status
+    return statuses
+
+def format_server_line(server: GameServer, status: Optional[ServerStatus]) -> str:
+    """One panel line per server, e.g. '🟢 **Neon Vice**: 45/128 jugadores'"""
+    if status is None:
+        return f"⏳ **{server.name}**: Consultando..."
+    if not status.online:
+        return f"🔴 **{server.name}**: Fuera de línea ({status.error})"
+    if status.players is None:
+        return f"🟢 **{server.name}**: En línea"
+    capacity = f"/{status.max_players}" if status.max_players else ""
+    icon = "🟠" if status.max_players and status.players >= status.max_players else "🟢"
+    return f"{icon} **{server.name}**: {status.players}{capacity} jugadores"
+
+def chunk_lines(lines: List[str], limit: int = 1024) -> List[str]:
+    """Join lines into blocks that fit an embed field value"""
+    chunks = []
+    current = ""
+    for line in lines:
+        line = line[:limit]
+        if current and len(current) + 1 + len(line) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+    return chunks
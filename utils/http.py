@@ -0,0 +1,88 @@
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional, Union
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10, connect=5, sock_read=8)
+USER_AGENT = "NeonViceBot (+https://discord.com)"
+
+class HTTPClient:
+    """Bot-wide pooled HTTP client for outbound requests.
+
+    One ClientSession and connector live for the whole bot, so repeated polls
+    reuse warm keep-alive connections and cached DNS instead of paying the
+    resolve/TCP/TLS handshakes on every request.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        dns_ttl: int = 300,
+        keepalive_timeout: float = 60.0,
+        timeout: aiohttp.ClientTimeout = DEFAULT_TIMEOUT
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def start(self):
+        """Create the session; must run inside the event loop (setup_hook)"""
+        if self._session and not self._session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            ttl_dns_cache=self.dns_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+            enable_cleanup_closed=True
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self.timeout,
+            headers={'User-Agent': USER_AGENT}
+        )
+        logger.info("HTTP client started")
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            raise RuntimeError("HTTPClient.start() has not been called")
+        return self._session
+
+    def get(self, url: str, timeout: Union[float, aiohttp.ClientTimeout, None] = None, **kwargs):
+        """Start a GET request; use as 'async with client.get(url) as response'"""
+        if isinstance(timeout, aiohttp.ClientTimeout):
+            kwargs['timeout'] = timeout
+        elif timeout is not None:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        return self.session.get(url, **kwargs)
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+            logger.info("HTTP client closed")
+        self._session = None
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds from now"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
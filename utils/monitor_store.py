@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import FiveMMonitor, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Claves que guardaba config.json antes de usar la tabla fivem_monitors
+LEGACY_CONFIG_KEYS = ('fivem_status_channel_id', 'fivem_status_message_id', 'fivem_monitor_active')
+
+class MonitorRecord(NamedTuple):
+    guild_id: int
+    channel_id: int
+    message_id: Optional[int]
+
+class MonitorStore:
+    """FiveM status panels in the fivem_monitors table, one row per guild.
+
+    Every change is a single-row upsert on the unique guild_id, so recreating
+    one guild's panel never touches anything else. Calls run in a worker
+    thread to keep the blocking driver off the event loop.
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    def _upsert(self, rows: List[dict]):
+        now = datetime.utcnow()
+        for row in rows:
+            row.setdefault('is_active', True)
+            row['updated_at'] = now
+        with self.session_factory() as session:
+            dialect = session.get_bind().dialect.name
+            if dialect in ('sqlite', 'postgresql'):
+                dialect_insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+                stmt = dialect_insert(FiveMMonitor)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=['guild_id'],
+                    set_={
+                        'channel_id': stmt.excluded.channel_id,
+                        'message_id': stmt.excluded.message_id,
+                        'is_active': stmt.excluded.is_active,
+                        'updated_at': stmt.excluded.updated_at
+                    }
+                )
+                session.execute(stmt, rows)
+            else:
+                existing = set(session.scalars(
+                    select(FiveMMonitor.guild_id).where(FiveMMonitor.guild_id.in_([row['guild_id'] for row in rows]))
+                ))
+                for row in rows:
+                    if row['guild_id'] in existing:
+                        session.execute(update(FiveMMonitor).where(FiveMMonitor.guild_id == row['guild_id']).values(**row))
+                    else:
+                        session.add(FiveMMonitor(**row))
+            session.commit()
+
+    def _load_active(self) -> List[MonitorRecord]:
+        with self.session_factory() as session:
+            rows = session.execute(
+                select(FiveMMonitor.guild_id, FiveMMonitor.channel_id, FiveMMonitor.message_id).where(
+                    FiveMMonitor.is_active.is_(True)
+                )
+            ).all()
+            return [MonitorRecord(*row) for row in rows]
+
+    def _deactivate(self, guild_ids: List[int]):
+        with self.session_factory() as session:
+            session.execute(
+                update(FiveMMonitor).where(FiveMMonitor.guild_id.in_(guild_ids)).values(
+                    is_active=False, message_id=None, updated_at=datetime.utcnow()
+                )
+            )
+            session.commit()
+
+    def _insert_missing(self, rows: List[dict]) -> int:
+        with self.session_factory() as session:
+            existing = set(session.scalars(
+                select(FiveMMonitor.guild_id).where(FiveMMonitor.guild_id.in_([row['guild_id'] for row in rows]))
+            ))
+            missing = [row for row in rows if row['guild_id'] not in existing]
+            session.add_all(FiveMMonitor(**row) for row in missing)
+            session.commit()
+            return len(missing)
+
+    async def load_active(self) -> List[MonitorRecord]:
+        """Every active monitor, in one query"""
+        return await asyncio.to_thread(self._load_active)
+
+    async def save(self, guild_id: int, channel_id: int, message_id: Optional[int] = None) -> bool:
+        """Create or update a guild's active monitor"""
+        return await self.save_many({guild_id: (channel_id, message_id)})
+
+    async def save_many(self, monitors: Dict[int, tuple]) -> bool:
+        """Upsert several {guild_id: (channel_id, message_id)} monitors in one transaction"""
+        if not monitors:
+            return True
+        rows = [
+            {'guild_id': guild_id, 'channel_id': channel_id, 'message_id': message_id}
+            for guild_id, (channel_id, message_id) in monitors.items()
+        ]
+        try:
+            await asyncio.to_thread(self._upsert, rows)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving FiveM monitors {list(monitors)}: {e}")
+            return False
+
+    async def deactivate(self, *guild_ids: int) -> bool:
+        """Disable monitors, keeping their rows (and channel) for reference"""
+        if not guild_ids:
+            return True
+        try:
+            await asyncio.to_thread(self._deactivate, list(guild_ids))
+            return True
+        except Exception as e:
+            logger.error(f"Error disabling FiveM monitors {list(guild_ids)}: {e}")
+            return False
+
+    async def migrate_from_config(self, config: dict) -> Optional[dict]:
+        """Move monitors out of config.json into the table.
+
+        Returns the config with the legacy keys removed (for the caller to
+        save), or None if there was nothing to migrate. Rows already in the
+        table win over config.json, so running it twice is harmless.
+        """
+        rows = []
+        migrated = False
+        for guild_id_str, server_config in config.get('servers', {}).items():
+            if not any(key in server_config for key in LEGACY_CONFIG_KEYS):
+                continue
+            migrated = True
+            channel_id = server_config.get('fivem_status_channel_id')
+            if channel_id:
+                rows.append({
+                    'guild_id': int(guild_id_str),
+                    'channel_id': channel_id,
+                    'message_id': server_config.get('fivem_status_message_id'),
+                    'is_active': bool(server_config.get('fivem_monitor_active', False))
+                })
+            for key in LEGACY_CONFIG_KEYS:
+                server_config.pop(key, None)
+
+        if not migrated:
+            return None
+        inserted = await asyncio.to_thread(self._insert_missing, rows) if rows else 0
+        logger.info(f"Migrated {inserted} FiveM monitors from config.json to the database")
+        return config
@@ -0,0 +1,41 @@
+import importlib.util
+import io
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+
+# matplotlib es opcional (pip install .[charts]); sin él /grafico_jugadores avisa y no hace nada
+CHARTS_AVAILABLE = importlib.util.find_spec('matplotlib') is not None
+
+def render_player_chart(title: str, points: Sequence[tuple], max_players: Optional[int] = None) -> bytes:
+    """Render (start, min, avg, max) points as a PNG.
+
+    Runs in a worker process, so matplotlib is only imported there and the
+    bot process never pays for it.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib import dates as mdates
+    from matplotlib.figure import Figure
+
+    times = [datetime.fromtimestamp(point[0], timezone.utc) for point in points]
+    lows = [point[1] for point in points]
+    averages = [point[2] for point in points]
+    highs = [point[3] for point in points]
+
+    figure = Figure(figsize=(10, 4), dpi=100)
+    axes = figure.subplots()
+    axes.fill_between(times, lows, highs, color='#9b59b6', alpha=0.25, linewidth=0, label='Mín – máx')
+    axes.plot(times, averages, color='#8e44ad', linewidth=1.8, label='Media')
+    if max_players:
+        axes.axhline(max_players, color='#7f8c8d', linestyle='--', linewidth=1, label='Capacidad')
+    axes.set_title(title)
+    axes.set_ylabel('Jugadores')
+    axes.set_ylim(bottom=0)
+    axes.grid(alpha=0.3)
+    axes.legend(loc='upper left')
+    axes.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m %H:%M', tz=timezone.utc))
+    figure.autofmt_xdate()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format='png', bbox_inches='tight')
+    return buffer.getvalue()
@@ -0,0 +1,215 @@
+import asyncio
+import logging
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, NamedTuple, Optional
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from models import PlayerCountBucket, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+RAW_RETENTION = 24 * 3600          # Muestras sin agregar, en segundos
+BUCKET_SECONDS = 10 * 60           # Ancho de los buckets min/avg/max persistidos
+BUCKET_RETENTION = 90 * 24 * 3600
+TRIM_BATCH = 256                   # Recortar el inicio de los arrays por lotes, no en cada muestra
+
+class Point(NamedTuple):
+    start: float     # Epoch (UTC) del inicio del bucket
+    min: int
+    avg: float
+    max: int
+
+class PlayerSeries:
+    """Player counts of one server, stored in parallel arrays.
+
+    Raw samples are kept for RAW_RETENTION; every sample is also folded into a
+    fixed BUCKET_SECONDS bucket (min/max/sum/samples) kept for BUCKET_RETENTION,
+    so a month of data costs a few hundred KB instead of a list of objects per
+    sample. version changes on every sample, for callers caching derived data.
+    """
+
+    def __init__(self):
+        self.times = array('d')
+        self.counts = array('H')
+        self.bucket_starts = array('d')
+        self.bucket_min = array('H')
+        self.bucket_max = array('H')
+        self.bucket_sum = array('L')
+        self.bucket_samples = array('L')
+        self.open_bucket = False  # El último bucket aún recibe muestras (no está en la base de datos)
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def bucket_row(self, index: int) -> tuple:
+        return (
+            self.bucket_starts[index], self.bucket_min[index], self.bucket_max[index],
+            self.bucket_sum[index], self.bucket_samples[index]
+        )
+
+    def add(self, when: float, count: int) -> Optional[tuple]:
+        """Append a sample; returns the bucket row it closed, if any"""
+        count = max(0, min(count, 0xFFFF))
+        if self.times and when < self.times[-1]:
+            return None  # Reloj hacia atrás: se descarta la muestra
+        self.times.append(when)
+        self.counts.append(count)
+
+        start = when - when % BUCKET_SECONDS
+        closed = None
+        if self.bucket_starts and self.bucket_starts[-1] == start:
+            self.bucket_min[-1] = min(self.bucket_min[-1], count)
+            self.bucket_max[-1] = max(self.bucket_max[-1], count)
+            self.bucket_sum[-1] += count
+            self.bucket_samples[-1] += 1
+        else:
+            if self.open_bucket:
+                closed = self.bucket_row(-1)
+            self.bucket_starts.append(start)
+            self.bucket_min.append(count)
+            self.bucket_max.append(count)
+            self.bucket_sum.append(count)
+            self.bucket_samples.append(1)
+        self.open_bucket = True
+        self.version += 1
+        self._trim(when)
+        return closed
+
+    def load_buckets(self, rows: List[tuple]):
+        """Load persisted (start, min, max, sum, samples) rows, oldest first, before any sample is added"""
+        for start, low, high, total, samples in rows:
+            self.bucket_starts.append(start)
+            self.bucket_min.append(low)
+            self.bucket_max.append(high)
+            self.bucket_sum.append(total)
+            self.bucket_samples.append(samples)
+        self.version += 1
+
+    def _trim(self, now: float):
+        cut = bisect_left(self.times, now - RAW_RETENTION)
+        if cut >= TRIM_BATCH:
+            del self.times[:cut]
+            del self.counts[:cut]
+        cut = bisect_left(self.bucket_starts, now - BUCKET_RETENTION)
+        if cut >= TRIM_BATCH:
+            for column in (self.bucket_starts, self.bucket_min, self.bucket_max, self.bucket_sum, self.bucket_samples):
+                del column[:cut]
+
+    def query(self, start: float, end: float, bucket: float) -> List[Point]:
+        """min/avg/max per bucket-wide step over [start, end); empty steps are omitted.
+
+        Uses raw samples when they cover the range (or nothing older exists),
+        otherwise the stored buckets, so the step can't be narrower than
+        BUCKET_SECONDS.
+        """
+        use_raw = bool(self.times) and (
+            self.times[0] <= start
+            # Sin buckets más antiguos que las muestras (sin historial previo) no hay nada mejor
+            or self.bucket_starts[0] >= self.times[0] - BUCKET_SECONDS
+        )
+        if use_raw:
+            times, lows, highs, sums, samples = self.times, self.counts, self.counts, self.counts, None
+        else:
+            bucket = max(bucket, BUCKET_SECONDS)
+            times, lows, highs, sums, samples = (
+                self.bucket_starts, self.bucket_min, self.bucket_max, self.bucket_sum, self.bucket_samples
+            )
+
+        points = []
+        step = None
+        low = high = total = count = 0
+        for index in range(bisect_left(times, start), bisect_left(times, end)):
+            slot = start + (times[index] - start) // bucket * bucket
+            if slot != step:
+                if step is not None:
+                    points.append(Point(step, low, total / count, high))
+                step, low, high, total, count = slot, lows[index], highs[index], 0, 0
+            low = min(low, lows[index])
+            high = max(high, highs[index])
+            total += sums[index]
+            count += samples[index] if samples is not None else 1
+        if step is not None:
+            points.append(Point(step, low, total / count, high))
+        return points
+
+def _to_epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+def _from_epoch(value: float) -> datetime:
+    return datetime.fromtimestamp(value, timezone.utc).replace(tzinfo=None)
+
+class PlayerHistory:
+    """Player count series for every polled FXServer, with closed buckets persisted"""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+        self.series: Dict[str, PlayerSeries] = {}
+
+    def _load(self, since: datetime) -> List[tuple]:
+        with self.session_factory() as session:
+            stmt = select(
+                PlayerCountBucket.address, PlayerCountBucket.bucket_start, PlayerCountBucket.min_players,
+                PlayerCountBucket.max_players, PlayerCountBucket.sum_players, PlayerCountBucket.samples
+            ).where(PlayerCountBucket.bucket_start >= since).order_by(
+                PlayerCountBucket.address, PlayerCountBucket.bucket_start
+            )
+            return session.execute(stmt).all()
+
+    async def load(self):
+        since = datetime.utcnow() - timedelta(seconds=BUCKET_RETENTION)
+        rows = await asyncio.to_thread(self._load, since)
+        by_address: Dict[str, List[tuple]] = {}
+        for address, start, low, high, total, samples in rows:
+            by_address.setdefault(address, []).append((_to_epoch(start), low, high, total, samples))
+        for address, buckets in by_address.items():
+            self.series.setdefault(address, PlayerSeries()).load_buckets(buckets)
+        logger.info(f"Loaded player history: {len(rows)} buckets for {len(by_address)} servers")
+
+    def _insert(self, rows: List[dict]):
+        with self.session_factory() as session:
+            dialect = session.get_bind().dialect.name
+            if dialect in ('sqlite', 'postgresql'):
+                dialect_insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+                stmt = dialect_insert(PlayerCountBucket).on_conflict_do_nothing(
+                    index_elements=['address', 'bucket_start']
+                )
+            else:
+                stmt = insert(PlayerCountBucket)
+            session.execute(stmt, rows)
+            session.commit()
+
+    async def record(self, counts: Dict[str, int], now: Optional[float] = None):
+        """Add one sample per server and persist the buckets that closed"""
+        now = now if now is not None else datetime.now(timezone.utc).timestamp()
+        closed = []
+        for address, count in counts.items():
+            row = self.series.setdefault(address, PlayerSeries()).add(now, count)
+            if row is not None:
+                start, low, high, total, samples = row
+                closed.append({
+                    'address': address,
+                    'bucket_start': _from_epoch(start),
+                    'min_players': low,
+                    'max_players': high,
+                    'sum_players': total,
+                    'samples': samples
+                })
+        if closed:
+            await asyncio.to_thread(self._insert, closed)
+
+    def query(self, address: str, window: float, bucket: float, now: Optional[float] = None) -> List[Point]:
+        series = self.series.get(address)
+        if series is None:
+            return []
+        now = now if now is not None else datetime.now(timezone.utc).timestamp()
+        return series.query(now - window, now, bucket)
+
+    def version(self, address: str) -> int:
+        series = self.series.get(address)
+        return series.version if series else 0
@@ -0,0 +1,233 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional
+
+from sqlalchemy import delete, select, update
+
+from models import ScheduledAction, SessionLocal
+from utils.concurrency import RateLimitedExecutor
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for a single sleep so clock jumps are noticed
+MAX_SLEEP_SECONDS = 3600
+RETRY_DELAY = timedelta(minutes=5)
+MAX_ATTEMPTS = 5
+
+class ExpiryScheduler:
+    """Durable timer heap for temporary punishments.
+
+    Pending actions are stored in the scheduled_actions table and loaded into a
+    single in-memory heap on start. One task sleeps until the earliest expiry, so
+    thousands of pending actions cost one timer instead of one task each. Due
+    actions are handed to the handler through a paced executor.
+
+    The handler receives the job dict and returns True when the action is done
+    (or no longer applies). Returning False or raising retries it later.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[dict], Awaitable[bool]],
+        session_factory=SessionLocal,
+        executor: Optional[RateLimitedExecutor] = None
+    ):
+        self.handler = handler
+        self.session_factory = session_factory
+        self.executor = executor or RateLimitedExecutor(max_concurrency=2, min_interval=0.5)
+        self._heap = []
+        self._queued = set()     # Ids in the heap
+        self._running = set()    # Ids popped and being handled
+        self._cancelled = set()  # Queued or running ids cancelled since, skipped lazily
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._heap) - sum(1 for job_id in self._cancelled if job_id in self._queued)
+
+    @staticmethod
+    def _to_dict(action: ScheduledAction) -> dict:
+        return {
+            'id': action.id,
+            'guild_id': action.guild_id,
+            'user_id': action.user_id,
+            'action': action.action,
+            'role_id': action.role_id,
+            'reason': action.reason,
+            'attempts': action.attempts,
+            'expires_at': action.expires_at
+        }
+
+    def _load_pending(self) -> List[dict]:
+        with self.session_factory() as session:
+            return [self._to_dict(action) for action in session.scalars(select(ScheduledAction))]
+
+    def _insert(self, job: dict) -> int:
+        with self.session_factory() as session:
+            action = ScheduledAction(**job)
+            session.add(action)
+            session.commit()
+            return action.id
+
+    def _delete_ids(self, ids: List[int]):
+        with self.session_factory() as session:
+            session.execute(delete(ScheduledAction).where(ScheduledAction.id.in_(ids)))
+            session.commit()
+
+    def _delete_matching(self, guild_id: int, user_ids: List[int], action: str, role_id: Optional[int]) -> List[int]:
+        with self.session_factory() as session:
+            stmt = select(ScheduledAction.id).where(
+                ScheduledAction.guild_id == guild_id,
+                ScheduledAction.user_id.in_(user_ids),
+                ScheduledAction.action == action
+            )
+            if role_id is not None:
+                stmt = stmt.where(ScheduledAction.role_id == role_id)
+            ids = list(session.scalars(stmt))
+            if ids:
+                session.execute(delete(ScheduledAction).where(ScheduledAction.id.in_(ids)))
+                session.commit()
+            return ids
+
+    def _reschedule(self, jobs: List[dict]):
+        with self.session_factory() as session:
+            for job in jobs:
+                session.execute(
+                    update(ScheduledAction)
+                    .where(ScheduledAction.id == job['id'])
+                    .values(expires_at=job['expires_at'], attempts=job['attempts'])
+                )
+            session.commit()
+
+    async def start(self):
+        """Rehydrate pending actions from the database and start the timer task"""
+        if self._task and not self._task.done():
+            return
+        jobs = await asyncio.to_thread(self._load_pending)
+        self._heap = [(job['expires_at'], job['id'], job) for job in jobs]
+        heapq.heapify(self._heap)
+        self._queued = {job['id'] for job in jobs}
+        self._task = asyncio.create_task(self._run(), name="expiry-scheduler")
+        logger.info(f"Expiry scheduler started with {len(self._heap)} pending actions")
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _push(self, job: dict):
+        heapq.heappush(self._heap, (job['expires_at'], job['id'], job))
+        self._queued.add(job['id'])
+        if self._heap[0][1] == job['id']:
+            # New earliest deadline, wake the timer so it re-arms
+            self._wakeup.set()
+
+    async def schedule(
+        self,
+        guild_id: int,
+        user_id: int,
+        action: str,
+        expires_at: datetime,
+        role_id: Optional[int] = None,
+        reason: Optional[str] = None
+    ) -> dict:
+        """Persist a pending action and add it to the timer heap (expires_at in naive UTC)"""
+        job = {
+            'guild_id': guild_id,
+            'user_id': user_id,
+            'action': action,
+            'role_id': role_id,
+            'reason': reason,
+            'attempts': 0,
+            'expires_at': expires_at
+        }
+        job['id'] = await asyncio.to_thread(self._insert, job)
+        self._push(job)
+        return job
+
+    async def cancel(self, guild_id: int, user_id: int, action: str, role_id: Optional[int] = None) -> int:
+        """Cancel pending actions for a target, returning how many were removed"""
+        return await self.cancel_many(guild_id, [user_id], action, role_id)
+
+    async def cancel_many(self, guild_id: int, user_ids: List[int], action: str, role_id: Optional[int] = None) -> int:
+        """Cancel pending actions for several targets in one query, returning how many were removed"""
+        if not user_ids:
+            return 0
+        ids = await asyncio.to_thread(self._delete_matching, guild_id, user_ids, action, role_id)
+        # Heap entries are dropped lazily when they reach the top; running ones are not retried
+        self._cancelled.update(job_id for job_id in ids if job_id in self._queued or job_id in self._running)
+        return len(ids)
+
+    def _pop_due(self, now: datetime) -> List[dict]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            _, job_id, job = heapq.heappop(self._heap)
+            self._queued.discard(job_id)
+            if job_id in self._cancelled:
+                self._cancelled.discard(job_id)
+                continue
+            self._running.add(job_id)
+            due.append(job)
+        return due
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            if not self._heap:
+                await self._wakeup.wait()
+                continue
+
+            delay = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=min(delay, MAX_SLEEP_SECONDS))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = self._pop_due(datetime.utcnow())
+            if due:
+                await self._execute(due)
+
+    async def _execute(self, due: List[dict]):
+        results = await self.executor.map(self.handler, due)
+
+        finished = []
+        retry = []
+        for job, done, error in results:
+            if error:
+                logger.error(f"Expiry scheduler: action {job['action']} #{job['id']} failed: {error}")
+            if done and not error:
+                finished.append(job['id'])
+            elif job['attempts'] + 1 >= MAX_ATTEMPTS:
+                logger.error(f"Expiry scheduler: giving up on {job['action']} #{job['id']} after {MAX_ATTEMPTS} attempts")
+                finished.append(job['id'])
+            else:
+                job['attempts'] += 1
+                job['expires_at'] = datetime.utcnow() + RETRY_DELAY
+                retry.append(job)
+
+        try:
+            if finished:
+                await asyncio.to_thread(self._delete_ids, finished)
+            if retry:
+                await asyncio.to_thread(self._reschedule, retry)
+        except Exception as e:
+            logger.error(f"Expiry scheduler: error persisting results: {e}")
+
+        for job in due:
+            self._running.discard(job['id'])
+        for job in retry:
+            if job['id'] in self._cancelled:
+                self._cancelled.discard(job['id'])
+                continue
+            self._push(job)
+        for job_id in finished:
+            self._cancelled.discard(job_id)
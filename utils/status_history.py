@@ -0,0 +1,205 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, insert, select
+
+from models import FiveMStatusTransition, SessionLocal
+from utils.status_page import COMPONENT_NAMES_BY_DISPLAY, COMPONENT_SEVERITY, STATUS_KEYS_BY_LABEL
+
+logger = logging.getLogger(__name__)
+
+RING_SIZE = 4096     # Transiciones recientes en memoria
+HISTORY_DAYS = 30    # Ventana más larga que se consulta
+UP_STATUSES = frozenset({'operational', 'degraded_performance', 'under_maintenance'})
+
+def as_naive_utc(now: Optional[datetime]) -> datetime:
+    """The stored timestamps are naive UTC; accept aware datetimes (discord.utils.utcnow()) too"""
+    if now is None:
+        return datetime.utcnow()
+    if now.tzinfo is not None:
+        return now.astimezone(timezone.utc).replace(tzinfo=None)
+    return now
+
+class Transition(NamedTuple):
+    component: str                  # Statuspage component name
+    status: str                     # Statuspage status key
+    changed_at: datetime            # Naive UTC
+    previous: Optional[str] = None  # Only known for transitions recorded in this process
+
+class Incident(NamedTuple):
+    component: str
+    status: str                     # Worst status during the incident
+    started_at: datetime            # Clipped to the start of the window
+    ended_at: Optional[datetime]    # None while ongoing
+
+class ComponentReport(NamedTuple):
+    uptime: Optional[float]         # Percentage, None without data for the window
+    incidents: List[Incident]
+
+class StatusHistory:
+    """Component status history stored as transitions only.
+
+    A poll that changes nothing writes nothing. Recent transitions also live in
+    a ring buffer, together with the state each component had just before the
+    oldest buffered transition, so reports over recent windows never touch the
+    database; older windows read the (component, changed_at) index.
+    """
+
+    def __init__(self, session_factory=SessionLocal, ring_size: int = RING_SIZE):
+        self.session_factory = session_factory
+        self.current: Dict[str, str] = {}
+        self.recent: Deque[Transition] = deque(maxlen=ring_size)
+        self.baseline: Dict[str, str] = {}         # State just before recent_since
+        self.recent_since: Optional[datetime] = None  # The buffer is complete from here on
+
+    @staticmethod
+    def _state_before(session, cutoff: datetime) -> Dict[str, str]:
+        latest = select(func.max(FiveMStatusTransition.id)).where(
+            FiveMStatusTransition.changed_at < cutoff
+        ).group_by(FiveMStatusTransition.component)
+        rows = session.execute(
+            select(FiveMStatusTransition.component, FiveMStatusTransition.status).where(
+                FiveMStatusTransition.id.in_(latest)
+            )
+        ).all()
+        return dict(rows)
+
+    @staticmethod
+    def _transitions_since(session, since: datetime, limit: Optional[int] = None) -> List[Transition]:
+        stmt = select(FiveMStatusTransition).where(FiveMStatusTransition.changed_at >= since).order_by(
+            FiveMStatusTransition.changed_at.desc(), FiveMStatusTransition.id.desc()
+        )
+        if limit:
+            stmt = stmt.limit(limit)
+        rows = [Transition(row.component, row.status, row.changed_at) for row in session.scalars(stmt)]
+        rows.reverse()
+        return rows
+
+    def _load(self, since: datetime) -> Tuple[Dict[str, str], List[Transition], datetime]:
+        with self.session_factory() as session:
+            transitions = self._transitions_since(session, since, self.recent.maxlen)
+            if len(transitions) == self.recent.maxlen:
+                since = transitions[0].changed_at
+                transitions = [t for t in transitions if t.changed_at >= since]
+            return self._state_before(session, since), transitions, since
+
+    async def load(self):
+        """Fill the ring buffer and current state from the database"""
+        since = datetime.utcnow() - timedelta(days=HISTORY_DAYS)
+        baseline, transitions, since = await asyncio.to_thread(self._load, since)
+        self.baseline = baseline
+        self.recent.clear()
+        self.recent.extend(transitions)
+        self.recent_since = since
+        self.current = dict(baseline)
+        for transition in transitions:
+            self.current[transition.component] = transition.status
+        logger.info(f"Loaded FiveM status history: {len(transitions)} recent transitions")
+
+    def _insert(self, transitions: List[Transition]):
+        with self.session_factory() as session:
+            session.execute(insert(FiveMStatusTransition), [
+                {'component': t.component, 'status': t.status, 'changed_at': t.changed_at}
+                for t in transitions
+            ])
+            session.commit()
+
+    async def record(self, status_data: Dict[str, str], now: Optional[datetime] = None) -> List[Transition]:
+        """Store the components whose status changed since the last poll and return those transitions"""
+        now = as_naive_utc(now)
+        changes = []
+        for display_name, label in status_data.items():
+            component = COMPONENT_NAMES_BY_DISPLAY.get(display_name)
+            status = STATUS_KEYS_BY_LABEL.get(label)
+            # Componentes ausentes o desconocidos no cuentan como cambio
+            if component is None or status is None:
+                continue
+            previous = self.current.get(component)
+            if previous != status:
+                changes.append(Transition(component, status, now, previous))
+
+        if not changes:
+            return []
+
+        await asyncio.to_thread(self._insert, changes)
+        if self.recent_since is None:
+            self.recent_since = now
+        for transition in changes:
+            self.current[transition.component] = transition.status
+            if len(self.recent) == self.recent.maxlen:
+                # La transición expulsada pasa a formar parte del estado base
+                evicted = self.recent[0]
+                self.baseline[evicted.component] = evicted.status
+                self.recent_since = evicted.changed_at
+            self.recent.append(transition)
+        return changes
+
+    def _from_memory(self, start: datetime) -> Tuple[Dict[str, str], List[Transition]]:
+        state = dict(self.baseline)
+        transitions = []
+        for transition in self.recent:
+            if transition.changed_at < start:
+                state[transition.component] = transition.status
+            else:
+                transitions.append(transition)
+        return state, transitions
+
+    def _from_db(self, start: datetime) -> Tuple[Dict[str, str], List[Transition]]:
+        with self.session_factory() as session:
+            return self._state_before(session, start), self._transitions_since(session, start)
+
+    async def report(self, window: timedelta, now: Optional[datetime] = None) -> Dict[str, ComponentReport]:
+        """Uptime and incidents per component over the last window"""
+        now = as_naive_utc(now)
+        start = now - window
+        if self.recent_since is not None and start >= self.recent_since:
+            state, transitions = self._from_memory(start)
+        else:
+            state, transitions = await asyncio.to_thread(self._from_db, start)
+        return summarize(state, transitions, start, now)
+
+def summarize(state: Dict[str, str], transitions: List[Transition], start: datetime, end: datetime) -> Dict[str, ComponentReport]:
+    """Walk each component's transitions once, accumulating up time and incident spans"""
+    by_component: Dict[str, List[Transition]] = {}
+    for transition in transitions:
+        by_component.setdefault(transition.component, []).append(transition)
+
+    reports = {}
+    for component in set(state) | set(by_component):
+        status = state.get(component)
+        since = start
+        up = known = 0.0
+        incidents = []
+        # Incidente ya abierto al comienzo de la ventana: [peor estado, inicio]
+        incident = [status, start] if status is not None and status != 'operational' else None
+
+        for transition in by_component.get(component, []):
+            if status is not None:
+                seconds = (transition.changed_at - since).total_seconds()
+                known += seconds
+                if status in UP_STATUSES:
+                    up += seconds
+
+            if transition.status == 'operational':
+                if incident is not None:
+                    incidents.append(Incident(component, incident[0], incident[1], transition.changed_at))
+                    incident = None
+            elif incident is None:
+                incident = [transition.status, transition.changed_at]
+            elif COMPONENT_SEVERITY.index(transition.status) > COMPONENT_SEVERITY.index(incident[0]):
+                incident[0] = transition.status
+            status, since = transition.status, transition.changed_at
+
+        if status is not None:
+            seconds = (end - since).total_seconds()
+            known += seconds
+            if status in UP_STATUSES:
+                up += seconds
+        if incident is not None:
+            incidents.append(Incident(component, incident[0], incident[1], None))
+
+        reports[component] = ComponentReport(up / known * 100 if known else None, incidents)
+    return reports
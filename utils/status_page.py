@@ -0,0 +1,149 @@
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+# Componentes de status.cfx.re en el orden del panel: nombre en Statuspage -> nombre mostrado
+SERVICES = {
+    "FiveM": "🎮 FiveM",
+    "RedM": "🤠 RedM",
+    "Cfx.re Platform Server (FXServer)": "🖥️ FXServer",
+    "Game Services": "🎯 Game Services",
+    "CnL": "🔗 CnL",
+    "Policy": "📋 Policy",
+    "Keymaster": "🔑 Keymaster",
+    "Web Services": "🌐 Web Services",
+    "Forums": "💬 Forums",
+    "Server List Frontend": "📋 Server List",
+    "Runtime": "⚡ Runtime",
+    "IDMS": "🆔 IDMS",
+    "Portal": "🚪 Portal"
+}
+
+COMPONENT_STATUS_LABELS = {
+    "operational": "🟢 Operativo",
+    "degraded_performance": "🟡 Rendimiento Degradado",
+    "partial_outage": "🟠 Falla Parcial",
+    "major_outage": "🔴 Falla Mayor",
+    "under_maintenance": "🔧 Mantenimiento"
+}
+
+OVERALL_STATUS_LABELS = {
+    "none": "🟢 Todos los sistemas operativos",
+    "minor": "🟡 Algunos sistemas con problemas",
+    "major": "🟠 Falla parcial del servicio",
+    "critical": "🔴 Falla mayor del servicio",
+    "maintenance": "🔧 Mantenimiento en curso"
+}
+
+STATUS_KEYS_BY_LABEL = {label: key for key, label in COMPONENT_STATUS_LABELS.items()}
+COMPONENT_NAMES_BY_DISPLAY = {display_name: name for name, display_name in SERVICES.items()}
+
+UNKNOWN_STATUS = "❓ Desconocido"
+MISSING_STATUS = "❓ No disponible"
+
+# Peor estado de componente -> indicador general, para components.json (no trae 'status')
+COMPONENT_SEVERITY = ["operational", "under_maintenance", "degraded_performance", "partial_outage", "major_outage"]
+_INDICATOR_BY_COMPONENT = {
+    "operational": "none",
+    "under_maintenance": "maintenance",
+    "degraded_performance": "minor",
+    "partial_outage": "major",
+    "major_outage": "critical"
+}
+
+class Component(NamedTuple):
+    id: str
+    name: str
+    status: str
+    group_id: Optional[str]
+
+class StatuspageParser:
+    """Parse Statuspage v2 summary.json / components.json into display statuses.
+
+    Components are matched by name the first time and remembered by ID, so a
+    component renamed upstream keeps its display name on later polls.
+    """
+
+    def __init__(self, services: Dict[str, str] = SERVICES):
+        self.services = services
+        self.display_by_id: Dict[str, str] = {}
+
+    @staticmethod
+    def components(data: dict) -> List[Component]:
+        return [
+            Component(item['id'], item['name'].strip(), item['status'], item.get('group_id'))
+            for item in data.get('components', [])
+            if isinstance(item, dict) and 'id' in item and 'name' in item and 'status' in item
+        ]
+
+    def parse(self, data: dict) -> Dict[str, str]:
+        """Return {display name: status label, 'overall': label}, or {} if nothing is recognised"""
+        components = self.components(data)
+        found = {}
+        for component in components:
+            display_name = self.display_by_id.get(component.id) or self.services.get(component.name)
+            if display_name is None:
+                continue
+            self.display_by_id[component.id] = display_name
+            found[display_name] = COMPONENT_STATUS_LABELS.get(component.status, UNKNOWN_STATUS)
+
+        if not found:
+            return {}
+
+        status_dict = {display_name: found.get(display_name, MISSING_STATUS) for display_name in self.services.values()}
+
+        indicator = (data.get('status') or {}).get('indicator')
+        if indicator is None:
+            worst = max(
+                (c.status for c in components if c.status in _INDICATOR_BY_COMPONENT),
+                key=COMPONENT_SEVERITY.index,
+                default=None
+            )
+            indicator = _INDICATOR_BY_COMPONENT.get(worst)
+        status_dict["overall"] = OVERALL_STATUS_LABELS.get(indicator, "❓ Estado general desconocido")
+        return status_dict
+
+# Un único patrón precompilado con prefijo literal común: el escaneo recorre la página una vez
+HTML_TOKEN_PATTERN = re.compile(
+    r'class="(?:'
+    r'name">\s*(?:<span[^>]*></span>\s*<span>)?\s*(?P<name>[^<]+?)\s*<'
+    r'|component-status[^"]*"[^>]*>\s*(?P<status>Operational|Degraded Performance|Partial Outage|Major Outage|Under Maintenance)'
+    r'|page-status status-(?P<indicator>\w+)'
+    r')'
+)
+
+HTML_STATUS_KEYS = {
+    "Operational": "operational",
+    "Degraded Performance": "degraded_performance",
+    "Partial Outage": "partial_outage",
+    "Major Outage": "major_outage",
+    "Under Maintenance": "under_maintenance"
+}
+
+def parse_status_html(content: str) -> Dict[str, str]:
+    """Scrape statuses from the status page HTML in one pass; fallback for when the API is unavailable.
+
+    Each component renders its name and then its status, so a status token is
+    assigned to the most recent name token.
+    """
+    found = {}
+    indicator = None
+    pending = None
+
+    for match in HTML_TOKEN_PATTERN.finditer(content):
+        group = match.lastgroup
+        if group == 'name':
+            pending = SERVICES.get(match.group('name'))
+        elif group == 'status':
+            if pending and pending not in found:
+                found[pending] = COMPONENT_STATUS_LABELS[HTML_STATUS_KEYS[match.group('status')]]
+            pending = None
+        elif indicator is None:
+            indicator = match.group('indicator')
+
+    # Una página de error no contiene ningún componente
+    if not found:
+        return {}
+
+    status_dict = {display_name: found.get(display_name, MISSING_STATUS) for display_name in SERVICES.values()}
+    status_dict["overall"] = OVERALL_STATUS_LABELS.get(indicator, "❓ Estado general desconocido")
+    return status_dict